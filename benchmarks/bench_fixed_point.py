@@ -0,0 +1,53 @@
+"""
+Throughput comparison of the float and integer-cent tariff implementations.
+
+Usage: python benchmarks/bench_fixed_point.py [--count 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.tax_calculator import calculate_german_tax
+from logic.vectorized import calculate_german_tax_array
+from logic.fixed_point import calculate_german_tax_cents, calculate_german_tax_cents_array
+
+
+def _timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  {count / elapsed:>14,.0f} incomes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    cents = rng.integers(0, 30_000_000, args.count, dtype=np.int64)
+    euros = cents / 100
+    married = rng.random(args.count) < 0.5
+    # Scalar loops are slow; time them on a tenth of the sample
+    n_scalar = max(1, args.count // 10)
+    cents_list, euros_list, married_list = cents[:n_scalar].tolist(), euros[:n_scalar].tolist(), married[:n_scalar].tolist()
+
+    _timed("float scalar loop", n_scalar,
+           lambda: [calculate_german_tax(z, 2025, m) for z, m in zip(euros_list, married_list)])
+    _timed("int-cent scalar loop", n_scalar,
+           lambda: [calculate_german_tax_cents(z, 2025, m) for z, m in zip(cents_list, married_list)])
+    _timed("float numpy", args.count, lambda: calculate_german_tax_array(euros, 2025, married))
+    _timed("int-cent numpy (int64)", args.count, lambda: calculate_german_tax_cents_array(cents, 2025, married))
+
+    exact = calculate_german_tax_cents_array(cents, 2025, married, statutory=False)
+    floats = calculate_german_tax_array(np.where(married, cents - cents % 2, cents) / 100, 2025, married)
+    print(f"max |int-cent - float| (non-statutory): {np.abs(exact - floats * 100).max():.3f} cents")
+
+
+if __name__ == "__main__":
+    main()
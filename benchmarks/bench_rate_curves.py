@@ -0,0 +1,38 @@
+"""
+Times rate-curve generation on a dense income grid.
+
+Usage: python benchmarks/bench_rate_curves.py [--points 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.rate_curves import tariff_curve, household_rate_curve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1000000)
+    args = parser.parse_args()
+
+    grid = np.linspace(0, 300000, args.points)
+    household = {"tax_year": "2025", "is_married": True, "in_rent": 1200000, "in_interest": 150000}
+
+    for label, func in (
+        ("tariff_curve (single)", lambda: tariff_curve(grid, 2025, False)),
+        ("tariff_curve (splitting)", lambda: tariff_curve(grid, 2025, True)),
+        ("household_rate_curve", lambda: household_rate_curve(household, grid)),
+    ):
+        func()  # first call excluded from timing
+        start = time.perf_counter()
+        func()
+        print(f"{label:<26} {args.points:,} points in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
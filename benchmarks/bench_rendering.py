@@ -0,0 +1,51 @@
+"""
+Throughput benchmark for the bulk report renderer.
+
+Usage: python benchmarks/bench_rendering.py [--count 100000] [--format text] [--archive]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import report_generator
+from logic.rendering import render_bulk
+
+
+def _reports(count, base):
+    # Vary the refund so both refund and payment branches are rendered
+    for i in range(count):
+        report = dict(base)
+        report["refund_or_payment"] = base["refund_or_payment"] + (i % 5000) - 2500
+        yield f"client_{i:06d}", report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--format", default="text", choices=["text", "html", "csv", "json"])
+    parser.add_argument("--archive", action="store_true", help="write a single .zip instead of a directory")
+    args = parser.parse_args()
+
+    report_generator.DEBUG = False
+    base = report_generator.generate_full_report({
+        "tax_year": "2025", "is_married": True, "tax_class": 1, "num_kids": 1,
+        "de_gross_a": 85000, "de_tax_paid_a": 19000, "de_gross_b": 42000, "de_tax_paid_b": 6000,
+        "de_pension_a": 7900, "de_health_a": 5400, "de_pension_b": 3900, "de_health_b": 3400,
+        "in_rent": 240000, "in_tds_inr": 24000,
+    })
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        destination = os.path.join(tmpdir, "reports.zip" if args.archive else "reports")
+        start = time.perf_counter()
+        written = render_bulk(_reports(args.count, base), destination, args.format)
+        elapsed = time.perf_counter() - start
+
+    print(f"{written} {args.format} reports in {elapsed:.2f}s ({written / elapsed:,.0f} reports/s)")
+
+
+if __name__ == "__main__":
+    main()
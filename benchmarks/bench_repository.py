@@ -0,0 +1,55 @@
+"""
+Times bulk-loading a synthetic portfolio into the SQLite client repository and a
+few indexed queries on it.
+
+Usage: python benchmarks/bench_repository.py [--households 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_validation import synthetic_store
+from logic.repository import ClientRepository
+
+
+def timed(label, function, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - start) / repeat
+    size = len(result) if isinstance(result, list) else result
+    print(f"  {label:<48} {elapsed * 1000:8.2f} ms  ({size:,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--households", type=int, default=1000000)
+    args = parser.parse_args()
+
+    store = synthetic_store(args.households)
+    report = store.calculate()
+    warnings = store.validate(report)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with ClientRepository(os.path.join(tmpdir, "clients.sqlite")) as repository:
+            start = time.perf_counter()
+            repository.save_batch(range(args.households), store, report, warnings)
+            print(f"bulk insert: {args.households:,} clients, {len(warnings):,} warnings "
+                  f"in {time.perf_counter() - start:.1f} s")
+
+            print("queries:")
+            timed("2025 clients owing > 1000 EUR (count)", lambda: repository.count(tax_year=2025, owing_more_than=1000))
+            timed("2025 clients owing > 20000 EUR (ids)", lambda: repository.find(tax_year=2025, owing_more_than=20000))
+            timed("2024 clients with refund > 15000 EUR (ids)", lambda: repository.find(tax_year=2024, refund_more_than=15000))
+            timed("first 100 clients in tax class 3", lambda: repository.find(tax_class=3, limit=100))
+            timed("clients with warning withholding_ratio_a (count)",
+                  lambda: repository.count(warning="withholding_ratio_a"))
+            timed("one report with warnings", lambda: len(repository.report(123456 % args.households)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares multiprocess batch runs: shared memory columns (only index ranges are
+sent to the workers) against a pool that pickles column chunks, and against the
+per-household dict path (generate_full_report on pickled input dicts).
+
+Usage: python benchmarks/bench_shared_batch.py [--households 1000000] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_validation import synthetic_store
+from logic import report_generator
+from logic.report_generator import generate_full_report
+from logic.shared_batch import generate_batch_report_shared
+from logic.vectorized import generate_batch_report
+
+
+def _full_reports(households):
+    return [generate_full_report(data) for data in households]
+
+
+def pickled_columns(columns, max_workers, chunk_size):
+    size = len(columns["tax_year"])
+    chunks = [{field: values[i:i + chunk_size] for field, values in columns.items()} for i in range(0, size, chunk_size)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(pool.map(generate_batch_report, chunks))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def pickled_dicts(store, n, max_workers, chunk_size=256):
+    households = [store.record(i) for i in range(n)]
+    chunks = [households[i:i + chunk_size] for i in range(0, n, chunk_size)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return [report for part in pool.map(_full_reports, chunks) for report in part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--households", type=int, default=1000000)
+    parser.add_argument("--dict-households", type=int, default=20000,
+                        help="Households for the (much slower) per-household dict path")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    args = parser.parse_args()
+    report_generator.DEBUG = False
+
+    store = synthetic_store(args.households)
+    columns = store.columns()
+
+    start = time.perf_counter()
+    shared = generate_batch_report_shared(columns, args.workers, args.chunk_size)
+    shared_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pickled = pickled_columns(columns, args.workers, args.chunk_size)
+    pickled_time = time.perf_counter() - start
+    assert np.array_equal(shared["refund_or_payment"], pickled["refund_or_payment"])
+
+    start = time.perf_counter()
+    pickled_dicts(store, args.dict_households, args.workers)
+    dict_time = time.perf_counter() - start
+
+    print(f"shared memory columns: {args.households:,} households in {shared_time * 1000:.0f} ms "
+          f"({args.households / shared_time:,.0f}/s)")
+    print(f"pickled column chunks: {args.households:,} households in {pickled_time * 1000:.0f} ms "
+          f"({args.households / pickled_time:,.0f}/s)")
+    print(f"pickled input dicts:   {args.dict_households:,} households in {dict_time * 1000:.0f} ms "
+          f"({args.dict_households / dict_time:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
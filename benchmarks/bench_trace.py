@@ -0,0 +1,54 @@
+"""
+Shows that the calculation trace costs nothing measurable when it is disabled.
+
+Compares generate_full_report without a trace (the default) against the same call
+with a CalculationTrace attached, and against the cost of all `trace is not None`
+guards, which is the only work the disabled trace adds.
+
+Usage: python benchmarks/bench_trace.py [--calls 20000] [--repeat 5]
+"""
+import argparse
+import inspect
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import report_generator, tax_calculator
+from logic.report_generator import generate_full_report
+from logic.trace import CalculationTrace
+
+HOUSEHOLD = {
+    "is_married": True, "tax_class": 1, "tax_year": "2025",
+    "de_gross_a": 80000, "de_tax_paid_a": 15000, "de_pension_a": 7000, "de_health_a": 4500,
+    "commute_km_a": 30, "office_days_a": 100, "ho_days_a": 80, "internet_a": 240, "bank_fee_a": True,
+    "de_gross_b": 30000, "de_tax_paid_b": 3000, "ho_days_b": 200,
+    "in_rent": 200000, "in_interest": 50000, "kita_costs": 3000, "in_tds_inr": 20000,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    report_generator.DEBUG = False
+
+    cases = (
+        ("trace disabled", lambda: generate_full_report(HOUSEHOLD)),
+        ("trace enabled", lambda: generate_full_report(HOUSEHOLD, CalculationTrace())),
+    )
+    for label, func in cases:
+        best = min(timeit.repeat(func, number=args.calls, repeat=args.repeat))
+        print(f"{label:<20} {best / args.calls * 1e6:8.2f} us per report")
+
+    # Upper bound for the disabled overhead: every guard site evaluated once per report
+    guards = sum(inspect.getsource(module).count("if trace is not None") for module in (report_generator, tax_calculator))
+    best = min(timeit.repeat("if trace is not None: pass", globals={"trace": None},
+                             number=args.calls * guards, repeat=args.repeat))
+    print(f"{'guards (' + str(guards) + ')':<20} {best / args.calls * 1e6:8.2f} us per report")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Times the validation rule screening of a synthetic portfolio.
+
+Usage: python benchmarks/bench_validation.py [--households 500000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.household_store import HouseholdStore, INPUT_FIELDS
+
+
+def synthetic_store(n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {name: np.full(n, default, dtype=dtype) for name, (dtype, default) in INPUT_FIELDS.items()}
+    columns["tax_year"] = rng.choice([2024, 2025, 2026], n).astype(np.int16)
+    columns["is_married"] = rng.random(n) < 0.6
+    columns["num_kids"] = rng.integers(0, 4, n).astype(np.int8)
+    columns["de_gross_a"] = rng.uniform(20000, 150000, n)
+    columns["de_tax_paid_a"] = columns["de_gross_a"] * rng.uniform(0.0, 0.5, n)
+    columns["de_pension_a"] = columns["de_gross_a"] * 0.093 * rng.uniform(0.9, 1.2, n)
+    columns["office_days_a"] = rng.integers(0, 230, n).astype(np.float64)
+    columns["ho_days_a"] = rng.integers(0, 150, n).astype(np.float64)
+    columns["in_rent"] = rng.uniform(0, 500000, n)
+    columns["in_tds_inr"] = columns["in_rent"] * rng.uniform(0.0, 0.4, n)
+    return HouseholdStore(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--households", type=int, default=500000)
+    args = parser.parse_args()
+
+    store = synthetic_store(args.households)
+    start = time.perf_counter()
+    report = store.calculate()
+    calculated = time.perf_counter()
+    matrix = store.validate(report)
+    validated = time.perf_counter()
+
+    print(f"batch report: {args.households:,} households in {(calculated - start) * 1000:.1f} ms")
+    print(f"validation:   {len(matrix):,} warnings in {(validated - calculated) * 1000:.1f} ms")
+    for rule_id, count in matrix.counts().items():
+        if count:
+            print(f"  {rule_id:<32} {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Load test for the local HTTP/JSON service (logic/service.py).
+
+Opens several keep-alive connections and sends /report (or /batch) requests as
+fast as the service answers, then prints p50/p99 latency and throughput. Without
+--port a service is started in-process on a free port.
+
+Usage: python benchmarks/load_test_service.py [--connections 16] [--requests 200]
+                                              [--batch 0] [--port PORT] [--workers N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import report_generator
+from logic.service import TaxService, http_request
+
+HOUSEHOLD = {
+    "is_married": True, "tax_class": 1, "tax_year": 2025,
+    "de_gross_a": 70000, "de_tax_paid_a": 14000, "de_pension_a": 6500, "de_health_a": 5000,
+    "commute_km_a": 25, "office_days_a": 150, "ho_days_a": 60, "internet_a": 240,
+    "de_gross_b": 30000, "de_tax_paid_b": 3000, "in_rent": 300000, "kita_costs": 4000,
+}
+
+
+async def client(host, port, requests, batch, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    path, payload = ("/batch", [HOUSEHOLD] * batch) if batch else ("/report", HOUSEHOLD)
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, "POST", path, payload, host)
+            if status != 200:
+                raise RuntimeError(f"Request failed with status {status}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(args):
+    service = None
+    port = args.port
+    if port is None:
+        service = TaxService(args.workers)
+        await service.start(args.host, 0)
+        port = service.port
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, port, args.requests, args.batch, latencies)
+                           for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    if service is not None:
+        await service.close()
+
+    latencies.sort()
+    households = len(latencies) * (args.batch or 1)
+    print(f"{len(latencies):,} requests ({households:,} households) over {args.connections} connections "
+          f"in {elapsed:.2f} s")
+    print(f"p50 {latencies[len(latencies) // 2] * 1000:.2f} ms   "
+          f"p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.2f} ms")
+    print(f"throughput {len(latencies) / elapsed:,.0f} requests/s, {households / elapsed:,.0f} households/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per connection")
+    parser.add_argument("--batch", type=int, default=0, help="Households per /batch request (0: use /report)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    report_generator.DEBUG = False
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
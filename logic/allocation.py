@@ -0,0 +1,96 @@
+import numpy as np
+
+from . import constants
+from .household_store import HouseholdStore
+
+# Allocation of shared deductible items between spouses.
+#
+# Each spouse's Werbungskosten are floored at the Pauschale, so moving shared
+# items (home office days of a shared study, the internet contract, the one bank
+# account fee) from a spouse below the floor to one above it lowers the tax.
+# All candidate splits are evaluated in a single vectorized pass and the one with
+# the lowest tax is returned.
+
+MAX_WORK_DAYS = 230
+MAX_HOME_OFFICE_DAYS = int(constants.MAX_HOME_OFFICE_DEDUCTION / constants.HOME_OFFICE_DAY_RATE)
+
+
+def _home_office_cap(office_days):
+    return max(0, min(MAX_HOME_OFFICE_DAYS, MAX_WORK_DAYS - int(office_days)))
+
+
+def allocation_candidates(data, internet_steps=21):
+    """
+    Enumerates the splits of the shared items for one household.
+
+    The pools are what was entered for both spouses together: home office days
+    (each spouse limited by the maximum and by 230 work days minus office days),
+    the internet costs (split in `internet_steps` steps) and a single bank fee
+    flat rate (given to either spouse).
+
+    Returns:
+        dict: Columns ho_days_a/b, internet_a/b, bank_fee_a/b; row 0 is the split as entered.
+    """
+    ho_a, ho_b = data.get("ho_days_a", 0.0), data.get("ho_days_b", 0.0)
+    internet_a, internet_b = data.get("internet_a", 0.0), data.get("internet_b", 0.0)
+    bank_a, bank_b = bool(data.get("bank_fee_a")), bool(data.get("bank_fee_b"))
+
+    total_days = int(ho_a + ho_b)
+    cap_a = _home_office_cap(data.get("office_days_a", 0.0))
+    cap_b = _home_office_cap(data.get("office_days_b", 0.0))
+    days_a = np.arange(max(0, total_days - cap_b), min(total_days, cap_a) + 1, dtype=np.float64)
+    if len(days_a) == 0:
+        days_a = np.array([ho_a])
+
+    internet_total = internet_a + internet_b
+    shares_a = np.linspace(0.0, internet_total, internet_steps) if internet_total > 0 else np.zeros(1)
+    banks = [(True, False), (False, True)] if bank_a != bank_b else [(bank_a, bank_b)]
+
+    grid_days, grid_internet, grid_bank = np.meshgrid(days_a, shares_a, np.arange(len(banks)), indexing="ij")
+    grid_days, grid_internet, grid_bank = grid_days.ravel(), grid_internet.ravel(), grid_bank.ravel()
+    bank_table = np.array(banks, dtype=bool)
+
+    return {
+        "ho_days_a": np.concatenate(([ho_a], grid_days)),
+        "ho_days_b": np.concatenate(([ho_b], (ho_a + ho_b) - grid_days)),
+        "internet_a": np.concatenate(([internet_a], grid_internet)),
+        "internet_b": np.concatenate(([internet_b], internet_total - grid_internet)),
+        "bank_fee_a": np.concatenate(([bank_a], bank_table[grid_bank, 0])),
+        "bank_fee_b": np.concatenate(([bank_b], bank_table[grid_bank, 1])),
+    }
+
+
+def optimize_allocation(data, internet_steps=21):
+    """
+    Finds the split of shared items between A and B with the lowest tax.
+
+    Only applies to married couples where both spouses have salary income; for
+    everyone else the input is returned unchanged.
+
+    Returns:
+        dict: allocation (the winning ho_days/internet/bank_fee values for A and B),
+              net_german_tax_due, refund_or_payment, saving (vs. the split as
+              entered) and candidates (number of splits evaluated).
+    """
+    candidates = allocation_candidates(data, internet_steps)
+    if not (data.get("is_married") and data.get("de_gross_a", 0.0) > 0 and data.get("de_gross_b", 0.0) > 0):
+        candidates = {field: column[:1] for field, column in candidates.items()}
+
+    columns = HouseholdStore.repeat(data, len(candidates["ho_days_a"])).columns()
+    columns.update(candidates)
+    report = HouseholdStore(columns).calculate()
+
+    tax = report["net_german_tax_due"]
+    # Among the cheapest splits, take the one closest to what was entered
+    moved = (np.abs(candidates["ho_days_a"] - candidates["ho_days_a"][0])
+             + np.abs(candidates["internet_a"] - candidates["internet_a"][0]) / constants.HOME_OFFICE_DAY_RATE
+             + (candidates["bank_fee_a"] != candidates["bank_fee_a"][0]))
+    cheapest = np.flatnonzero(tax <= tax.min() + 0.005)
+    best = int(cheapest[np.argmin(moved[cheapest])])
+    return {
+        "allocation": {field: column[best].item() for field, column in candidates.items()},
+        "net_german_tax_due": float(tax[best]),
+        "refund_or_payment": float(report["refund_or_payment"][best]),
+        "saving": float(tax[0] - tax[best]),
+        "candidates": len(tax),
+    }
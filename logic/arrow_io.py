@@ -0,0 +1,184 @@
+import time
+
+import numpy as np
+
+from .household_store import INPUT_FIELDS
+from .vectorized import generate_batch_report
+
+# Columnar file I/O for the batch engine (Parquet and Arrow IPC).
+#
+# Warehouse exports are read batch by batch straight into the typed input
+# columns of household_store.INPUT_FIELDS (the wizard field names plus the tax
+# year), computed with the vectorized core and streamed back out as Parquet,
+# one row group per batch, so neither side has to fit in memory. Parquet files
+# and Arrow IPC files are memory-mapped. pyarrow is an optional dependency.
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+IPC_EXTENSIONS = (".arrow", ".feather", ".ipc")
+DEFAULT_BATCH_SIZE = 65536
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Reading and writing Parquet/Arrow files requires pyarrow (pip install pyarrow).")
+    return pyarrow
+
+
+def _extension_format(path):
+    lower = str(path).lower()
+    if lower.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    if lower.endswith(IPC_EXTENSIONS):
+        return "ipc"
+    return None
+
+
+def file_format(path):
+    """'parquet' or 'ipc', from the extension or else the file's magic bytes."""
+    fmt = _extension_format(path)
+    if fmt is not None:
+        return fmt
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    if magic[:4] == b"PAR1":
+        return "parquet"
+    if magic == b"ARROW1":
+        return "ipc"
+    raise ValueError(f"'{path}' is neither a Parquet nor an Arrow IPC file.")
+
+
+def file_schema(path):
+    """The pyarrow schema of a Parquet or Arrow IPC file, also when it has no rows."""
+    pa = _pyarrow()
+    if file_format(path) == "parquet":
+        return pa.parquet.read_schema(path, memory_map=True)
+    with pa.memory_map(str(path)) as source:
+        try:
+            return pa.ipc.open_file(source).schema
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source).schema
+
+
+def iter_batches(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Yields the pyarrow RecordBatches of a Parquet or Arrow IPC file."""
+    pa = _pyarrow()
+    if file_format(path) == "parquet":
+        yield from pa.parquet.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size)
+        return
+    source = pa.memory_map(str(path))
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        # Streaming format (no footer)
+        source.seek(0)
+        batches = pa.ipc.open_stream(source)
+    for batch in batches:
+        # IPC batches are as large as the writer made them
+        for start in range(0, batch.num_rows, batch_size):
+            yield batch.slice(start, batch_size)
+
+
+def batch_columns(batch):
+    """
+    Input columns of one RecordBatch, typed as INPUT_FIELDS. Missing fields and
+    nulls get the field's default, like absent keys in generate_full_report.
+    """
+    names = batch.schema.names
+    columns = {}
+    for field, (dtype, default) in INPUT_FIELDS.items():
+        if field in names:
+            column = batch.column(names.index(field))
+            if column.null_count:
+                column = column.fill_null(default)
+            columns[field] = column.to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+        else:
+            columns[field] = np.full(batch.num_rows, default, dtype=dtype)
+    return columns
+
+
+def read_columns(path):
+    """Reads a whole file into input columns (e.g. for HouseholdStore(read_columns(path)))."""
+    parts = [batch_columns(batch) for batch in iter_batches(path)]
+    if not parts:
+        return {field: np.empty(0, dtype=dtype) for field, (dtype, _) in INPUT_FIELDS.items()}
+    return {field: np.concatenate([part[field] for part in parts]) for field in INPUT_FIELDS}
+
+
+def write_columns(path, columns, batch_size=DEFAULT_BATCH_SIZE, format=None):
+    """
+    Writes columns (e.g. HouseholdStore.columns()) as Parquet or Arrow IPC.
+
+    Args:
+        format (str): 'parquet' or 'ipc'; by default taken from the extension of `path`.
+    """
+    fmt = format or _extension_format(path)
+    if fmt not in ("parquet", "ipc"):
+        raise ValueError(f"Cannot tell the format of '{path}'; use a Parquet or Arrow extension or pass format=.")
+    pa = _pyarrow()
+    table = pa.table({name: np.asarray(values) for name, values in columns.items()})
+    if fmt == "parquet":
+        pa.parquet.write_table(table, path, row_group_size=batch_size)
+    else:
+        with pa.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table, max_chunksize=batch_size)
+
+
+def compute_file(source, destination, batch_size=DEFAULT_BATCH_SIZE, keep=None, compression="snappy"):
+    """
+    Computes the reports of every household in `source` and writes them to a
+    Parquet file, streaming one record batch (and row group) at a time.
+
+    Args:
+        source (str): Parquet or Arrow IPC file of household inputs.
+        destination (str): Parquet file receiving the report columns.
+        batch_size (int): Households per batch and row group.
+        keep (iterable): Source columns copied to the output in front of the
+                         report (e.g. a client id); defaults to every column that
+                         is neither an input field nor a report column.
+
+    An empty source gives an empty file with the same columns.
+
+    Returns:
+        dict: rows, batches and seconds.
+    """
+    pa = _pyarrow()
+    start = time.perf_counter()
+    schema = file_schema(source)
+    empty = pa.RecordBatch.from_arrays([pa.array([], type=field.type) for field in schema], schema=schema)
+    report_names = list(generate_batch_report(batch_columns(empty)))
+    if keep is None:
+        kept = [name for name in schema.names if name not in INPUT_FIELDS and name not in report_names]
+    else:
+        kept = list(keep)
+        clashes = [name for name in kept if name in report_names]
+        if clashes:
+            raise ValueError(f"Kept columns {clashes} have the names of report columns.")
+
+    def output(batch):
+        report = generate_batch_report(batch_columns(batch))
+        arrays = [batch.column(batch.schema.names.index(name)) for name in kept]
+        arrays += [pa.array(np.asarray(values)) for values in report.values()]
+        return pa.RecordBatch.from_arrays(arrays, names=kept + list(report))
+
+    writer = None
+    rows = batches = 0
+    try:
+        for batch in iter_batches(source, batch_size):
+            out = output(batch)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(destination, out.schema, compression=compression)
+            writer.write_batch(out, row_group_size=batch_size)
+            rows += out.num_rows
+            batches += 1
+        if writer is None:
+            writer = pa.parquet.ParquetWriter(destination, output(empty).schema, compression=compression)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {"rows": rows, "batches": batches, "seconds": time.perf_counter() - start}
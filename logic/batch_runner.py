@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import report_generator
+from .rendering import render_report
+from .report_generator import generate_full_report
+
+
+def report_file_path(output_dir, client_id):
+    """Per-client report file, replacing the single fixed German_Tax_Report.txt."""
+    return os.path.join(output_dir, f"{client_id}_German_Tax_Report.txt")
+
+
+def _init_worker():
+    report_generator.DEBUG = False
+
+
+def _compute_and_write(client_id, data, output_dir):
+    """Worker: computes one household and writes its report file."""
+    report = generate_full_report(data)
+    with open(report_file_path(output_dir, client_id), "w", encoding="utf-8") as f:
+        f.write(render_report(report, "text"))
+    return client_id, report
+
+
+def recompute_clients(households, output_dir, max_workers=None, progress=None, cancel_event=None):
+    """
+    Recomputes many households on a process pool and writes one report file each.
+
+    Args:
+        households (dict): Client id -> wizard input dict.
+        output_dir (str): Directory receiving the per-client report files.
+        max_workers (int): Size of the worker pool (defaults to the CPU count).
+        progress (callable): Called as progress(done, total) after every finished client.
+        cancel_event (threading.Event): When set, pending clients are skipped.
+
+    Returns:
+        tuple: (results, failures). results maps client id -> report for every
+               client that finished; failures maps client id -> error message for
+               every client the core could not compute. One failing client does
+               not stop the others.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    total = len(households)
+    results, failures = {}, {}
+    if total == 0:
+        return results, failures
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_compute_and_write, client_id, data, output_dir): client_id
+            for client_id, data in households.items()
+        }
+        for future in as_completed(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+                break
+            try:
+                client_id, report = future.result()
+                results[client_id] = report
+            except Exception as e:
+                failures[futures[future]] = f"{type(e).__name__}: {e}"
+            if progress is not None:
+                progress(len(results) + len(failures), total)
+    return results, failures
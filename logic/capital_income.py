@@ -0,0 +1,184 @@
+import csv
+import heapq
+from collections import defaultdict, deque
+
+from . import constants
+from .tax_calculator import calculate_german_tax, calculate_soli
+
+# Capital income (Anlage KAP): FIFO lot matching for broker trade histories,
+# Sparer-Pauschbetrag allocation between spouses and the Günstigerprüfung
+# (flat Abgeltungsteuer vs. personal tariff, § 32d (6) EStG).
+
+
+def _check_trade(trade, where):
+    """Rejects trades the lot matching cannot price: quantity must be > 0, price >= 0."""
+    if not trade["quantity"] > 0:
+        raise ValueError(f"Trade {where}: quantity must be positive, got {trade['quantity']}.")
+    if not trade["price"] >= 0:
+        raise ValueError(f"Trade {where}: price must not be negative, got {trade['price']}.")
+
+
+def read_trades_csv(path):
+    """
+    Yields trades from a broker CSV export with the columns
+    date, symbol, side (buy/sell), quantity, price and optionally fees.
+
+    Raises:
+        ValueError: For a row with a quantity <= 0 or a negative price (the
+                    message names the CSV line).
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            trade = {
+                "date": row["date"],
+                "symbol": row["symbol"],
+                "side": row["side"].strip().lower(),
+                "quantity": float(row["quantity"]),
+                "price": float(row["price"]),
+                "fees": float(row.get("fees") or 0.0),
+            }
+            _check_trade(trade, f"in line {reader.line_num} of {path}")
+            yield trade
+
+
+def _in_date_order(trades, presorted):
+    """
+    Passes date-ordered trades straight through. Unsorted input is ordered with a
+    heap (O(n log n)); this needs the whole history in memory.
+    """
+    if presorted:
+        yield from trades
+        return
+    heap = [(trade["date"], i, trade) for i, trade in enumerate(trades)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def match_lots(trades, presorted=True):
+    """
+    Matches sells against earlier buys of the same symbol, first in, first out.
+
+    Args:
+        trades (iterable): Trade dicts (see read_trades_csv), consumed lazily.
+        presorted (bool): Whether the trades already arrive in date order, as in
+                          broker exports. Memory then only grows with open lots.
+
+    Yields:
+        dict: One realized gain per sell: date, symbol, quantity, proceeds,
+              cost_basis and gain (EUR, after fees).
+
+    Raises:
+        ValueError: For a trade with a quantity <= 0 or a negative price, an
+                    unknown side, or a sell above the open position.
+    """
+    open_lots = defaultdict(deque)  # symbol -> deque of [quantity, cost per unit]
+    for trade in _in_date_order(trades, presorted):
+        _check_trade(trade, f"{trade}")
+        symbol, quantity = trade["symbol"], trade["quantity"]
+        fees = trade.get("fees", 0.0)
+        if trade["side"] == "buy":
+            open_lots[symbol].append([quantity, (quantity * trade["price"] + fees) / quantity])
+            continue
+        if trade["side"] != "sell":
+            raise ValueError(f"Unknown trade side '{trade['side']}'.")
+
+        lots = open_lots[symbol]
+        remaining, cost_basis = quantity, 0.0
+        while remaining > 1e-12:
+            if not lots:
+                raise ValueError(f"Sell of {quantity} {symbol} on {trade['date']} exceeds the open position.")
+            lot = lots[0]
+            used = min(lot[0], remaining)
+            cost_basis += used * lot[1]
+            lot[0] -= used
+            remaining -= used
+            if lot[0] <= 1e-12:
+                lots.popleft()
+
+        proceeds = quantity * trade["price"] - fees
+        yield {
+            "date": trade["date"],
+            "symbol": symbol,
+            "quantity": quantity,
+            "proceeds": proceeds,
+            "cost_basis": cost_basis,
+            "gain": proceeds - cost_basis,
+        }
+
+
+def realized_gains_by_year(trades, presorted=True):
+    """Sums FIFO-matched gains per calendar year (dates as ISO strings or dates)."""
+    totals = defaultdict(float)
+    for sale in match_lots(trades, presorted):
+        totals[int(str(sale["date"])[:4])] += sale["gain"]
+    return dict(totals)
+
+
+def allocate_sparer_pauschbetrag(income_a, income_b=0.0, is_married=False):
+    """
+    Applies the Sparer-Pauschbetrag. Under joint assessment the allowance is
+    doubled and any part one spouse cannot use goes to the other.
+
+    Returns:
+        dict: allowance_a, allowance_b, taxable_a and taxable_b.
+    """
+    allowance = constants.SPARER_PAUSCHBETRAG
+    positive_a = max(income_a, 0.0)
+    positive_b = max(income_b, 0.0) if is_married else 0.0
+    used_a = min(positive_a, allowance)
+    used_b = min(positive_b, allowance)
+    if is_married:
+        # Transfer the unused remainder between spouses
+        spare_a, spare_b = allowance - used_a, allowance - used_b
+        used_a += min(positive_a - used_a, spare_b)
+        used_b += min(positive_b - used_b, spare_a)
+    return {
+        "allowance_a": used_a,
+        "allowance_b": used_b,
+        "taxable_a": max(income_a - used_a, 0.0) if income_a > 0 else income_a,
+        "taxable_b": max(income_b - used_b, 0.0) if income_b > 0 else income_b,
+    }
+
+
+def calculate_capital_income_tax(report, capital_income_a, capital_income_b=0.0):
+    """
+    Günstigerprüfung for a household's capital income on top of a computed report.
+
+    Args:
+        report (dict): Result of generate_full_report for the household.
+        capital_income_a (float): Person A's net capital income (gains, interest,
+                                  dividends after loss offsetting), EUR.
+        capital_income_b (float): Person B's net capital income, EUR.
+
+    Returns:
+        dict: The allowance split, the tax under both methods (incl. Soli) and
+              the cheaper method.
+    """
+    tax_year = report["tax_year"]
+    is_married = report["tax_class"] != 1
+    allocation = allocate_sparer_pauschbetrag(capital_income_a, capital_income_b, is_married)
+    taxable_capital = max(allocation["taxable_a"] + allocation["taxable_b"], 0.0)
+
+    # 1. Flat-rate Abgeltungsteuer plus Soli
+    flat_tax = taxable_capital * constants.ABGELTUNGSTEUER_RATE
+    flat_total = flat_tax * (1 + constants.SOLI_RATE)
+
+    # 2. Personal tariff: capital income joins the zvE, foreign income still only affects the rate
+    taxable = report["taxable_income_de"] + taxable_capital
+    global_income = taxable + report["foreign_income"]
+    rate = calculate_german_tax(global_income, tax_year, is_married) / global_income if global_income > 0 else 0
+    tariff_tax = taxable * rate
+    tariff_total = (tariff_tax + calculate_soli(tariff_tax, tax_year, is_married)
+                    - report["final_tax_liability"] - report["soli"])
+
+    use_tariff = tariff_total < flat_total
+    return {
+        **allocation,
+        "taxable_capital_income": taxable_capital,
+        "abgeltungsteuer": flat_total,
+        "tariff_tax_on_capital": tariff_total,
+        "capital_income_tax": tariff_total if use_tariff else flat_total,
+        "guenstigerpruefung_applied": use_tariff,
+    }
@@ -8,6 +8,9 @@ BANK_FEE_FLAT_RATE = 16.0
 INTERNET_PHONE_FLAT_RATE = 240.0 
 HOME_OFFICE_DAY_RATE = 6.0
 MOVING_LUMP_SUM_NON_EU = 890.0
+# Unterhalt (§ 33a (1) EStG): share of the basic allowance deductible per supported
+# person living in India (Ländergruppe 4 of the BMF Ländergruppeneinteilung)
+UNTERHALT_INDIA_FACTOR = 0.25
 
 # Deduction rates & limits
 KITA_DEDUCTION_RATE = 2/3
@@ -26,6 +29,24 @@ SOLI_EXEMPTION_LIMITS = {
     2026: 20350
 }
 
+# § 32a EStG tariff zones of 2024: zone ends (zvE), zone 1/2 polynomial
+# coefficients and zone 3/4 rate/offset. The 2025 and 2026 tariffs have not
+# been entered yet, so those years refer to this same table.
+TARIFF_2024 = {
+    'ZONE_1_END': 17005,
+    'ZONE_2_END': 66760,
+    'ZONE_3_END': 277825,
+    'ZONE_1_A': 922.98,
+    'ZONE_1_B': 1400,
+    'ZONE_2_A': 181.19,
+    'ZONE_2_B': 2397,
+    'ZONE_2_C': 1025.38,
+    'ZONE_3_RATE': 0.42,
+    'ZONE_3_OFFSET': 10602.13,
+    'ZONE_4_RATE': 0.45,
+    'ZONE_4_OFFSET': 18936.88,
+}
+
 # Constants for different tax years
 TAX_YEAR_CONSTANTS = {
     2024: {
@@ -38,6 +59,7 @@ TAX_YEAR_CONSTANTS = {
             'health': 62100,
         },
         'ADDITIONAL_HEALTH_INSURANCE_RATE': 0.017,
+        'TARIFF': TARIFF_2024,
     },
     2025: {
         'BASIC_ALLOWANCE': 12096,
@@ -47,6 +69,7 @@ TAX_YEAR_CONSTANTS = {
             'health': 66150,
         },
         'ADDITIONAL_HEALTH_INSURANCE_RATE': 0.025,
+        'TARIFF': TARIFF_2024,
     },
     2026: {
         'BASIC_ALLOWANCE': 12348,
@@ -56,5 +79,11 @@ TAX_YEAR_CONSTANTS = {
             'health': 69750, # Based on previous version of estimate_social_security_2026
         },
         'ADDITIONAL_HEALTH_INSURANCE_RATE': 0.029,
+        'TARIFF': TARIFF_2024,
     }
 }
+
+# Capital income (Abgeltungsteuer, § 20 / § 32d EStG)
+SPARER_PAUSCHBETRAG = 1000.0 # Per person, doubled for joint assessment
+ABGELTUNGSTEUER_RATE = 0.25
+SOLI_RATE = 0.055
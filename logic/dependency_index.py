@@ -0,0 +1,315 @@
+import numpy as np
+
+from . import constants
+from .vectorized import generate_batch_report, tariff_arrays, _year_lookup, DEFAULT_SOLI_LIMIT
+from .validation_rules import year_limits
+
+# Which rule constants each computed report depends on.
+#
+# After a change to logic/constants.py only the households whose calculation
+# reaches the changed value need a new report: a new COMMUTE_ALLOWANCE_HIGH_KM
+# only matters above COMMUTE_ALLOWANCE_THRESHOLD_KM, a new health cap only for
+# contributions near the maximum, a new Soli limit only for tax liabilities
+# between the old and the new limit. The index keeps, per household, the input
+# and intermediate values these branches compare against, so a constants diff
+# can be mapped to the households to recompute without running the core again.
+#
+# Constants are named by their path in logic/constants.py, with nested keys
+# joined by dots: "COMMUTE_ALLOWANCE_HIGH_KM", "SOLI_EXEMPTION_LIMITS.2025",
+# "TAX_YEAR_CONSTANTS.2025.SOCIAL_SECURITY_CAPS.health".
+
+# Constants that generate_full_report does not read (used by other modules or
+# already applied to the inputs, like the moving lump sum of the residency engine)
+UNUSED_CONSTANTS = (
+    "INTERNET_PHONE_FLAT_RATE", "MOVING_LUMP_SUM_NON_EU", "SPARER_PAUSCHBETRAG",
+    "ABGELTUNGSTEUER_RATE", "CHILD_ALLOWANCE",
+)
+
+# Validation limit -> (contribution fields, cap it scales with)
+_CONTRIBUTION_LIMITS = {
+    "max_pension": ("de_pension", "pension"),
+    "max_unemployment": ("de_unemployment", "pension"),
+    "max_health": ("de_health", "health"),
+    "max_nursing": ("de_nursing", "health"),
+}
+
+
+def flatten_constants(module=constants):
+    """{path: value} of every rule constant, nested dicts flattened (see module comment)."""
+    flat = {}
+
+    def walk(prefix, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(f"{prefix}.{key}", item)
+        else:
+            flat[prefix] = value
+
+    for name in dir(module):
+        if name.isupper():
+            walk(name, getattr(module, name))
+    return flat
+
+
+def diff_constants(old, new):
+    """
+    Compares two flatten_constants snapshots.
+
+    Returns:
+        dict: {path: (old value, new value)} for every changed, added (old None)
+              or removed (new None) constant.
+    """
+    return {
+        path: (old.get(path), new.get(path))
+        for path in sorted(set(old) | set(new))
+        if old.get(path) != new.get(path)
+    }
+
+
+def _interval(old, new):
+    """(low, high) of a numeric change, None if a side is missing or not a number."""
+    if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+        return min(old, new), max(old, new)
+    return None
+
+
+class DependencyIndex:
+    """
+    Per-household record of the constants and branches a batch of reports touched.
+
+    Build it together with the reports (`DependencyIndex.build`), keep it next to
+    them, and ask `affected(diff_constants(before, after))` which rows to recompute.
+    """
+
+    def __init__(self, probes, limits):
+        self.probes = probes
+        self.limits = limits
+        self.size = len(probes["tax_year"])
+        self._touched = None
+
+    @classmethod
+    def build(cls, columns, report=None):
+        """
+        Args:
+            columns: Household inputs (a HouseholdStore or a {field: column} mapping).
+            report (dict): The batch report of these inputs; computed if not given.
+        """
+        if hasattr(columns, "columns"):
+            columns = columns.columns()
+        if report is None:
+            report = generate_batch_report(columns)
+        is_married = np.asarray(columns["is_married"], dtype=bool)
+        probes = {
+            "tax_year": np.asarray(report["tax_year"]),
+            "is_married": is_married,
+            # Tariff input per person (halved under splitting)
+            "tariff_income": np.where(is_married, report["global_income_for_rate"] / 2, report["global_income_for_rate"]),
+            "final_tax_liability": np.asarray(report["final_tax_liability"]),
+            "soli": np.asarray(report["soli"]) > 0,  # Above the Soli limit
+            # Upper end of tariff zone 1; only zones 0 and 1 use the basic allowance
+            "entry_zone_end": tariff_arrays(report["tax_year"])["ZONE_1_END"],
+            "foreign_inr": columns["in_rent"] + columns["in_interest"] + columns["in_salary"],
+        }
+        for field in ("in_tds_inr", "kita_costs", "nk_labor", "parents_support", "supported_persons"):
+            probes[field] = np.asarray(columns[field], dtype=np.float64)
+        probes["basic_allowance"] = _year_lookup(
+            probes["tax_year"], {y: c["BASIC_ALLOWANCE"] for y, c in constants.TAX_YEAR_CONSTANTS.items()}
+        )
+        for person in ("a", "b"):
+            employed = columns[f"de_gross_{person}"] > 0
+            if person == "b":
+                employed = employed & is_married
+            probes[f"employed_{person}"] = employed
+            probes[f"ho_days_{person}"] = np.where(employed, columns[f"ho_days_{person}"], 0.0)
+            probes[f"commute_km_{person}"] = np.where(
+                employed & (columns[f"office_days_{person}"] > 0), columns[f"commute_km_{person}"], 0.0
+            )
+            # Werbungskosten before the Pauschale floor
+            probes[f"wk_raw_{person}"] = np.where(
+                employed, report[f"ho_{person}"] + report[f"commute_{person}"] + report[f"moving_{person}"], np.inf
+            )
+            probes[f"bank_fee_{person}"] = report[f"bank_fee_{person}"] > 0
+            for field in ("de_gross", "de_tax_paid", "de_pension", "de_health", "de_nursing", "de_unemployment"):
+                probes[f"{field}_{person}"] = np.asarray(columns[f"{field}_{person}"])
+        years = np.unique(probes["tax_year"]).tolist()
+        return cls(probes, {year: year_limits(year) for year in years})
+
+    def __len__(self):
+        return self.size
+
+    # --- Affected households ---
+
+    def affected(self, changes):
+        """
+        Households whose report can differ after the given constant changes.
+
+        Args:
+            changes (dict): {path: (old, new)}, e.g. from diff_constants. `old` must
+                            be the value the indexed reports were computed with.
+
+        Returns:
+            np.ndarray: Boolean mask over the indexed households.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        for path, (old, new) in changes.items():
+            mask |= self._affected_by(path, old, new)
+        return mask
+
+    def households(self, changes):
+        """Row indices of the households to recompute (see affected)."""
+        return np.flatnonzero(self.affected(changes))
+
+    def _affected_by(self, path, old, new):
+        p = self.probes
+        name, _, rest = path.partition(".")
+        everyone = np.ones(self.size, dtype=bool)
+        if name in UNUSED_CONSTANTS or rest.endswith("CHILD_ALLOWANCE"):
+            return ~everyone
+        interval = _interval(old, new)
+
+        if name == "TARIFF_2024":
+            # Shared table; its changes also show up under TAX_YEAR_CONSTANTS.<year>.TARIFF
+            return ~everyone
+        if name == "INR_TO_EUR_RATE":
+            return (p["foreign_inr"] != 0) | (p["in_tds_inr"] != 0)
+        if name == "UNTERHALT_INDIA_FACTOR":
+            # Only the validation rule on parents_support compares against it
+            threshold = p["basic_allowance"] * p["supported_persons"]
+            if interval is None:
+                return p["parents_support"] > 0
+            return (p["parents_support"] > interval[0] * threshold) & (p["parents_support"] <= interval[1] * threshold)
+        if name == "KITA_DEDUCTION_RATE":
+            return p["kita_costs"] != 0
+        if name == "NEBENKOSTEN_LABOR_CREDIT_RATE":
+            return p["nk_labor"] != 0
+        if name in ("WERBUNGSKOSTEN_PAUSCHALE", "BANK_FEE_FLAT_RATE", "HOME_OFFICE_DAY_RATE",
+                    "MAX_HOME_OFFICE_DEDUCTION", "COMMUTE_ALLOWANCE_LOW_KM", "COMMUTE_ALLOWANCE_HIGH_KM",
+                    "COMMUTE_ALLOWANCE_THRESHOLD_KM"):
+            return self._werbungskosten("a", name, interval) | self._werbungskosten("b", name, interval)
+        if name == "SOLI_RATE":
+            return p["soli"]
+        if name == "SOLI_EXEMPTION_LIMITS":
+            year = int(rest)
+            if interval is None:
+                return p["tax_year"] == year
+            factor = np.where(p["is_married"], 2, 1)
+            liability = p["final_tax_liability"]
+            return (p["tax_year"] == year) & (liability > interval[0] * factor) & (liability <= interval[1] * factor)
+        if name == "TAX_YEAR_CONSTANTS":
+            year, _, key = rest.partition(".")
+            in_year = p["tax_year"] == int(year)
+            if interval is None:
+                return in_year
+            if key == "BASIC_ALLOWANCE":
+                return in_year & self._basic_allowance(*interval)
+            if key.startswith("TARIFF."):
+                return in_year
+            if key.startswith("SOCIAL_SECURITY_CAPS.") or key == "ADDITIONAL_HEALTH_INSURANCE_RATE":
+                return in_year & self._contribution_limits(int(year), key, old, interval)
+        # Unknown constant: recompute everything
+        return everyone
+
+    def _werbungskosten(self, person, name, interval):
+        p = self.probes
+        employed = p[f"employed_{person}"]
+        ho_days, km = p[f"ho_days_{person}"], p[f"commute_km_{person}"]
+        if name == "WERBUNGSKOSTEN_PAUSCHALE":
+            # wk = max(Pauschale, raw): only matters while raw is below the higher value
+            return employed & ((p[f"wk_raw_{person}"] < interval[1]) if interval else True)
+        if name == "BANK_FEE_FLAT_RATE":
+            return p[f"bank_fee_{person}"]
+        if name == "HOME_OFFICE_DAY_RATE":
+            return ho_days > 0
+        if name == "MAX_HOME_OFFICE_DEDUCTION":
+            return (ho_days * constants.HOME_OFFICE_DAY_RATE > interval[0]) if interval else ho_days > 0
+        if name == "COMMUTE_ALLOWANCE_LOW_KM":
+            return km > 0
+        if name == "COMMUTE_ALLOWANCE_HIGH_KM":
+            return km > constants.COMMUTE_ALLOWANCE_THRESHOLD_KM
+        # COMMUTE_ALLOWANCE_THRESHOLD_KM: the split formula applies above the lower value
+        return (km > interval[0]) if interval else km > 0
+
+    def _basic_allowance(self, low, high):
+        p = self.probes
+        factor = np.where(p["is_married"], 0.5, 1.0)
+        # Tariff zones 0 and 1 use it; zvE between the two values changes zone
+        tariff = (p["tariff_income"] > low * factor) & (p["tariff_income"] <= np.maximum(p["entry_zone_end"], high * factor))
+        # Validation rules comparing against it (the Unterhalt maximum scales with it)
+        per_allowance = constants.UNTERHALT_INDIA_FACTOR * p["supported_persons"]
+        parents = (p["parents_support"] > low * per_allowance) & (p["parents_support"] <= high * per_allowance)
+        withholding = np.zeros(self.size, dtype=bool)
+        for person in ("a", "b"):
+            gross = p[f"de_gross_{person}"]
+            withholding |= (p[f"de_tax_paid_{person}"] == 0) & (gross > 2 * low) & (gross <= 2 * high)
+        return tariff | parents | withholding
+
+    def _contribution_limits(self, year, key, old, interval):
+        # The contribution limits of the validation rules scale linearly with the
+        # cap (exact) and less than linearly with the additional health rate (so
+        # scaling by the rate ratio gives a superset of the affected households).
+        p = self.probes
+        if not old:
+            return np.ones(self.size, dtype=bool)
+        low, high = interval[0] / old, interval[1] / old
+        if key == "ADDITIONAL_HEALTH_INSURANCE_RATE":
+            limits = ("max_health",)
+        else:
+            cap = key.rpartition(".")[2]
+            limits = [name for name, (_, scales_with) in _CONTRIBUTION_LIMITS.items() if scales_with == cap]
+        mask = np.zeros(self.size, dtype=bool)
+        for name in limits:
+            threshold = self.limits[year][name] * 1.01
+            field = _CONTRIBUTION_LIMITS[name][0]
+            for person in ("a", "b"):
+                value = p[f"{field}_{person}"]
+                mask |= (value > threshold * low) & (value <= threshold * high)
+        return mask
+
+    # --- Recorded dependencies ---
+
+    def touched(self):
+        """
+        {dependency: boolean column} of the constants and branches each report used
+        with the constants it was computed with, e.g. "COMMUTE_ALLOWANCE_HIGH_KM"
+        (commute above the threshold), "SOLI_EXEMPTION_LIMITS.2025" (liability above
+        the limit), "TAX_YEAR_CONSTANTS.2025.SOCIAL_SECURITY_CAPS.health" (salary at
+        or above the cap).
+        """
+        if self._touched is not None:
+            return self._touched
+        p = self.probes
+        touched = {}
+        for name in ("INR_TO_EUR_RATE", "UNTERHALT_INDIA_FACTOR", "KITA_DEDUCTION_RATE", "NEBENKOSTEN_LABOR_CREDIT_RATE",
+                     "BANK_FEE_FLAT_RATE", "HOME_OFFICE_DAY_RATE", "COMMUTE_ALLOWANCE_LOW_KM",
+                     "COMMUTE_ALLOWANCE_HIGH_KM", "SOLI_RATE"):
+            touched[name] = self._affected_by(name, None, None)
+        value = constants.WERBUNGSKOSTEN_PAUSCHALE
+        touched["WERBUNGSKOSTEN_PAUSCHALE"] = (p["wk_raw_a"] < value) | (p["wk_raw_b"] < value)
+        value = constants.MAX_HOME_OFFICE_DEDUCTION
+        touched["MAX_HOME_OFFICE_DEDUCTION"] = (
+            (p["ho_days_a"] * constants.HOME_OFFICE_DAY_RATE >= value) | (p["ho_days_b"] * constants.HOME_OFFICE_DAY_RATE >= value)
+        )
+        touched["COMMUTE_ALLOWANCE_THRESHOLD_KM"] = touched["COMMUTE_ALLOWANCE_HIGH_KM"]
+
+        limit = _year_lookup(p["tax_year"], constants.SOLI_EXEMPTION_LIMITS, default=DEFAULT_SOLI_LIMIT) * np.where(p["is_married"], 2, 1)
+        allowance = _year_lookup(p["tax_year"], {y: c["BASIC_ALLOWANCE"] for y, c in constants.TAX_YEAR_CONSTANTS.items()})
+        for year in self.limits:
+            in_year = p["tax_year"] == year
+            touched[f"SOLI_EXEMPTION_LIMITS.{year}"] = in_year & (p["final_tax_liability"] > limit)
+            touched[f"TAX_YEAR_CONSTANTS.{year}.BASIC_ALLOWANCE"] = in_year & (
+                p["tariff_income"] <= np.maximum(p["entry_zone_end"], allowance * np.where(p["is_married"], 0.5, 1.0))
+            )
+            for cap, value in constants.TAX_YEAR_CONSTANTS[year]["SOCIAL_SECURITY_CAPS"].items():
+                touched[f"TAX_YEAR_CONSTANTS.{year}.SOCIAL_SECURITY_CAPS.{cap}"] = in_year & (
+                    (p["de_gross_a"] >= value) | (p["employed_b"] & (p["de_gross_b"] >= value))
+                )
+        self._touched = touched
+        return touched
+
+    def touched_by(self, row):
+        """The dependencies one household's report touched."""
+        return [name for name, column in self.touched().items() if column[row]]
+
+    def counts(self):
+        """Number of households per dependency."""
+        return {name: int(column.sum()) for name, column in self.touched().items()}
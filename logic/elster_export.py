@@ -0,0 +1,102 @@
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+from .form_mapping import get_form_mapping
+
+# ELSTER-style XML export of the Anlage values from form_mapping.
+#
+# Documents are written incrementally: every return becomes one Nutzdatenblock
+# that is serialized and flushed on its own, so memory does not grow with the
+# number of returns. The envelope follows the ELSTER layout, but the namespace and
+# the bundled schema (schemas/elster_export.xsd) are our own, not the official ones.
+
+NAMESPACE = "urn:indo-german-tax:elster-export:v1"
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schemas", "elster_export.xsd")
+
+
+def _return_block(ticket, report):
+    """Serializes one return (report) as a Nutzdatenblock string."""
+    forms = {}
+    for instruction in get_form_mapping(report):
+        forms.setdefault(instruction["form"], []).append(instruction)
+
+    parts = [
+        "  <Nutzdatenblock>\n",
+        f"   <NutzdatenHeader><NutzdatenTicket>{escape(str(ticket))}</NutzdatenTicket></NutzdatenHeader>\n",
+        f"   <Nutzdaten><ESt Jahr={quoteattr(str(report['tax_year']))}>\n",
+    ]
+    for form, instructions in forms.items():
+        parts.append(f"    <Anlage name={quoteattr(form)}>\n")
+        for instruction in instructions:
+            parts.append(
+                f"     <Feld zeile={quoteattr(instruction['line'])} key={quoteattr(instruction['key'])}>"
+                f"{instruction['amount']:.2f}</Feld>\n"
+            )
+        parts.append("    </Anlage>\n")
+    parts.append("   </ESt></Nutzdaten>\n  </Nutzdatenblock>\n")
+    return "".join(parts)
+
+
+def iter_elster_xml(reports, test_mode=True):
+    """
+    Yields the XML document for many returns chunk by chunk.
+
+    Args:
+        reports (iterable): (ticket, report) pairs, consumed lazily.
+        test_mode (bool): Add the ELSTER Testmerker to the header.
+    """
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<Elster xmlns="{NAMESPACE}" version="1">\n'
+    yield " <TransferHeader><Verfahren>ElsterErklaerung</Verfahren><DatenArt>ESt</DatenArt>"
+    if test_mode:
+        yield "<Testmerker>700000004</Testmerker>"
+    yield "</TransferHeader>\n <DatenTeil>\n"
+    for ticket, report in reports:
+        yield _return_block(ticket, report)
+    yield " </DatenTeil>\n</Elster>\n"
+
+
+def write_elster_xml(reports, path, test_mode=True):
+    """Streams the export of (ticket, report) pairs to `path`. Returns the number of returns."""
+    count = 0
+
+    def counted():
+        nonlocal count
+        for item in reports:
+            count += 1
+            yield item
+
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_elster_xml(counted(), test_mode):
+            f.write(chunk)
+    return count
+
+
+def validate_elster_xml(path, schema_path=SCHEMA_PATH):
+    """
+    Validates an export against the bundled XSD without network access. The file is
+    parsed incrementally and each return is released after validation.
+
+    Requires lxml.
+
+    Raises:
+        ValueError: If the document does not match the schema.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        raise RuntimeError("XML schema validation requires the 'lxml' package.")
+
+    parser = etree.XMLParser(no_network=True)
+    schema = etree.XMLSchema(etree.parse(schema_path, parser))
+    count = 0
+    try:
+        for _, element in etree.iterparse(path, events=("end",), tag=f"{{{NAMESPACE}}}Nutzdatenblock",
+                                          schema=schema, no_network=True):
+            count += 1
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        raise ValueError(f"ELSTER export does not match the schema: {e}")
+    return count
@@ -0,0 +1,196 @@
+import numpy as np
+
+from . import constants
+from .constants import TAX_YEAR_CONSTANTS, SOLI_EXEMPTION_LIMITS
+from .vectorized import DEFAULT_SOLI_LIMIT, _year_lookup, tariff_arrays
+
+# Integer-cent version of the tariff and Soli. All amounts are int cents, all
+# intermediate products stay within int64 for incomes up to ~10 million euros.
+#
+# With statutory=True the official rounding is applied (§ 32a EStG, § 4 SolZG):
+#   - zvE is floored to full euros (for splitting: half the zvE, floored),
+#   - the income tax is floored to full euros,
+#   - the Soli is floored to full cents.
+# With statutory=False only cent rounding happens, which reproduces the float
+# functions in tax_calculator.py to within one cent.
+
+# Polynomial coefficients scaled so that y = d / 10000 euros becomes d_cents / 10**6
+_SCALE = 10**12
+
+
+# Factor of each tariff value in its integer form (see integer_tariff); 100 otherwise
+_TARIFF_SCALES = {"ZONE_1_B": 10**8, "ZONE_2_B": 10**8}
+
+
+def integer_tariff(tariff):
+    """
+    Integer-cent form of a TAX_YEAR_CONSTANTS[year]['TARIFF'] table (scalars or
+    arrays): zone ends, zone offsets and zone 2 constant in cents, zone 1/2
+    coefficients scaled by _SCALE, zone 3/4 rates in percent.
+    """
+    return {
+        key: np.rint(np.asarray(value) * _TARIFF_SCALES.get(key, 100)).astype(np.int64)
+        for key, value in tariff.items()
+    }
+
+
+def to_cents(euros):
+    """Converts a euro float (or array) to int cents, rounding half away from zero."""
+    if isinstance(euros, np.ndarray):
+        return np.rint(euros * 100).astype(np.int64)
+    return int(round(euros * 100))
+
+
+def floor_to_euro(cents):
+    """Floors an amount in cents to full euros (still expressed in cents)."""
+    return cents - cents % 100
+
+
+def _scalar_tariff(year):
+    """integer_tariff of one year as Python ints, from the live constants (no NumPy round trip)."""
+    return {
+        key: round(value * _TARIFF_SCALES.get(key, 100))
+        for key, value in TAX_YEAR_CONSTANTS[year]['TARIFF'].items()
+    }
+
+
+def _basic_allowance_cents(year):
+    if year not in TAX_YEAR_CONSTANTS:
+        raise ValueError(f"Tax constants for year {year} are not available.")
+    return TAX_YEAR_CONSTANTS[year]['BASIC_ALLOWANCE'] * 100
+
+
+def _tariff_zones(zvE, allowance, t):
+    """Base tariff (no splitting) in cents for a zvE in cents. Scalar version."""
+    if zvE <= allowance:
+        return 0
+    if zvE <= t['ZONE_1_END']:
+        d = zvE - allowance
+        return (t['ZONE_1_A'] * d * d + t['ZONE_1_B'] * d + _SCALE // 2) // _SCALE
+    if zvE <= t['ZONE_2_END']:
+        e = zvE - t['ZONE_1_END']
+        return (t['ZONE_2_A'] * e * e + t['ZONE_2_B'] * e + _SCALE // 2) // _SCALE + t['ZONE_2_C']
+    if zvE <= t['ZONE_3_END']:
+        return (t['ZONE_3_RATE'] * zvE + 50) // 100 - t['ZONE_3_OFFSET']
+    return (t['ZONE_4_RATE'] * zvE + 50) // 100 - t['ZONE_4_OFFSET']
+
+
+def calculate_german_tax_cents(zvE_cents, year, is_married=True, statutory=True):
+    """
+    Integer-cent counterpart of tax_calculator.calculate_german_tax.
+
+    Args:
+        zvE_cents (int): Taxable income in cents.
+        year (int): The tax year to use for constants.
+        is_married (bool): Apply the splitting method.
+        statutory (bool): Apply the official euro rounding of zvE and tax.
+
+    Returns:
+        int: Income tax in cents.
+    """
+    allowance = _basic_allowance_cents(year)
+    if is_married:
+        zvE_cents = zvE_cents // 2
+        allowance = allowance // 2
+    if statutory:
+        zvE_cents = floor_to_euro(zvE_cents)
+
+    t = _scalar_tariff(year)
+    tax = _tariff_zones(zvE_cents, allowance, t)
+    if statutory:
+        tax = floor_to_euro(tax)
+    return tax * 2 if is_married else tax
+
+
+def _soli_per_mille():
+    return round(constants.SOLI_RATE * 1000)
+
+
+def calculate_soli_cents(tax_cents, tax_year, is_married):
+    """Integer-cent counterpart of tax_calculator.calculate_soli (Soli floored to cents)."""
+    limit = SOLI_EXEMPTION_LIMITS.get(tax_year, DEFAULT_SOLI_LIMIT) * 100
+    if is_married:
+        limit *= 2
+    if tax_cents <= limit:
+        return 0
+    return tax_cents * _soli_per_mille() // 1000
+
+
+def calculate_liability_cents(taxable_income_cents, foreign_income_cents, year, is_married, statutory=True):
+    """
+    Tax on German income at the Progressionsvorbehalt rate, as in generate_full_report
+    steps 4 to 6, in int cents.
+
+    Returns:
+        dict: tax_on_global, final_tax_liability and soli, all in cents.
+    """
+    if statutory:
+        taxable_income_cents = floor_to_euro(taxable_income_cents)
+    global_income = taxable_income_cents + foreign_income_cents
+    tax_on_global = calculate_german_tax_cents(global_income, year, is_married, statutory)
+    final_tax = taxable_income_cents * tax_on_global // global_income if global_income > 0 else 0
+    if statutory:
+        final_tax = floor_to_euro(final_tax)
+    return {
+        "tax_on_global": tax_on_global,
+        "final_tax_liability": final_tax,
+        "soli": calculate_soli_cents(final_tax, year, is_married),
+    }
+
+
+# --- Vectorized (int64 array) versions ---
+
+def calculate_german_tax_cents_array(zvE_cents, year, is_married=True, statutory=True):
+    """Vectorized calculate_german_tax_cents over int64 arrays."""
+    zvE = np.asarray(zvE_cents, dtype=np.int64)
+    is_married = np.broadcast_to(np.asarray(is_married, dtype=bool), zvE.shape)
+    allowance = np.broadcast_to(
+        _year_lookup(year, {y: c['BASIC_ALLOWANCE'] for y, c in TAX_YEAR_CONSTANTS.items()}), zvE.shape
+    ).astype(np.int64) * 100
+
+    zvE = np.where(is_married, zvE // 2, zvE)
+    allowance = np.where(is_married, allowance // 2, allowance)
+    if statutory:
+        zvE = floor_to_euro(zvE)
+
+    t = integer_tariff(tariff_arrays(year, zvE.shape))
+    d = zvE - allowance
+    e = zvE - t['ZONE_1_END']
+    tax = np.select(
+        [zvE <= allowance, zvE <= t['ZONE_1_END'], zvE <= t['ZONE_2_END'], zvE <= t['ZONE_3_END']],
+        [
+            0,
+            (t['ZONE_1_A'] * d * d + t['ZONE_1_B'] * d + _SCALE // 2) // _SCALE,
+            (t['ZONE_2_A'] * e * e + t['ZONE_2_B'] * e + _SCALE // 2) // _SCALE + t['ZONE_2_C'],
+            (t['ZONE_3_RATE'] * zvE + 50) // 100 - t['ZONE_3_OFFSET'],
+        ],
+        default=(t['ZONE_4_RATE'] * zvE + 50) // 100 - t['ZONE_4_OFFSET'],
+    )
+    if statutory:
+        tax = floor_to_euro(tax)
+    return np.where(is_married, tax * 2, tax)
+
+
+def calculate_soli_cents_array(tax_cents, tax_year, is_married):
+    """Vectorized calculate_soli_cents over int64 arrays."""
+    tax = np.asarray(tax_cents, dtype=np.int64)
+    limit = _year_lookup(tax_year, SOLI_EXEMPTION_LIMITS, default=DEFAULT_SOLI_LIMIT).astype(np.int64) * 100
+    limit = np.where(is_married, limit * 2, limit)
+    return np.where(tax <= limit, 0, tax * _soli_per_mille() // 1000)
+
+
+def calculate_liability_cents_array(taxable_income_cents, foreign_income_cents, year, is_married, statutory=True):
+    """Vectorized calculate_liability_cents over int64 arrays."""
+    taxable = np.asarray(taxable_income_cents, dtype=np.int64)
+    if statutory:
+        taxable = floor_to_euro(taxable)
+    global_income = taxable + np.asarray(foreign_income_cents, dtype=np.int64)
+    tax_on_global = calculate_german_tax_cents_array(global_income, year, is_married, statutory)
+    final_tax = np.where(global_income > 0, taxable * tax_on_global // np.maximum(global_income, 1), 0)
+    if statutory:
+        final_tax = floor_to_euro(final_tax)
+    return {
+        "tax_on_global": tax_on_global,
+        "final_tax_liability": final_tax,
+        "soli": calculate_soli_cents_array(final_tax, year, is_married),
+    }
@@ -0,0 +1,250 @@
+import csv
+import json
+import os
+import re
+from datetime import date, datetime
+
+from . import constants
+
+# Offline import of Indian tax statements (Form 26AS, AIS, Form 16A).
+#
+# Entries are streamed from locally saved exports: TRACES text files
+# ('^'-delimited), CSV downloads, JSON arrays or JSON lines. Each entry is
+# converted to EUR at the rate of its own transaction date and aggregated per
+# category, so multi-year statements never have to be held in memory and can be
+# cut to the German (calendar) tax year rather than the Indian financial year.
+
+# Section code (normalized, see _normalize_section) -> income category
+SECTION_CATEGORIES = {
+    "193": "interest",    # Interest on securities
+    "194A": "interest",   # Interest other than on securities
+    "194I": "rent",
+    "194IA": "other",     # Transfer of immovable property, not rent
+    "194IB": "rent",      # Rent paid by individuals / HUF
+    "194K": "other",
+}
+
+# Category -> wizard field for the income amount
+CATEGORY_FIELDS = {
+    "rent": "in_rent",
+    "interest": "in_interest",
+}
+
+# Header aliases used by the different exports (compared lower-case)
+COLUMN_ALIASES = {
+    "section": ("section", "section code", "tds section"),
+    "date": ("transaction date", "date of payment/credit", "date", "transaction_date"),
+    "amount": ("amount paid / credited", "amount paid/credited", "amount", "amount_paid", "gross amount"),
+    "tds": ("tds deposited", "tax deducted", "tds", "tds_deposited", "tax deducted at source"),
+    "description": ("information description", "nature of payment", "description", "information category"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d-%b-%Y", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y")
+
+
+def _normalize_section(section):
+    # Clauses in brackets belong to the section ("194I(a)", "194I(b)" -> "194I"),
+    # unlike the letters of sections such as 194IA and 194IB
+    section = re.sub(r"\([0-9A-Z]*\)", "", str(section).upper())
+    return re.sub(r"[^0-9A-Z]", "", section)
+
+
+def parse_amount(value):
+    """Parses an Indian formatted amount ("1,23,456.00"); empty values count as 0."""
+    text = str(value or "").replace(",", "").replace("₹", "").strip()
+    return float(text) if text and text != "-" else 0.0
+
+
+def parse_date(value):
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized transaction date '{value}'.")
+
+
+def categorize(section, description=""):
+    """Maps a section code (or, failing that, the description) to rent / interest / other."""
+    category = SECTION_CATEGORIES.get(_normalize_section(section))
+    if category:
+        return category
+    description = str(description or "").lower()
+    if "rent" in description:
+        return "rent"
+    if "interest" in description:
+        return "interest"
+    return "other"
+
+
+def _column_map(header):
+    """Returns {column name: index} if `header` is a recognizable table header, else None."""
+    cells = [cell.strip().lower() for cell in header]
+    columns = {}
+    for name, aliases in COLUMN_ALIASES.items():
+        for i, cell in enumerate(cells):
+            if cell in aliases:
+                columns[name] = i
+                break
+    return columns if {"date", "amount"} <= columns.keys() else None
+
+
+def _entry(raw):
+    return {
+        "date": parse_date(raw["date"]),
+        "section": str(raw.get("section") or ""),
+        "description": str(raw.get("description") or ""),
+        "amount_inr": parse_amount(raw.get("amount")),
+        "tds_inr": parse_amount(raw.get("tds")),
+    }
+
+
+def _iter_delimited(f, delimiter):
+    """
+    Streams rows of every table in a delimited export. A 26AS text file holds
+    several tables (Part A, A1, B, ...), each starting with its own header row.
+    """
+    columns = None
+    for row in csv.reader(f, delimiter=delimiter):
+        if not any(cell.strip() for cell in row):
+            columns = None
+            continue
+        header = _column_map(row)
+        if header:
+            columns = header
+            continue
+        if columns is None or len(row) <= max(columns.values()):
+            continue
+        raw = {name: row[i] for name, i in columns.items()}
+        try:
+            yield _entry(raw)
+        except ValueError:
+            # Summary and total rows carry no transaction date
+            continue
+
+
+def _iter_json(f, chunk_size=1 << 16):
+    """Streams the objects of a top-level JSON array, or of a JSON lines file."""
+    decoder = json.JSONDecoder()
+    buffer, pos = f.read(chunk_size).lstrip(), 0
+    in_array = buffer.startswith("[")
+    if in_array:
+        pos = 1
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if in_array and buffer.startswith("]", pos):
+            return
+        try:
+            obj, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            more = f.read(chunk_size)
+            if not more:
+                if buffer[pos:].strip():
+                    raise ValueError("Truncated JSON statement.")
+                return
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield obj
+
+
+def _json_entry(obj):
+    lowered = {str(key).strip().lower(): value for key, value in obj.items()}
+    raw = {}
+    for name, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                raw[name] = lowered[alias]
+                break
+    return _entry(raw)
+
+
+def iter_statement_entries(path):
+    """
+    Yields the transactions of a 26AS / AIS / 16A export one by one.
+
+    Yields:
+        dict: date, section, description, amount_inr and tds_inr.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if extension in (".json", ".jsonl"):
+            for obj in _iter_json(f):
+                yield _json_entry(obj)
+        else:
+            yield from _iter_delimited(f, "," if extension == ".csv" else "^")
+
+
+def read_fx_rates_csv(path):
+    """Reads daily or monthly EUR-per-INR rates from a CSV with date,rate columns."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["date"].strip(): float(row["rate"]) for row in csv.DictReader(f)}
+
+
+def fx_rate_for(day, rates=None):
+    """EUR per INR on `day`: the daily rate, else the monthly (YYYY-MM) rate, else the default."""
+    if rates:
+        iso = day.isoformat()
+        if iso in rates:
+            return rates[iso]
+        if iso[:7] in rates:
+            return rates[iso[:7]]
+    return constants.INR_TO_EUR_RATE
+
+
+def aggregate_statement(entries, tax_year=None, rates=None):
+    """
+    Sums income and TDS per category in one pass over the entries.
+
+    Args:
+        entries (iterable): Entries from iter_statement_entries, consumed lazily.
+        tax_year (int): Only count transactions dated in this calendar year.
+        rates (dict): EUR-per-INR rates by ISO date or month, see fx_rate_for.
+
+    Returns:
+        dict: category -> {"count", "income_inr", "income_eur", "tds_inr", "tds_eur"}
+    """
+    totals = {}
+    for entry in entries:
+        if tax_year is not None and entry["date"].year != tax_year:
+            continue
+        category = categorize(entry["section"], entry["description"])
+        rate = fx_rate_for(entry["date"], rates)
+        bucket = totals.setdefault(category, {"count": 0, "income_inr": 0.0, "income_eur": 0.0,
+                                              "tds_inr": 0.0, "tds_eur": 0.0})
+        bucket["count"] += 1
+        bucket["income_inr"] += entry["amount_inr"]
+        bucket["income_eur"] += entry["amount_inr"] * rate
+        bucket["tds_inr"] += entry["tds_inr"]
+        bucket["tds_eur"] += entry["tds_inr"] * rate
+    return totals
+
+
+def to_wizard_fields(totals):
+    """
+    Maps aggregated totals onto in_rent, in_interest and in_tds_inr.
+
+    The wizard fields are INR amounts that generate_full_report converts with the
+    single INR_TO_EUR_RATE, so the per-transaction EUR sums are expressed in INR at
+    that rate. Only TDS on income that is declared here is creditable. Fields
+    with a zero total are left out, so they do not overwrite wizard values.
+    """
+    fields = {}
+    tds_eur = 0.0
+    for category, field in CATEGORY_FIELDS.items():
+        if category in totals:
+            fields[field] = totals[category]["income_eur"] / constants.INR_TO_EUR_RATE
+            tds_eur += totals[category]["tds_eur"]
+    fields["in_tds_inr"] = tds_eur / constants.INR_TO_EUR_RATE
+    return {field: amount for field, amount in fields.items() if amount}
+
+
+def import_statements(paths, tax_year, rates=None):
+    """Streams several statements (e.g. one per financial year) into one set of wizard fields."""
+    def entries():
+        for path in paths:
+            yield from iter_statement_entries(path)
+    return to_wizard_fields(aggregate_statement(entries(), tax_year, rates))
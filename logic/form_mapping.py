@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+from . import constants
+
+# Declarative registry: which report value goes on which form and line.
+#
+# Each rule names the report key it reads, the form and line, a note for the
+# user, the condition under which the line is needed and an optional factor that
+# turns the report value back into the amount the form asks for (e.g. the form
+# wants the Kita costs, the report holds the deductible two thirds).
+
+CONDITIONS = {
+    "positive": lambda value: value > 0,
+    "above_pauschale": lambda value: value > constants.WERBUNGSKOSTEN_PAUSCHALE,
+}
+
+FORM_RULES = [
+    # Salary (Anlage N), one per person
+    {"key": "de_gross_a", "form": "Anlage N (Person A)", "line": "Line 3 (Bruttoarbeitslohn)",
+     "note": "Copy directly from Lohnsteuerbescheinigung.", "condition": "positive"},
+    {"key": "de_tax_paid_a", "form": "Anlage N (Person A)", "line": "Line 4 (Lohnsteuer)",
+     "note": "Copy directly from Lohnsteuerbescheinigung.", "condition": "positive"},
+    {"key": "wk_a", "form": "Anlage N (Person A)", "line": "Lines 31-87 (Werbungskosten)",
+     "note": "Home office, commute, internet and other work-related expenses.", "condition": "above_pauschale"},
+    {"key": "de_gross_b", "form": "Anlage N (Person B)", "line": "Line 3 (Bruttoarbeitslohn)",
+     "note": "Copy directly from Lohnsteuerbescheinigung.", "condition": "positive"},
+    {"key": "de_tax_paid_b", "form": "Anlage N (Person B)", "line": "Line 4 (Lohnsteuer)",
+     "note": "Copy directly from Lohnsteuerbescheinigung.", "condition": "positive"},
+    {"key": "wk_b", "form": "Anlage N (Person B)", "line": "Lines 31-87 (Werbungskosten)",
+     "note": "Home office, commute, internet and other work-related expenses.", "condition": "above_pauschale"},
+
+    # Social security (Anlage Vorsorgeaufwand)
+    {"key": "de_pension_a", "form": "Anlage Vorsorgeaufwand (Person A)", "line": "Pension insurance (Lohnsteuerbescheinigung 23a)",
+     "note": "Employee share of pension insurance.", "condition": "positive"},
+    {"key": "de_health_a", "form": "Anlage Vorsorgeaufwand (Person A)", "line": "Health insurance (Lohnsteuerbescheinigung 25)",
+     "note": "Employee share of statutory health insurance.", "condition": "positive"},
+    {"key": "de_nursing_a", "form": "Anlage Vorsorgeaufwand (Person A)", "line": "Nursing care insurance (Lohnsteuerbescheinigung 26)",
+     "note": "Employee share of nursing care insurance.", "condition": "positive"},
+    {"key": "de_unemployment_a", "form": "Anlage Vorsorgeaufwand (Person A)", "line": "Unemployment insurance (Lohnsteuerbescheinigung 27)",
+     "note": "Employee share of unemployment insurance.", "condition": "positive"},
+    {"key": "de_pension_b", "form": "Anlage Vorsorgeaufwand (Person B)", "line": "Pension insurance (Lohnsteuerbescheinigung 23a)",
+     "note": "Employee share of pension insurance.", "condition": "positive"},
+    {"key": "de_health_b", "form": "Anlage Vorsorgeaufwand (Person B)", "line": "Health insurance (Lohnsteuerbescheinigung 25)",
+     "note": "Employee share of statutory health insurance.", "condition": "positive"},
+    {"key": "de_nursing_b", "form": "Anlage Vorsorgeaufwand (Person B)", "line": "Nursing care insurance (Lohnsteuerbescheinigung 26)",
+     "note": "Employee share of nursing care insurance.", "condition": "positive"},
+    {"key": "de_unemployment_b", "form": "Anlage Vorsorgeaufwand (Person B)", "line": "Unemployment insurance (Lohnsteuerbescheinigung 27)",
+     "note": "Employee share of unemployment insurance.", "condition": "positive"},
+
+    # Indian income (Anlage KAP / V / AUS)
+    {"key": "in_interest_eur", "form": "Anlage KAP", "line": "Line 19 (Ausländische Kapitalerträge)",
+     "note": "Interest from NRE/NRO accounts (Taxable in DE).", "condition": "positive"},
+    {"key": "in_interest_eur", "form": "Anlage AUS", "line": "Table 1",
+     "note": "Declare here to claim credit for TDS paid in India.", "condition": "positive"},
+    {"key": "in_rent_eur", "form": "Anlage V / AUS", "line": "Foreign Income (Progressionsvorbehalt)",
+     "note": "This is NOT taxed directly, but raises your tax rate.", "condition": "positive"},
+    {"key": "in_salary_eur", "form": "Anlage N-AUS", "line": "Foreign Income (Progressionsvorbehalt)",
+     "note": "Salary from Indian employment. Not taxed in DE, but raises your tax rate.", "condition": "positive"},
+    {"key": "tds_credit", "form": "Anlage AUS", "line": "Anrechenbare ausländische Steuern",
+     "note": "TDS withheld in India, converted to EUR.", "condition": "positive"},
+
+    # Family and household
+    {"key": "parents_support_deduction", "form": "Anlage Unterhalt", "line": "Support for needy persons",
+     "note": "Requires 'Unterhaltserklärung' form signed by parents.", "condition": "positive"},
+    {"key": "kita_deduction", "form": "Anlage Kind", "line": "Kinderbetreuungskosten",
+     "note": "Enter the full costs; two thirds are deductible.", "condition": "positive",
+     "factor": 1 / constants.KITA_DEDUCTION_RATE},
+    {"key": "nebenkosten_credit", "form": "Hauptvordruck", "line": "Haushaltsnahe Dienstleistungen / Handwerkerleistungen (§35a)",
+     "note": "Labor share from the Nebenkostenabrechnung.", "condition": "positive",
+     "factor": 1 / constants.NEBENKOSTEN_LABOR_CREDIT_RATE},
+]
+
+
+def build_rule_index(rules=FORM_RULES):
+    """Indexes the registry by report key. Conditions are resolved once here."""
+    index = defaultdict(list)
+    for order, rule in enumerate(rules):
+        if rule["condition"] not in CONDITIONS:
+            raise ValueError(f"Unknown form rule condition '{rule['condition']}'.")
+        index[rule["key"]].append((order, rule, CONDITIONS[rule["condition"]], rule.get("factor", 1.0)))
+    return dict(index)
+
+
+RULE_INDEX = build_rule_index()
+
+
+def _instructions_for_key(key, value, index):
+    instructions = []
+    for order, rule, condition, factor in index.get(key, ()):
+        if isinstance(value, (int, float)) and condition(value):
+            amount = value * factor
+            instructions.append((order, {
+                "form": rule["form"],
+                "line": rule["line"],
+                "amount": amount,
+                "value": f"€ {amount:,.2f}",
+                "note": rule["note"],
+                "key": key,
+            }))
+    return instructions
+
+
+def get_form_mapping(report, index=RULE_INDEX):
+    """
+    Maps a report to line-by-line filing instructions, in registry order.
+    Only keys present in the index are looked at.
+    """
+    found = []
+    for key in index.keys() & report.keys():
+        found.extend(_instructions_for_key(key, report[key], index))
+    return [instruction for _, instruction in sorted(found, key=lambda item: item[0])]
+
+
+def update_form_mapping(instructions_by_key, report, changed_keys, index=RULE_INDEX):
+    """
+    Incrementally refreshes a {report key: [(order, instruction), ...]} mapping after
+    some report values changed; only the rules of `changed_keys` are evaluated.
+
+    Returns:
+        list: The full instruction list in registry order.
+    """
+    for key in changed_keys:
+        if key in index:
+            instructions_by_key[key] = _instructions_for_key(key, report.get(key, 0.0), index)
+    merged = [item for items in instructions_by_key.values() for item in items]
+    return [instruction for _, instruction in sorted(merged, key=lambda item: item[0])]
+
+
+def get_form_mappings(reports, index=RULE_INDEX):
+    """Bulk variant: yields the instruction list for each report of an iterable."""
+    for report in reports:
+        yield get_form_mapping(report, index)
@@ -0,0 +1,153 @@
+import numpy as np
+
+from . import constants
+from .household_store import HouseholdStore
+from .vectorized import (
+    generate_batch_report, estimate_social_security_array,
+    social_security_marginal_rate_array, marginal_tax_rate_array, tax_curvature_array,
+)
+
+# Gross-up solver: finds Person A's gross salary that produces a target household
+# net income (or a target refund), keeping every other input of the household fixed.
+# Person A's social security is re-estimated from the gross on every step.
+#
+# net(gross) = total_gross - total_vorsorge - net_german_tax_due
+#
+# The solver inverts the tariff zone by zone, for all targets at once. Between two
+# breakpoints (tariff zone edges, contribution caps, the Soli limit) the taxable
+# income is linear in the gross and the tariff is a quadratic, so the objective is
+# a quadratic whose value, slope and curvature follow from the analytic zone
+# derivatives. Each step jumps to the closed-form root of that quadratic; without
+# foreign income (no Progressionsvorbehalt) this is the exact solution as soon as
+# the current gross lies in the target's zone, and the next evaluation confirms
+# it. With foreign income the quadratic is a second-order approximation. Where it
+# has no real root the step falls back to Newton, and any step that leaves the
+# bracket falls back to bisection.
+
+TOLERANCE = 0.005  # half a cent
+MAX_ITERATIONS = 60
+
+
+def _evaluate(base_cols, gross, mode):
+    """
+    Returns (objective, d objective / d gross, d² objective / d gross²) for each
+    candidate gross.
+
+    `base_cols` holds identical rows of the household (HouseholdStore.repeat), at
+    least as many as candidates; only Person A's gross and contributions change.
+    """
+    n = len(gross)
+    cols = {name: values[:n] for name, values in base_cols.items()}
+    year = cols["tax_year"]
+    kids = cols["num_kids"]
+
+    ss = estimate_social_security_array(gross, year, kids)
+    cols["de_gross_a"] = gross
+    cols["de_pension_a"] = ss["pension"]
+    cols["de_health_a"] = ss["health"]
+    cols["de_nursing_a"] = ss["nursing"]
+    cols["de_unemployment_a"] = ss["unemployment"]
+    report = generate_batch_report(cols)
+
+    # Chain rule through steps 4-6 of generate_full_report
+    ss_rate = social_security_marginal_rate_array(gross, year, kids)
+    taxable = report["taxable_income_de"]
+    global_income = report["global_income_for_rate"]
+    d_taxable = np.where(taxable > 0, 1.0 - ss_rate, 0.0)
+
+    # final = taxable * T(global) / global with global = taxable + foreign
+    tax_on_global = report["effective_tax_rate"] * global_income
+    marginal = marginal_tax_rate_array(global_income, year, cols["is_married"])
+    curvature = tax_curvature_array(global_income, year, cols["is_married"])
+    safe_global = np.where(global_income > 0, global_income, 1.0)
+    excess = marginal * safe_global - tax_on_global
+    d_final = d_taxable * (tax_on_global / safe_global + taxable * excess / safe_global ** 2)
+    # Equals T'' when there is no foreign income
+    dd_final = d_taxable ** 2 * (
+        2 * excess * (global_income - taxable) / safe_global ** 3 + taxable * curvature / safe_global
+    )
+    soli_factor = np.where(report["soli"] > 0, 1.0 + constants.SOLI_RATE, 1.0)
+    owed = report["net_german_tax_due"] > 0
+    d_due = np.where(owed, d_final * soli_factor, 0.0)
+    dd_due = np.where(owed, dd_final * soli_factor, 0.0)
+
+    if mode == "net":
+        value = report["total_gross"] - report["total_vorsorge"] - report["net_german_tax_due"]
+        slope = 1.0 - ss_rate - d_due
+    else:
+        value = report["refund_or_payment"]
+        slope = -d_due
+    return value, slope, -dd_due
+
+
+def solve_gross(base, targets, mode="net", max_gross=2_000_000.0):
+    """
+    Solves for Person A's gross salary for many targets in one batch.
+
+    Args:
+        base (dict): Wizard-style household input; everything except Person A's
+                     gross and social security is taken from here.
+        targets (array-like): Target household net income ("net") or target
+                              refund ("refund"), in euros.
+        mode (str): "net" or "refund".
+        max_gross (float): Upper end of the search bracket.
+
+    Returns:
+        np.ndarray: Gross salary per target, NaN where the target is unreachable
+                    within [0, max_gross] or the iteration did not converge within
+                    MAX_ITERATIONS. A target inside a jump of the objective (the
+                    Soli limit) gets the gross at the jump.
+    """
+    if mode not in ("net", "refund"):
+        raise ValueError(f"Unknown gross-up mode '{mode}'.")
+    targets = np.atleast_1d(np.asarray(targets, dtype=np.float64))
+    n = len(targets)
+
+    # Built once: every row is the same household, the steps only slice it
+    base_cols = HouseholdStore.repeat(base, n).columns()
+    lo = np.zeros(n)
+    hi = np.full(n, max_gross)
+    f_lo = _evaluate(base_cols, lo, mode)[0] - targets
+    f_hi = _evaluate(base_cols, hi, mode)[0] - targets
+    # net rises with gross, the refund falls; orient so that f(lo) <= 0 <= f(hi)
+    increasing = mode == "net"
+    reachable = (f_lo <= 0) & (f_hi >= 0) if increasing else (f_lo >= 0) & (f_hi <= 0)
+
+    x = np.where(reachable, np.clip(targets if increasing else lo, lo, hi), np.nan)
+    active = reachable.copy()
+    for _ in range(MAX_ITERATIONS):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        value, slope, curvature = _evaluate(base_cols, x[idx], mode)
+        f = value - targets[idx]
+
+        converged = np.abs(f) < TOLERANCE
+        below = (f < 0) if increasing else (f > 0)
+        lo[idx] = np.where(below, x[idx], lo[idx])
+        hi[idx] = np.where(below, hi[idx], x[idx])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Root of f + slope * d + curvature / 2 * d² nearest to d = 0, in the
+            # cancellation-free form; it is the Newton step when curvature is 0
+            disc = slope ** 2 - 2 * curvature * f
+            root = -2 * f / (slope + np.copysign(np.sqrt(np.maximum(disc, 0.0)), slope))
+            step = x[idx] + np.where(disc >= 0, root, -f / slope)
+        inside = np.isfinite(step) & (step > lo[idx]) & (step < hi[idx])
+        step = np.where(inside, step, (lo[idx] + hi[idx]) / 2)
+
+        x[idx] = np.where(converged, x[idx], step)
+        active[idx] = ~converged & (hi[idx] - lo[idx] > 1e-6)
+    # Still iterating after MAX_ITERATIONS: not converged
+    x[active] = np.nan
+    return x
+
+
+def solve_gross_for_net(base, target_net):
+    """Gross salary for Person A yielding the target annual household net income."""
+    return solve_gross(base, target_net, mode="net")
+
+
+def solve_gross_for_refund(base, target_refund):
+    """Gross salary for Person A yielding the target refund (negative: additional payment)."""
+    return solve_gross(base, target_refund, mode="refund")
@@ -0,0 +1,167 @@
+import numpy as np
+
+from .vectorized import generate_batch_report
+from .validation_rules import evaluate_rules_batch
+
+# One typed column per wizard field (see ResultPage.initializePage) plus the tax year
+# and the optional moving costs and supported parents read by the residency engine.
+# Defaults match the `data.get(name, default)` fallbacks of generate_full_report.
+INPUT_FIELDS = {
+    "tax_year": (np.int16, 2024),
+    "is_married": (np.bool_, False),
+    "tax_class": (np.int8, 0),
+    "num_kids": (np.int8, 0),
+    "parents_support": (np.float64, 0.0),
+    "supported_persons": (np.int8, 1),
+    # Person A
+    "de_gross_a": (np.float64, 0.0), "de_tax_paid_a": (np.float64, 0.0),
+    "de_pension_a": (np.float64, 0.0), "de_health_a": (np.float64, 0.0),
+    "de_nursing_a": (np.float64, 0.0), "de_unemployment_a": (np.float64, 0.0),
+    "commute_km_a": (np.float64, 0.0), "office_days_a": (np.float64, 0.0),
+    "ho_days_a": (np.float64, 0.0), "internet_a": (np.float64, 0.0), "bank_fee_a": (np.bool_, False),
+    "moving_costs_a": (np.float64, 0.0),
+    # Person B
+    "de_gross_b": (np.float64, 0.0), "de_tax_paid_b": (np.float64, 0.0),
+    "de_pension_b": (np.float64, 0.0), "de_health_b": (np.float64, 0.0),
+    "de_nursing_b": (np.float64, 0.0), "de_unemployment_b": (np.float64, 0.0),
+    "commute_km_b": (np.float64, 0.0), "office_days_b": (np.float64, 0.0),
+    "ho_days_b": (np.float64, 0.0), "internet_b": (np.float64, 0.0), "bank_fee_b": (np.bool_, False),
+    "moving_costs_b": (np.float64, 0.0),
+    # Shared
+    "in_rent": (np.float64, 0.0), "in_interest": (np.float64, 0.0), "in_salary": (np.float64, 0.0),
+    "kita_costs": (np.float64, 0.0), "nk_labor": (np.float64, 0.0), "in_tds_inr": (np.float64, 0.0),
+}
+
+
+class HouseholdStore:
+    """
+    Column-oriented, in-memory store of household inputs.
+
+    Each field of INPUT_FIELDS is held in its own contiguous NumPy array. Slicing
+    (`store[a:b]`) returns a new store whose columns are views on the same memory,
+    filters return a HouseholdView that only keeps the selected row indices.
+    """
+
+    def __init__(self, columns=None, capacity=1024):
+        if columns is not None:
+            # Wrap existing columns without copying when they already have the right dtype.
+            lengths = {len(col) for col in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError("All columns must have the same length.")
+            self._size = lengths.pop() if lengths else 0
+            self._columns = {
+                name: np.asarray(columns[name], dtype=dtype) if name in columns
+                else np.full(self._size, default, dtype=dtype)
+                for name, (dtype, default) in INPUT_FIELDS.items()
+            }
+        else:
+            self._columns = {
+                name: np.empty(capacity, dtype=dtype) for name, (dtype, _) in INPUT_FIELDS.items()
+            }
+            self._size = 0
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a store from an iterable of wizard-style input dicts."""
+        store = cls()
+        for record in records:
+            store.append(record)
+        return store
+
+    @classmethod
+    def repeat(cls, record, n):
+        """Builds a store holding `n` copies of one household (e.g. for what-if grids)."""
+        columns = {}
+        for name, (dtype, default) in INPUT_FIELDS.items():
+            value = record.get(name, default)
+            columns[name] = np.full(n, default if value is None else value, dtype=dtype)
+        return cls(columns)
+
+    def append(self, record):
+        """Appends one household given as a wizard-style input dict."""
+        if self._size == len(self._columns["tax_year"]):
+            self._grow(max(1024, self._size * 2))
+        i = self._size
+        for name, (_, default) in INPUT_FIELDS.items():
+            value = record.get(name, default)
+            self._columns[name][i] = default if value is None else value
+        self._size += 1
+
+    def _grow(self, capacity):
+        for name, col in self._columns.items():
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[:self._size] = col[:self._size]
+            self._columns[name] = grown
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key][:self._size]
+        if isinstance(key, slice):
+            return HouseholdStore({name: col[:self._size][key] for name, col in self._columns.items()})
+        raise TypeError("Use a field name or a slice to index a HouseholdStore.")
+
+    def columns(self):
+        """Returns a {field: column view} mapping of the stored rows."""
+        return {name: col[:self._size] for name, col in self._columns.items()}
+
+    def record(self, index):
+        """Materializes a single row as an input dict (e.g. for generate_full_report)."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            # Rows past the size are unused (uninitialized) capacity
+            raise IndexError(f"Row {index} is out of range for a store of {self._size} households.")
+        return {name: self._columns[name][index].item() for name in INPUT_FIELDS}
+
+    def tax_class_numbers(self):
+        """Steuerklasse per household, derived the same way as in generate_full_report."""
+        return np.where(self["is_married"], self["tax_class"] + 3, 1)
+
+    def where(self, tax_year=None, is_married=None, tax_class=None):
+        """
+        Filters households by tax year, marital status and/or Steuerklasse (1, 3, 4, 5).
+
+        Returns:
+            HouseholdView: A lazy view on the matching rows.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        if tax_year is not None:
+            mask &= self["tax_year"] == int(tax_year)
+        if is_married is not None:
+            mask &= self["is_married"] == bool(is_married)
+        if tax_class is not None:
+            mask &= self.tax_class_numbers() == tax_class
+        return HouseholdView(self, np.flatnonzero(mask))
+
+    def calculate(self):
+        """Runs the batch calculation over all stored households."""
+        return generate_batch_report(self.columns())
+
+    def validate(self, report=None):
+        """Screens all stored households with the validation rules (see validation_rules)."""
+        columns = self.columns()
+        return evaluate_rules_batch(columns, generate_batch_report(columns) if report is None else report)
+
+
+class HouseholdView:
+    """A row selection on a HouseholdStore. Columns are gathered only when accessed."""
+
+    def __init__(self, store, indices):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, name):
+        return self.store[name][self.indices]
+
+    def columns(self):
+        return {name: self[name] for name in INPUT_FIELDS}
+
+    def calculate(self):
+        """Runs the batch calculation over the selected households only."""
+        return generate_batch_report(self.columns())
@@ -0,0 +1,246 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from . import report_generator
+from .report_generator import generate_full_report
+from .result_cache import rules_version
+
+# Durable recompute jobs, e.g. for every client after a rule change.
+#
+# Jobs and results live in one SQLite file. A run is identified by a run id
+# (by default the rules version, so a changed constant starts a new run). Worker
+# processes compute chunks of jobs; the coordinating process writes each
+# finished chunk (results plus job status) in one transaction. That transaction
+# is the checkpoint: after a crash, `run` resets the jobs that were claimed but
+# not written and continues with everything that is not done yet. Results are
+# keyed by (run id, client id), so running a job twice writes the same row again.
+#
+# Claims are atomic (BEGIN IMMEDIATE), so several processes can work on the same
+# run. Each claim records its owner (host name and process id). `run` takes back
+# the running jobs of owners on this host that are no longer alive, so a restart
+# right after a crash continues at once; jobs of live processes are left to them.
+# Owners on other hosts cannot be checked, their claims are a lease that `run`
+# only takes back once it has expired.
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+LEASE_SECONDS = 15 * 60  # Far above the compute time of one chunk
+
+
+def _owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _process_alive(pid):
+    """True if a process with this id is running on this host."""
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # Access denied: exists, owned by someone else
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_dead(owner):
+    host, _, pid = owner.rpartition(":")
+    return host == socket.gethostname() and pid.isdigit() and not _process_alive(int(pid))
+
+
+def _init_worker():
+    report_generator.DEBUG = False
+
+
+def _run_chunk(jobs):
+    """Worker: computes a chunk of (job id, input) pairs with per-job timing."""
+    finished = []
+    for job_id, data in jobs:
+        start = time.perf_counter()
+        try:
+            report, error = generate_full_report(data), None
+        except Exception as e:
+            report, error = None, f"{type(e).__name__}: {e}"
+        finished.append((job_id, report, error, time.perf_counter() - start))
+    return finished
+
+
+class JobQueue:
+    """SQLite-backed queue of recompute jobs and their results."""
+
+    def __init__(self, path="recompute_jobs.sqlite"):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, client_id TEXT NOT NULL,"
+            " input TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " duration REAL, finished REAL, error TEXT, claimed REAL, owner TEXT, UNIQUE(run_id, client_id));"
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(run_id, status);"
+            "CREATE TABLE IF NOT EXISTS results ("
+            " run_id TEXT NOT NULL, client_id TEXT NOT NULL, report TEXT NOT NULL,"
+            " PRIMARY KEY(run_id, client_id));"
+        )
+        # Queues created before leases and owners existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("claimed", "REAL"), ("owner", "TEXT")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.commit()
+
+    def enqueue(self, households, run_id=None):
+        """
+        Adds one job per client. Clients already queued for the run are left as they are.
+
+        Args:
+            households (dict): Client id -> wizard input dict.
+            run_id (str): Defaults to the current rules version.
+
+        Returns:
+            str: The run id.
+        """
+        run_id = run_id or rules_version()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, client_id, input, status) VALUES (?, ?, ?, ?)",
+                ((run_id, client_id, json.dumps(data), PENDING) for client_id, data in households.items()),
+            )
+        return run_id
+
+    def _claim(self, run_id, limit):
+        with self._conn:
+            # Take the write lock before reading, so no other process claims the same rows
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT id, input FROM jobs WHERE run_id = ? AND status = ? ORDER BY id LIMIT ?",
+                (run_id, PENDING, limit),
+            ).fetchall()
+            now, owner = time.time(), _owner()
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, claimed = ?, owner = ? WHERE id = ?",
+                ((RUNNING, now, owner, row[0]) for row in rows),
+            )
+        return [(job_id, json.loads(data)) for job_id, data in rows]
+
+    def _checkpoint(self, run_id, finished):
+        now = time.time()
+        with self._conn:
+            for job_id, report, error, duration in finished:
+                if error is None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO results (run_id, client_id, report)"
+                        " SELECT run_id, client_id, ? FROM jobs WHERE id = ?",
+                        (json.dumps(report), job_id),
+                    )
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, duration = ?, finished = ?, error = ? WHERE id = ?",
+                    (DONE if error is None else FAILED, duration, now, error, job_id),
+                )
+
+    def run(self, run_id, max_workers=None, chunk_size=100, progress=None, retry_failed=False,
+            lease_seconds=LEASE_SECONDS):
+        """
+        Processes every unfinished job of a run on a process pool.
+
+        Jobs left 'running' by a process on this host that has exited are picked
+        up again at once, those of other hosts once their lease has expired.
+        Failed jobs are only retried with `retry_failed`.
+
+        Args:
+            progress (callable): Called as progress(done, total) after every checkpoint.
+            lease_seconds (float): Age after which a running job of an owner that
+                                   cannot be checked counts as abandoned.
+
+        Returns:
+            dict: The run statistics (see stats).
+        """
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            owners = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT owner FROM jobs WHERE run_id = ? AND status = ? AND owner IS NOT NULL",
+                (run_id, RUNNING),
+            )]
+            dead = [owner for owner in owners if _owner_dead(owner)]
+            self._conn.execute(
+                "UPDATE jobs SET status = ? WHERE run_id = ? AND status = ? AND (claimed IS NULL OR claimed < ?"
+                f" OR owner IN ({', '.join('?' * len(dead))}))",
+                (PENDING, run_id, RUNNING, time.time() - lease_seconds, *dead),
+            )
+            if retry_failed:
+                self._conn.execute("UPDATE jobs SET status = ? WHERE run_id = ? AND status = ?", (PENDING, run_id, FAILED))
+
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            in_flight = set()
+            while True:
+                # Keep a couple of chunks per worker queued
+                while len(in_flight) < 2 * workers:
+                    chunk = self._claim(run_id, chunk_size)
+                    if not chunk:
+                        break
+                    in_flight.add(pool.submit(_run_chunk, chunk))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._checkpoint(run_id, future.result())
+                if progress is not None:
+                    stats = self.stats(run_id)
+                    progress(stats[DONE] + stats[FAILED], stats["total"])
+        return self.stats(run_id)
+
+    def stats(self, run_id):
+        """
+        Job counts per status plus timing of the finished jobs (seconds): total and
+        mean compute time, 95th percentile and the wall-clock span of the run so far.
+        """
+        counts = dict(self._conn.execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,)
+        ).fetchall())
+        durations = [row[0] for row in self._conn.execute(
+            "SELECT duration FROM jobs WHERE run_id = ? AND duration IS NOT NULL ORDER BY duration", (run_id,)
+        )]
+        first, last = self._conn.execute(
+            "SELECT MIN(finished), MAX(finished) FROM jobs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        result = {status: counts.get(status, 0) for status in (PENDING, RUNNING, DONE, FAILED)}
+        result["total"] = sum(counts.values())
+        result["compute_seconds"] = sum(durations)
+        result["mean_seconds"] = result["compute_seconds"] / len(durations) if durations else 0.0
+        result["p95_seconds"] = durations[min(len(durations) - 1, int(len(durations) * 0.95))] if durations else 0.0
+        result["span_seconds"] = (last - first) if first is not None else 0.0
+        return result
+
+    def result(self, run_id, client_id):
+        """The stored report of one client, or None if its job has not finished."""
+        row = self._conn.execute(
+            "SELECT report FROM results WHERE run_id = ? AND client_id = ?", (run_id, client_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def failures(self, run_id):
+        """{client id: error message} of the failed jobs."""
+        return dict(self._conn.execute(
+            "SELECT client_id, error FROM jobs WHERE run_id = ? AND status = ?", (run_id, FAILED)
+        ).fetchall())
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Offline import of the annual Lohnsteuerbescheinigung.
+#
+# PDF text is extracted locally with pypdf (optional dependency); already
+# extracted .txt files are read as they are. The numbered lines of the
+# certificate are mapped onto the GermanIncomePage fields.
+
+# Certificate line number -> field suffix (de_<suffix>_a / de_<suffix>_b)
+CERTIFICATE_LINES = {
+    "3": "gross",
+    "4": "tax_paid",
+    "23": "pension",       # 23. a) Arbeitnehmeranteil zur gesetzlichen Rentenversicherung
+    "25": "health",
+    "26": "nursing",
+    "27": "unemployment",
+}
+
+# "4.  Einbehaltene Lohnsteuer von 3.   8.123,45" - the amount is the last column
+_LINE_PATTERN = re.compile(r"^\s*(\d{1,2})\.\s.*?\s(-?\d{1,3}(?:\.\d{3})*,\d{2})\s*(?:EUR|€)?\s*$")
+
+# Parse cache of import_folder, kept next to the app's other data files (like
+# the result cache), not in the folder being imported
+CACHE_FILE = "lohnsteuer_import_cache.json"
+# Part of every cache key: bump whenever parsing changes (CERTIFICATE_LINES,
+# _LINE_PATTERN, parse_lohnsteuerbescheinigung) so stale entries are not reused
+PARSER_VERSION = 1
+
+
+def parse_german_amount(text):
+    """Converts a German formatted amount ("52.345,67") to a float."""
+    return float(text.replace(".", "").replace(",", "."))
+
+
+def extract_text(path):
+    """Returns the text of a certificate file (.pdf via pypdf, anything else as text)."""
+    if not path.lower().endswith(".pdf"):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("Reading PDF files requires the 'pypdf' package.")
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+def parse_lohnsteuerbescheinigung(text):
+    """
+    Extracts the gross salary, Lohnsteuer and employee social security shares.
+
+    Returns:
+        dict: Field suffix (gross, tax_paid, pension, ...) -> amount in EUR.
+              Lines that are not found are left out.
+    """
+    values = {}
+    for line in text.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if not match or match.group(1) not in CERTIFICATE_LINES:
+            continue
+        # Only line 23 a) (statutory pension) is wanted, not 23 b) (professional schemes)
+        if match.group(1) == "23" and "a)" not in line:
+            continue
+        values.setdefault(CERTIFICATE_LINES[match.group(1)], parse_german_amount(match.group(2)))
+    return values
+
+
+def to_wizard_fields(values, person="a"):
+    """Maps parsed certificate values onto the wizard field names of Person A or B."""
+    return {f"de_{suffix}_{person}": amount for suffix, amount in values.items()}
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parse_file(path):
+    """Worker: extracts and parses one certificate."""
+    return parse_lohnsteuerbescheinigung(extract_text(path))
+
+
+def import_folder(folder, max_workers=None, cache_path=None):
+    """
+    Parses every certificate (.pdf or .txt) in a folder on a process pool.
+
+    Results are cached by parser version and file content hash, so unchanged
+    files are not parsed again on the next import.
+
+    Args:
+        folder (str): Folder holding the certificates.
+        max_workers (int): Size of the process pool.
+        cache_path (str): Parse cache file, CACHE_FILE by default.
+
+    Returns:
+        dict: File name -> parsed values (see parse_lohnsteuerbescheinigung).
+    """
+    cache_path = cache_path or CACHE_FILE
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+
+    names = sorted(n for n in os.listdir(folder) if n.lower().endswith((".pdf", ".txt")))
+    hashes = {name: f"{PARSER_VERSION}:{file_hash(os.path.join(folder, name))}" for name in names}
+    pending = [name for name in names if hashes[name] not in cache]
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            paths = [os.path.join(folder, name) for name in pending]
+            for name, values in zip(pending, pool.map(_parse_file, paths)):
+                cache[hashes[name]] = values
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+
+    return {name: cache[hashes[name]] for name in names}
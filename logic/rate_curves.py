@@ -0,0 +1,108 @@
+import numpy as np
+
+from . import constants
+from .constants import TAX_YEAR_CONSTANTS
+from .vectorized import marginal_tax_rate_array
+
+# Tax, average-rate and marginal-rate curves over an income grid.
+#
+# Each tariff zone of calculate_german_tax is a quadratic in the shifted income
+# u = zvE - shift:  tax = (p * u + q) * u + r. The coefficients are built from
+# the tariff table in constants once per call (from the live constants, so a
+# changed constant applies at once) and a grid is evaluated with one
+# searchsorted + gather, instead of branching per point. The
+# marginal rate comes from vectorized.marginal_tax_rate_array.
+
+
+def zone_table(year, is_married=False):
+    """
+    Returns (upper_bounds, shift, p, q, r) arrays describing the tariff zones of
+    calculate_german_tax (TAX_YEAR_CONSTANTS[year]['TARIFF']) for the *per-person*
+    income (halved under splitting).
+    """
+    if year not in TAX_YEAR_CONSTANTS:
+        raise ValueError(f"Tax constants for year {year} are not available.")
+    allowance = TAX_YEAR_CONSTANTS[year]['BASIC_ALLOWANCE']
+    t = TAX_YEAR_CONSTANTS[year]['TARIFF']
+    if is_married:
+        allowance = allowance / 2
+
+    upper_bounds = np.array([allowance, t['ZONE_1_END'], t['ZONE_2_END'], t['ZONE_3_END']], dtype=np.float64)
+    #                  zone 0   zone 1                zone 2                zone 3                zone 4
+    shift = np.array([0.0,     allowance,            t['ZONE_1_END'],      0.0,                  0.0])
+    p = np.array([0.0,         t['ZONE_1_A'] * 1e-8, t['ZONE_2_A'] * 1e-8, 0.0,                  0.0])
+    q = np.array([0.0,         t['ZONE_1_B'] * 1e-4, t['ZONE_2_B'] * 1e-4, t['ZONE_3_RATE'],     t['ZONE_4_RATE']])
+    r = np.array([0.0,         0.0,                  t['ZONE_2_C'],        -t['ZONE_3_OFFSET'],  -t['ZONE_4_OFFSET']])
+    return upper_bounds, shift, p, q, r
+
+
+def tariff_curve(zvE, year, is_married=False):
+    """
+    Income tax, average rate and marginal rate of calculate_german_tax over a grid.
+
+    Args:
+        zvE (array-like): Taxable incomes to evaluate.
+        year (int): The tax year.
+        is_married (bool): Apply the splitting method.
+
+    Returns:
+        dict: "zvE", "tax", "average_rate" and "marginal_rate" arrays.
+    """
+    zvE = np.asarray(zvE, dtype=np.float64)
+    upper_bounds, shift, p, q, r = zone_table(year, bool(is_married))
+
+    income = zvE / 2 if is_married else zvE
+    zone = np.searchsorted(upper_bounds, income, side="left")
+    u = income - shift[zone]
+    tax = (p[zone] * u + q[zone]) * u + r[zone]
+    marginal = marginal_tax_rate_array(zvE, year, is_married)
+    if is_married:
+        tax = tax * 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = np.where(zvE > 0, tax / zvE, 0.0)
+    return {"zvE": zvE, "tax": tax, "average_rate": average, "marginal_rate": marginal}
+
+
+def household_rate_curve(data, incomes):
+    """
+    Tax curve of one household over a grid of German taxable incomes, including
+    the Progressionsvorbehalt effect of its Indian income.
+
+    The tax on German income x is x * T(x + f) / (x + f), with f the foreign income
+    of `data` converted to EUR (see generate_full_report). Its derivative is
+    T(G) / G + x * (T'(G) * G - T(G)) / G**2 with G = x + f.
+
+    Returns:
+        dict: "taxable_income", "tax", "average_rate", "marginal_rate" and the
+              same rates without foreign income ("average_rate_domestic",
+              "marginal_rate_domestic") for comparison.
+    """
+    x = np.asarray(incomes, dtype=np.float64)
+    year = int(data.get("tax_year", "2024"))
+    is_married = bool(data.get("is_married", False))
+    foreign_income = (
+        data.get("in_rent", 0.0) + data.get("in_interest", 0.0) + data.get("in_salary", 0.0)
+    ) * constants.INR_TO_EUR_RATE
+
+    domestic = tariff_curve(x, year, is_married)
+    global_income = x + foreign_income
+    world = tariff_curve(global_income, year, is_married)
+
+    safe_global = np.where(global_income > 0, global_income, 1.0)
+    tax = np.where(global_income > 0, x * world["tax"] / safe_global, 0.0)
+    marginal = np.where(
+        global_income > 0,
+        world["tax"] / safe_global + x * (world["marginal_rate"] * safe_global - world["tax"]) / safe_global ** 2,
+        0.0,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = np.where(x > 0, tax / x, 0.0)
+    return {
+        "taxable_income": x,
+        "tax": tax,
+        "average_rate": average,
+        "marginal_rate": marginal,
+        "average_rate_domestic": domestic["average_rate"],
+        "marginal_rate_domestic": domestic["marginal_rate"],
+    }
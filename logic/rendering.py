@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import os
+import string
+import zipfile
+
+# Report templates use str.format syntax with the report keys as field names, plus
+# the derived fields added by _template_context. They are parsed once on first use
+# (see get_template) and rendered from the cached parts afterwards.
+
+TEXT_TEMPLATE = """\
+INDO-GERMAN TAX REPORT (DUAL INCOME)
+=======================================
+
+DISCLAIMER: This is a non-binding estimate. Consult a tax advisor.
+
+--- INCOME SUMMARY ---
+Person A - Gross: {de_gross_a:>15,.2f}€
+Person B - Gross: {de_gross_b:>15,.2f}€
+JOINT GROSS:      {total_gross:>15,.2f}€
+
+--- DEDUCTIONS & TAXABLE INCOME ---
+(-) Total Social Security: {total_vorsorge:>9,.2f}€
+(-) Total Work Expenses (WK): {total_wk:>6,.2f}€
+(-) Other Deductions:      {other_deductions:>9,.2f}€
+---------------------------------------
+(=) TAXABLE GERMAN INCOME (zvE): {taxable_income_de:>1,.2f}€
+
+--- TAX CALCULATION ---
+(+) Foreign Income (for rate):   {foreign_income:>5,.2f}€
+(→) Effective Tax Rate:            {effective_tax_rate_pct:>7.2f}%
+---------------------------------------
+(=) Calculated German Tax:       {final_tax_liability:>5,.2f}€
+(+) Solidarity Surcharge (Soli): {soli:>5,.2f}€
+(-) Credits (§35a, TDS):         -{total_credits:>5,.2f}€
+---------------------------------------
+(=) NET GERMAN TAX DUE:          {net_german_tax_due:>5,.2f}€
+
+--- FINAL RESULT ---
+Tax Already Paid (Lohnsteuer):   {total_tax_paid:>5,.2f}€
+--- {refund_or_payment_label}: {refund_or_payment_abs:>9,.2f}€ ---
+"""
+
+HTML_TEMPLATE = """\
+{warnings_html}<h2>Tax Filing Roadmap</h2>
+<table border="1" style="width:100%; border-collapse: collapse; font-size: 10pt;">
+    <tr style="background-color:#e6e6fa;">
+        <th style="padding: 6px; text-align: left;">Item</th>
+        <th style="padding: 6px; text-align: right;">Person A (You)</th>
+        <th style="padding: 6px; text-align: right;">Person B (Spouse)</th>
+        <th style="padding: 6px; text-align: right;">JOINT TOTAL</th>
+    </tr>
+    <tr>
+        <td style="padding: 6px;"><b>Annual Gross Income</b></td>
+        <td style="padding: 6px; text-align: right;">{de_gross_a:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;">{de_gross_b:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;"><b>{total_gross:,.2f}€</b></td>
+    </tr>
+    <tr style="background-color:#f2f2f2;">
+        <td style="padding: 6px;" colspan="4"><b>(-) Mandatory Social Security (Vorsorgeaufwendungen)</b></td>
+    </tr>
+    <tr>
+        <td style="padding: 6px;">Pension Insurance</td>
+        <td style="padding: 6px; text-align: right;">-{de_pension_a:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;">-{de_pension_b:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;"></td>
+    </tr>
+    <tr>
+        <td style="padding: 6px;">Health Insurance</td>
+        <td style="padding: 6px; text-align: right;">-{de_health_a:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;">-{de_health_b:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;"></td>
+    </tr>
+     <tr>
+        <td style="padding: 6px;">Nursing Care Insurance</td>
+        <td style="padding: 6px; text-align: right;">-{de_nursing_a:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;">-{de_nursing_b:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;"></td>
+    </tr>
+     <tr>
+        <td style="padding: 6px;">Unemployment Insurance</td>
+        <td style="padding: 6px; text-align: right;">-{de_unemployment_a:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;">-{de_unemployment_b:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;"></td>
+    </tr>
+    <tr style="font-weight:bold;">
+        <td style="padding: 6px;">Total Social Security</td>
+        <td style="padding: 6px; text-align: right;"></td>
+        <td style="padding: 6px; text-align: right;"></td>
+        <td style="padding: 6px; text-align: right;">-{total_vorsorge:,.2f}€</td>
+    </tr>
+    <tr style="background-color:#f2f2f2;">
+        <td style="padding: 6px;" colspan="4"><b>(-) Work Expenses & Deductions (Werbungskosten / Pauschalen)</b></td>
+    </tr>
+    <tr>
+        <td style="padding: 6px;">Income-Related Expenses (Werbungskosten)</td>
+        <td style="padding: 6px; text-align: right;">-{wk_a:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;">-{wk_b:,.2f}€</td>
+        <td style="padding: 6px; text-align: right;"></td>
+    </tr>
+     <tr>
+        <td style="padding: 6px;">Other Deductions (Parents, Kita etc.)</td>
+        <td style="padding: 6px; text-align: right;"></td>
+        <td style="padding: 6px; text-align: right;"></td>
+        <td style="padding: 6px; text-align: right;">-{other_deductions:,.2f}€</td>
+    </tr>
+    <tr style="background-color:#e6e6fa; font-weight:bold;">
+        <td style="padding: 6px;">= Taxable Income (Germany)</td>
+        <td style="padding: 6px; text-align: right;"></td>
+        <td style="padding: 6px; text-align: right;"></td>
+        <td style="padding: 6px; text-align: right;">{taxable_income_de:,.2f}€</td>
+    </tr>
+</table>
+<br>
+<h3>Tax Calculation Summary</h3>
+<p><b>(+) Foreign Income (for rate calculation):</b> {foreign_income:,.2f}€</p>
+<p><b>(=) Global Income for Rate:</b> {global_income_for_rate:,.2f}€</p>
+<p><b>(→) Effective Tax Rate (Progressionsvorbehalt):</b> {effective_tax_rate_pct:.2f}%</p>
+<hr>
+<p><b>Calculated German Tax on Taxable Income:</b> {final_tax_liability:,.2f}€</p>
+<p><b>(+) Solidarity Surcharge (Soli):</b> {soli:,.2f}€</p>
+<p style='color:blue;'><b>(-) Credit for Ancillary Labor Costs (§35a):</b> -{nebenkosten_credit:,.2f}€</p>
+<p style='color:blue;'><b>(-) Credit for Tax Paid in India (TDS):</b> -{tds_credit:,.2f}€</p>
+<h3>Net German Tax Due: {net_german_tax_due:,.2f}€</h3>
+<hr>
+<p><b>Tax Already Paid in Germany (Lohnsteuer):</b> {total_tax_paid:,.2f}€</p>
+{refund_or_payment_html}
+"""
+
+WARNINGS_HTML = """
+<div style="background-color: #fff3cd; border: 1px solid #ffeeba; color: #856404; padding: 15px; margin-bottom: 20px; border-radius: 5px;">
+    <h3 style="margin-top: 0;">Please Note:</h3>
+    <ul>{items}</ul>
+</div>
+"""
+
+TEMPLATES = {
+    "text": TEXT_TEMPLATE,
+    "html": HTML_TEMPLATE,
+}
+
+FILE_EXTENSIONS = {"text": "txt", "html": "html", "csv": "csv", "json": "json"}
+
+_compiled = {}
+
+
+class CompiledTemplate:
+    """A str.format template parsed once into literal text and (field, format spec) pairs."""
+
+    def __init__(self, source):
+        self.parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if field is not None and (conversion or not field.isidentifier()):
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            self.parts.append((literal, field, spec or ""))
+
+    def render(self, context):
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(context[field], spec))
+        return "".join(out)
+
+
+def get_template(name):
+    """Returns the compiled template `name`, compiling it on first use."""
+    template = _compiled.get(name)
+    if template is None:
+        template = _compiled[name] = CompiledTemplate(TEMPLATES[name])
+    return template
+
+
+def _template_context(report):
+    """Adds the derived display values the templates need to a copy of the report."""
+    refund = report["refund_or_payment"]
+    context = dict(report)
+    context.setdefault("soli", 0.0)
+    context["effective_tax_rate_pct"] = report["effective_tax_rate"] * 100
+    context["refund_or_payment_abs"] = abs(refund)
+    context["refund_or_payment_label"] = "ESTIMATED REFUND" if refund > 0 else "ESTIMATED ADDITIONAL PAYMENT"
+    if refund > 0:
+        context["refund_or_payment_html"] = f"<h2 style='color:green;'>ESTIMATED REFUND: {refund:,.2f}\u20ac</h2>"
+    else:
+        context["refund_or_payment_html"] = f"<h2 style='color:red;'>ESTIMATED ADDITIONAL PAYMENT: {abs(refund):,.2f}\u20ac</h2>"
+    warnings = report.get("warnings") or []
+    context["warnings_html"] = (
+        WARNINGS_HTML.format(items="".join(f"<li>{w}</li>" for w in warnings)) if warnings else ""
+    )
+    return context
+
+
+def _scalar_items(report):
+    """Report entries that fit in a single CSV cell (everything except the warnings list)."""
+    return [(key, value) for key, value in report.items() if not isinstance(value, (list, dict))]
+
+
+def render_report(report, fmt="text"):
+    """
+    Renders a report dict from generate_full_report.
+
+    Args:
+        report (dict): The computed report.
+        fmt (str): One of "text", "html", "csv" or "json".
+
+    Returns:
+        str: The rendered report.
+    """
+    if fmt in TEMPLATES:
+        return get_template(fmt).render(_template_context(report))
+    if fmt == "json":
+        return json.dumps(report, indent=2, ensure_ascii=False)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        items = _scalar_items(report)
+        writer.writerow([key for key, _ in items] + ["warnings"])
+        writer.writerow([value for _, value in items] + ["; ".join(report.get("warnings") or [])])
+        return buffer.getvalue()
+    raise ValueError(f"Unknown report format '{fmt}'.")
+
+
+def render_bulk(reports, destination, fmt="text"):
+    """
+    Streams many reports to disk, one file per report.
+
+    Args:
+        reports (iterable): (name, report) pairs; consumed lazily.
+        destination (str): A directory, or a path ending in ".zip" to write an archive.
+        fmt (str): Output format, see render_report.
+
+    Returns:
+        int: Number of reports written.
+    """
+    extension = FILE_EXTENSIONS[fmt]
+    count = 0
+    if destination.endswith(".zip"):
+        with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, report in reports:
+                archive.writestr(f"{name}.{extension}", render_report(report, fmt))
+                count += 1
+        return count
+
+    os.makedirs(destination, exist_ok=True)
+    for name, report in reports:
+        with open(os.path.join(destination, f"{name}.{extension}"), "w", encoding="utf-8", newline="") as f:
+            f.write(render_report(report, fmt))
+        count += 1
+    return count
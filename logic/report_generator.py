@@ -1,6 +1,7 @@
 # logic/report_generator.py
 from . import constants
 from .tax_calculator import calculate_german_tax, calculate_soli
+from .validation_rules import evaluate_rules
 
 DEBUG = True
 
@@ -10,8 +11,12 @@ def d_print(message):
         print(message)
 
 # Helper function for werbungskosten calculation for a single person
-def _calculate_single_werbungskosten(ho_days, commute_km, office_days):
+def _calculate_single_werbungskosten(ho_days, commute_km, office_days, moving_costs=0.0, trace=None, person="a"):
     ho = min(ho_days * constants.HOME_OFFICE_DAY_RATE, constants.MAX_HOME_OFFICE_DEDUCTION)
+    if trace is not None:
+        trace.record(f"ho_{person}", ho, "min(ho_days * HOME_OFFICE_DAY_RATE, MAX_HOME_OFFICE_DEDUCTION)",
+                     ho_days=ho_days, HOME_OFFICE_DAY_RATE=constants.HOME_OFFICE_DAY_RATE,
+                     MAX_HOME_OFFICE_DEDUCTION=constants.MAX_HOME_OFFICE_DEDUCTION)
     
     commute = 0.0
     if commute_km > 0 and office_days > 0: # Only calculate if there's actual commute
@@ -21,19 +26,36 @@ def _calculate_single_werbungskosten(ho_days, commute_km, office_days):
             low_km_deduction = constants.COMMUTE_ALLOWANCE_THRESHOLD_KM * constants.COMMUTE_ALLOWANCE_LOW_KM * office_days
             high_km_deduction = (commute_km - constants.COMMUTE_ALLOWANCE_THRESHOLD_KM) * constants.COMMUTE_ALLOWANCE_HIGH_KM * office_days
             commute = low_km_deduction + high_km_deduction
+    if trace is not None:
+        if commute_km <= 0 or office_days <= 0:
+            trace.record(f"commute_{person}", commute, "0 (no commute entered)")
+        elif commute_km <= constants.COMMUTE_ALLOWANCE_THRESHOLD_KM:
+            trace.record(f"commute_{person}", commute, "commute_km * COMMUTE_ALLOWANCE_LOW_KM * office_days",
+                         commute_km=commute_km, office_days=office_days,
+                         COMMUTE_ALLOWANCE_LOW_KM=constants.COMMUTE_ALLOWANCE_LOW_KM)
+        else:
+            trace.record(f"commute_{person}", commute,
+                         "(THRESHOLD_KM * LOW_KM + (commute_km - THRESHOLD_KM) * HIGH_KM) * office_days",
+                         commute_km=commute_km, office_days=office_days,
+                         COMMUTE_ALLOWANCE_THRESHOLD_KM=constants.COMMUTE_ALLOWANCE_THRESHOLD_KM,
+                         COMMUTE_ALLOWANCE_LOW_KM=constants.COMMUTE_ALLOWANCE_LOW_KM,
+                         COMMUTE_ALLOWANCE_HIGH_KM=constants.COMMUTE_ALLOWANCE_HIGH_KM)
     
-    wk = max(constants.WERBUNGSKOSTEN_PAUSCHALE, ho + commute)
+    wk = max(constants.WERBUNGSKOSTEN_PAUSCHALE, ho + commute + moving_costs)
+    if trace is not None:
+        trace.record(f"wk_{person}_raw", wk, "max(WERBUNGSKOSTEN_PAUSCHALE, ho + commute + moving_costs)",
+                     moving_costs=moving_costs, WERBUNGSKOSTEN_PAUSCHALE=constants.WERBUNGSKOSTEN_PAUSCHALE)
     return ho, commute, wk
 
-def _calculate_deductions(data, is_married, de_gross_a, de_gross_b):
+def _calculate_deductions(data, is_married, de_gross_a, de_gross_b, trace=None):
     """Calculates all tax-deductible expenses for one or two persons."""
     
     results = {f: 0.0 for f in [
-        "ho_a", "commute_a", "wk_a", "pauschale_a_applied",
-        "ho_b", "commute_b", "wk_b", "pauschale_b_applied", "total_wk",
+        "ho_a", "commute_a", "moving_a", "wk_a", "pauschale_a_applied",
+        "ho_b", "commute_b", "moving_b", "wk_b", "pauschale_b_applied", "total_wk",
         "vorsorge_a", "vorsorge_b", "total_vorsorge",
         "bank_fee_a", "bank_fee_b", "internet_a", "internet_b", "total_flat_rates",
-        "other_deductions", "total_deductions"
+        "kita_deduction", "parents_support_deduction", "other_deductions", "total_deductions"
     ]}
     results["pauschale_a_applied"] = False
     results["pauschale_b_applied"] = False
@@ -54,14 +76,19 @@ def _calculate_deductions(data, is_married, de_gross_a, de_gross_b):
     results["vorsorge_b"] = pension_b + health_b + nursing_b + unemployment_b
     
     results["total_vorsorge"] = results["vorsorge_a"] + results["vorsorge_b"]
+    if trace is not None:
+        trace.record("vorsorge_a", results["vorsorge_a"], "pension + health + nursing + unemployment (Person A)")
+        trace.record("vorsorge_b", results["vorsorge_b"], "pension + health + nursing + unemployment (Person B)")
 
     # 2. Income-Related Expenses (Werbungskosten)
     # Person A
     if de_gross_a > 0:
         ho_a, commute_a, wk_a_raw = _calculate_single_werbungskosten(
-            data.get("ho_days_a", 0.0), data.get("commute_km_a", 0.0), data.get("office_days_a", 0.0)
+            data.get("ho_days_a", 0.0), data.get("commute_km_a", 0.0), data.get("office_days_a", 0.0),
+            data.get("moving_costs_a", 0.0), trace, "a"
         )
         results["ho_a"], results["commute_a"] = ho_a, commute_a
+        results["moving_a"] = data.get("moving_costs_a", 0.0)
         if wk_a_raw < constants.WERBUNGSKOSTEN_PAUSCHALE:
             results["wk_a"] = constants.WERBUNGSKOSTEN_PAUSCHALE
             results["pauschale_a_applied"] = True
@@ -71,9 +98,11 @@ def _calculate_deductions(data, is_married, de_gross_a, de_gross_b):
     # Person B (only if married and has income)
     if is_married and de_gross_b > 0:
         ho_b, commute_b, wk_b_raw = _calculate_single_werbungskosten(
-            data.get("ho_days_b", 0.0), data.get("commute_km_b", 0.0), data.get("office_days_b", 0.0)
+            data.get("ho_days_b", 0.0), data.get("commute_km_b", 0.0), data.get("office_days_b", 0.0),
+            data.get("moving_costs_b", 0.0), trace, "b"
         )
         results["ho_b"], results["commute_b"] = ho_b, commute_b
+        results["moving_b"] = data.get("moving_costs_b", 0.0)
         if wk_b_raw < constants.WERBUNGSKOSTEN_PAUSCHALE:
             results["wk_b"] = constants.WERBUNGSKOSTEN_PAUSCHALE
             results["pauschale_b_applied"] = True
@@ -99,14 +128,32 @@ def _calculate_deductions(data, is_married, de_gross_a, de_gross_b):
         results["wk_b"] += results["bank_fee_b"] + results["internet_b"]
     
     results["total_wk"] = results["wk_a"] + results["wk_b"]
+    if trace is not None:
+        for person, employed in (("a", de_gross_a > 0), ("b", is_married and de_gross_b > 0)):
+            if not employed:
+                continue
+            if results[f"pauschale_{person}_applied"]:
+                trace.record(f"wk_{person}", results[f"wk_{person}"], "WERBUNGSKOSTEN_PAUSCHALE (flat rates not added)",
+                             WERBUNGSKOSTEN_PAUSCHALE=constants.WERBUNGSKOSTEN_PAUSCHALE)
+            else:
+                trace.record(f"wk_{person}", results[f"wk_{person}"], "wk_raw + bank_fee + internet",
+                             bank_fee=results[f"bank_fee_{person}"], internet=results[f"internet_{person}"])
 
     # 4. Other Deductions (Sonderausgaben, außergewöhnliche Belastungen)
     kita_deduction = (data.get("kita_costs", 0.0)) * constants.KITA_DEDUCTION_RATE
     parents_support_deduction = data.get("parents_support", 0.0)
+    results["kita_deduction"] = kita_deduction
+    results["parents_support_deduction"] = parents_support_deduction
     results["other_deductions"] = kita_deduction + parents_support_deduction
+    if trace is not None:
+        trace.record("kita_deduction", kita_deduction, "kita_costs * KITA_DEDUCTION_RATE",
+                     kita_costs=data.get("kita_costs", 0.0), KITA_DEDUCTION_RATE=constants.KITA_DEDUCTION_RATE)
+        trace.record("parents_support_deduction", parents_support_deduction, "parents_support")
     
     # 5. Grand Total of all deductions to be subtracted from gross
     results["total_deductions"] = results["total_vorsorge"] + results["total_wk"] + results["other_deductions"]
+    if trace is not None:
+        trace.record("total_deductions", results["total_deductions"], "total_vorsorge + total_wk + other_deductions")
     
     return results
 
@@ -122,32 +169,19 @@ def _calculate_credits(data):
 
 def run_validation_checks(data, report_context):
     """
-    Runs a series of validation checks on the input and calculated data
-    to provide helpful warnings to the user.
+    Runs the plausibility checks of validation_rules.VALIDATION_RULES on the input
+    and calculated data to provide helpful warnings to the user.
     """
-    warnings = []
-
-    # 1. Social Security Check
-    if report_context.get("total_vorsorge", 0.0) == 0 and report_context.get("total_gross", 0.0) > 20000:
-        warnings.append("Social security contributions seem missing. This will cause an overestimation of tax.")
-
-    # 2. Tax Class Check
-    if data.get("is_married") and report_context.get("tax_class") == 1:
-        warnings.append("You are filing as married but using Tax Class 1. Tax Class 4 (Splitting) is usually more beneficial.")
-
-    # 3. Child Benefit Check (Kinderfreibetrag vs. Kindergeld)
-    # This is just a note, as the tax office automatically chooses the best option.
-    # We add this note if the tax liability is significant, suggesting the allowance was likely beneficial.
-    # Annual Kindergeld for one child is ~3000 EUR. If tax is higher, allowance was probably better.
-    if data.get("num_kids", 0) > 0 and report_context.get("final_tax_liability", 0) > 3000:
-        warnings.append("The tool has applied the Child Allowance (Kinderfreibetrag) as it was more beneficial than Kindergeld.")
-        
-    return warnings
+    return evaluate_rules(data, report_context)
 
-def generate_full_report(data):
+def generate_full_report(data, trace=None, deductions=None, credits=None):
     """
     Orchestrates the full tax calculation process for a dual-income household 
     and returns a structured report.
+
+    Pass a trace.CalculationTrace as `trace` to record every intermediate step.
+    Deductions and credits do not depend on the tax year; callers that compute
+    several years for the same inputs (see timeline) can pass them in precomputed.
     """
     d_print("\n--- REPORT GENERATOR: RAW INPUT DATA ---")
     for key, value in data.items():
@@ -180,11 +214,14 @@ def generate_full_report(data):
     # 2. Foreign Income (converted to EUR)
     in_rent_eur = data.get("in_rent", 0.0) * constants.INR_TO_EUR_RATE
     in_interest_eur = data.get("in_interest", 0.0) * constants.INR_TO_EUR_RATE
-    foreign_income = in_rent_eur + in_interest_eur
+    in_salary_eur = data.get("in_salary", 0.0) * constants.INR_TO_EUR_RATE
+    foreign_income = in_rent_eur + in_interest_eur + in_salary_eur
     
     # 3. Deductions and Credits
-    deductions = _calculate_deductions(data, is_married, de_gross_a, de_gross_b)
-    credits = _calculate_credits(data)
+    if deductions is None:
+        deductions = _calculate_deductions(data, is_married, de_gross_a, de_gross_b, trace)
+    if credits is None:
+        credits = _calculate_credits(data)
 
     # 4. Taxable Income (zu versteuerndes Einkommen - zvE)
     # This is the final income figure upon which tax is calculated.
@@ -194,23 +231,38 @@ def generate_full_report(data):
     # However, for calculation purposes, it can be lower, even zero.
     # The tax formula itself handles the basic allowance.
     taxable_income_de = max(0, taxable_income_de)
+    if trace is not None:
+        trace.record("taxable_income_de", taxable_income_de, "max(0, total_gross - total_deductions)",
+                     total_gross=total_gross)
 
     # 5. Progression Clause (Progressionsvorbehalt)
     # Foreign income is added to determine the tax *rate*, but is not taxed itself.
     global_income_for_rate = taxable_income_de + foreign_income
     
     # Tax is calculated on the German income, but at the rate determined by global income.
-    tax_on_global = calculate_german_tax(global_income_for_rate, tax_year, is_married)
+    if trace is not None:
+        trace.record("global_income_for_rate", global_income_for_rate, "taxable_income_de + (in_rent + in_interest + in_salary) * INR_TO_EUR_RATE",
+                     foreign_income=foreign_income, INR_TO_EUR_RATE=constants.INR_TO_EUR_RATE)
+    tax_on_global = calculate_german_tax(global_income_for_rate, tax_year, is_married, trace=trace)
     effective_rate = tax_on_global / global_income_for_rate if global_income_for_rate > 0 else 0
+    if trace is not None:
+        trace.record("effective_tax_rate", effective_rate, "tax_on_global / global_income_for_rate")
     
     # 6. Final Tax Liability
     final_tax_liability = taxable_income_de * effective_rate
-    soli = calculate_soli(final_tax_liability, tax_year, is_married)
+    if trace is not None:
+        trace.record("final_tax_liability", final_tax_liability, "taxable_income_de * effective_tax_rate")
+    soli = calculate_soli(final_tax_liability, tax_year, is_married, trace=trace)
     net_german_tax_due = final_tax_liability + soli - credits["total_credits"]
     net_german_tax_due = max(0, net_german_tax_due)
     
     # 7. Final Refund or Payment
     refund_or_payment = total_tax_paid - net_german_tax_due
+    if trace is not None:
+        trace.record("net_german_tax_due", net_german_tax_due, "max(0, final_tax_liability + soli - total_credits)",
+                     total_credits=credits["total_credits"])
+        trace.record("refund_or_payment", refund_or_payment, "total_tax_paid - net_german_tax_due",
+                     total_tax_paid=total_tax_paid)
     
     # 8. Compile the detailed report
     report = {
@@ -232,6 +284,9 @@ def generate_full_report(data):
         
         # Calculation Steps
         "taxable_income_de": taxable_income_de,
+        "in_rent_eur": in_rent_eur,
+        "in_interest_eur": in_interest_eur,
+        "in_salary_eur": in_salary_eur,
         "foreign_income": foreign_income,
         "global_income_for_rate": global_income_for_rate,
         "effective_tax_rate": effective_rate,
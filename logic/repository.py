@@ -0,0 +1,275 @@
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+from .household_store import HouseholdStore, INPUT_FIELDS
+from .validation_rules import VALIDATION_RULES
+
+# Local SQLite store of clients: their inputs, the computed reports (one column
+# per generate_full_report key) and the warnings (one row per fired rule).
+#
+# The database runs in WAL mode, so the GUI can read while a batch run writes.
+# Reports are indexed by (tax_year, refund_or_payment), which serves both the
+# year filters and refund/payment sign and amount ranges, and by tax class;
+# warnings by rule id. The indexes carry the client id, so id queries are
+# answered from the index alone. Bulk writes happen in a single transaction.
+#
+# Columns are always named in the SQL, never taken by position. A database
+# created by an older version is migrated on open: input fields and report keys
+# it does not have yet are added with ALTER TABLE (old rows get the input's
+# default, e.g. 0.0 moving_costs_a, and NULL report values until recomputed).
+
+# Contribution inputs that generate_full_report copies into the report
+REPORT_INPUT_KEYS = (
+    "de_pension_a", "de_health_a", "de_nursing_a", "de_unemployment_a",
+    "de_pension_b", "de_health_b", "de_nursing_b", "de_unemployment_b",
+)
+
+_RULE_IDS = {rule["message"]: rule["id"] for rule in VALIDATION_RULES}
+_MESSAGES = {rule["id"]: rule["message"] for rule in VALIDATION_RULES}
+
+_REPORT_COLUMNS = None
+
+
+def report_columns():
+    """{report key: Python type} of every generate_full_report key except the warnings."""
+    global _REPORT_COLUMNS
+    if _REPORT_COLUMNS is None:
+        report = HouseholdStore.repeat({}, 1).calculate()
+        columns = {key: float for key in REPORT_INPUT_KEYS}
+        for key, values in report.items():
+            kind = np.asarray(values).dtype.kind
+            columns[key] = bool if kind == "b" else int if kind in "iu" else float
+        _REPORT_COLUMNS = columns
+    return _REPORT_COLUMNS
+
+
+def _sql_type(kind):
+    return "REAL" if kind is float else "INTEGER"
+
+
+def _input_type(dtype):
+    kind = np.dtype(dtype).kind
+    return bool if kind == "b" else int if kind in "iu" else float
+
+
+def _sql_default(value):
+    return repr(int(value)) if isinstance(value, bool) else repr(value)
+
+
+def _extra_fields(data):
+    """Input keys outside INPUT_FIELDS, kept as JSON."""
+    extra = {key: value for key, value in data.items() if key not in INPUT_FIELDS}
+    return json.dumps(extra) if extra else None
+
+
+class ClientRepository:
+    """SQLite repository of client inputs, reports and warnings."""
+
+    def __init__(self, path="tax_clients.sqlite"):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        inputs = ", ".join(f"{field} {_sql_type(_input_type(dtype))}" for field, (dtype, _) in INPUT_FIELDS.items())
+        reports = ", ".join(f"{key} {_sql_type(kind)}" for key, kind in report_columns().items())
+        self._conn.executescript(
+            f"CREATE TABLE IF NOT EXISTS inputs (client_id TEXT PRIMARY KEY, {inputs}, extra TEXT);"
+            f"CREATE TABLE IF NOT EXISTS reports (client_id TEXT PRIMARY KEY, {reports}, updated REAL);"
+            "CREATE TABLE IF NOT EXISTS warnings (client_id TEXT NOT NULL, rule_id TEXT NOT NULL,"
+            " PRIMARY KEY(client_id, rule_id));"
+            "CREATE INDEX IF NOT EXISTS idx_reports_year_refund ON reports(tax_year, refund_or_payment, client_id);"
+            "CREATE INDEX IF NOT EXISTS idx_reports_tax_class ON reports(tax_class, client_id);"
+            "CREATE INDEX IF NOT EXISTS idx_warnings_rule ON warnings(rule_id, client_id);"
+        )
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """Adds the input and report columns missing from an older database."""
+        wanted = {
+            "inputs": {field: f"{_sql_type(_input_type(dtype))} DEFAULT {_sql_default(default)}"
+                       for field, (dtype, default) in INPUT_FIELDS.items()},
+            "reports": {key: _sql_type(kind) for key, kind in report_columns().items()},
+        }
+        for table, columns in wanted.items():
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns.items():
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    # --- Writes ---
+
+    def save(self, client_id, data, report):
+        """Stores one client's wizard input and generate_full_report result."""
+        self.save_many([(client_id, data, report)])
+
+    def save_many(self, items):
+        """
+        Stores many clients in one transaction.
+
+        Args:
+            items (iterable): (client id, wizard input dict, report dict) tuples.
+        """
+        items = list(items)
+        keys = list(report_columns())
+        with self._conn:
+            self._conn.executemany(self._insert_inputs_sql(), (
+                [str(client_id)]
+                + [data.get(field, default) for field, (_, default) in INPUT_FIELDS.items()]
+                + [_extra_fields(data)]
+                for client_id, data, _ in items
+            ))
+            now = time.time()
+            self._conn.executemany(self._insert_reports_sql(), (
+                [str(client_id)] + [report.get(key, 0.0) for key in keys] + [now]
+                for client_id, _, report in items
+            ))
+            self._replace_warnings(
+                [str(client_id) for client_id, _, _ in items],
+                ((str(client_id), _RULE_IDS.get(message, message))
+                 for client_id, _, report in items for message in report.get("warnings", [])),
+            )
+
+    def save_batch(self, client_ids, columns, report, warnings=None):
+        """
+        Stores a whole portfolio computed on the vectorized path in one transaction.
+
+        Args:
+            client_ids (sequence): One id per row.
+            columns (dict): Input columns (HouseholdStore.columns()).
+            report (dict): vectorized.generate_batch_report(columns).
+            warnings (WarningMatrix): validation_rules.evaluate_rules_batch result.
+        """
+        client_ids = [str(client_id) for client_id in client_ids]
+        if hasattr(columns, "columns"):
+            columns = columns.columns()
+        input_lists = [columns[field].tolist() for field in INPUT_FIELDS]
+        report_lists = [
+            (columns[key] if key in REPORT_INPUT_KEYS else report[key]).tolist() for key in report_columns()
+        ]
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                self._insert_inputs_sql(), ((client_id, *row, None) for client_id, *row in zip(client_ids, *input_lists))
+            )
+            self._conn.executemany(
+                self._insert_reports_sql(), ((client_id, *row, now) for client_id, *row in zip(client_ids, *report_lists))
+            )
+            if warnings is not None:
+                self._replace_warnings(
+                    client_ids,
+                    ((client_ids[row], warnings.rule_ids[col])
+                     for row, col in zip(warnings.rows.tolist(), warnings.cols.tolist())),
+                )
+
+    @staticmethod
+    def _insert_sql(table, names):
+        return f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+    def _insert_inputs_sql(self):
+        return self._insert_sql("inputs", ["client_id", *INPUT_FIELDS, "extra"])
+
+    def _insert_reports_sql(self):
+        return self._insert_sql("reports", ["client_id", *report_columns(), "updated"])
+
+    def _replace_warnings(self, client_ids, pairs):
+        self._conn.executemany("DELETE FROM warnings WHERE client_id = ?", ((client_id,) for client_id in client_ids))
+        self._conn.executemany("INSERT OR IGNORE INTO warnings VALUES (?, ?)", pairs)
+
+    # --- Reads ---
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def input(self, client_id):
+        """The stored wizard input of one client, or None."""
+        row = self._conn.execute(
+            f"SELECT {', '.join(INPUT_FIELDS)}, extra FROM inputs WHERE client_id = ?", (str(client_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        data = {field: (value if value is None else _input_type(dtype)(value))
+                for (field, (dtype, _)), value in zip(INPUT_FIELDS.items(), row)}
+        data.update(json.loads(row[-1]) if row[-1] else {})
+        return data
+
+    def report(self, client_id):
+        """The stored report of one client (with its warning messages), or None."""
+        row = self._conn.execute(
+            f"SELECT {', '.join(report_columns())} FROM reports WHERE client_id = ?", (str(client_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        report = {key: (value if value is None else kind(value)) for (key, kind), value in zip(report_columns().items(), row)}
+        report["warnings"] = self.warnings(client_id)
+        return report
+
+    def warnings(self, client_id):
+        """Warning messages of one client, in rule order."""
+        fired = {rule_id for (rule_id,) in self._conn.execute(
+            "SELECT rule_id FROM warnings WHERE client_id = ?", (str(client_id),)
+        )}
+        return [rule["message"] for rule in VALIDATION_RULES if rule["id"] in fired] + sorted(
+            rule_id for rule_id in fired if rule_id not in _MESSAGES
+        )
+
+    def find(self, tax_year=None, tax_class=None, owing_more_than=None, refund_more_than=None,
+             warning=None, limit=None):
+        """
+        Client ids matching all given filters, e.g. all 2025 clients owing more
+        than 1000 €: find(tax_year=2025, owing_more_than=1000).
+
+        Args:
+            tax_year (int): Tax year of the report.
+            tax_class (int): Steuerklasse (1, 3, 4, 5).
+            owing_more_than (float): Payment due above this amount (refund_or_payment < -amount).
+            refund_more_than (float): Refund above this amount (refund_or_payment > amount).
+            warning (str): Rule id that fired (see validation_rules.VALIDATION_RULES).
+            limit (int): Maximum number of ids.
+        """
+        sql, params = self._filtered("r.client_id", tax_year, tax_class, owing_more_than, refund_more_than, warning)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [client_id for (client_id,) in self._conn.execute(sql, params)]
+
+    def count(self, tax_year=None, tax_class=None, owing_more_than=None, refund_more_than=None, warning=None):
+        """Number of clients matching the filters of find."""
+        sql, params = self._filtered("COUNT(*)", tax_year, tax_class, owing_more_than, refund_more_than, warning)
+        return self._conn.execute(sql, params).fetchone()[0]
+
+    def _filtered(self, select, tax_year, tax_class, owing_more_than, refund_more_than, warning):
+        sql, where, params = f"SELECT {select} FROM reports r", [], []
+        if warning is not None:
+            sql += " JOIN warnings w ON w.client_id = r.client_id AND w.rule_id = ?"
+            params.append(warning)
+        if tax_year is not None:
+            where.append("r.tax_year = ?")
+            params.append(int(tax_year))
+        if tax_class is not None:
+            where.append("r.tax_class = ?")
+            params.append(int(tax_class))
+        if owing_more_than is not None:
+            where.append("r.refund_or_payment < ?")
+            params.append(-float(owing_more_than))
+        if refund_more_than is not None:
+            where.append("r.refund_or_payment > ?")
+            params.append(float(refund_more_than))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql, params
+
+    def warning_counts(self):
+        """Number of clients per rule id."""
+        return dict(self._conn.execute("SELECT rule_id, COUNT(*) FROM warnings GROUP BY rule_id").fetchall())
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
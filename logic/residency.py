@@ -0,0 +1,141 @@
+import csv
+from datetime import date
+
+from . import constants
+from .report_generator import generate_full_report
+
+# Partial-year residency: clients who arrive in (or leave) Germany during the tax year.
+#
+# Indian income (rent, interest and salary from Indian employment) is passed in
+# as a stream of dated events and split into the part earned while resident in
+# Germany and the part earned before arrival / after departure. Under
+# § 32b (1) Nr. 2 EStG both parts only raise the tax *rate*
+# (Progressionsvorbehalt), but Indian TDS is only creditable for the resident part.
+# The year of the move also gets the moving lump sum, and the Unterhalt deduction
+# is capped: per supported person at the basic allowance, cut to a quarter for
+# parents living in India (Ländergruppe 4), and reduced by one twelfth per full
+# non-resident month (§ 33a (1) and (3) EStG). Full-year wizard runs take the
+# support to parents as entered.
+
+# Event kinds and the wizard field they accumulate into
+EVENT_FIELDS = {
+    "in_rent": "in_rent",
+    "in_interest": "in_interest",
+    "in_salary": "in_salary",
+    "in_tds": "in_tds_inr",
+    "parents_support": "parents_support",
+}
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _foreign_inr(totals):
+    return totals["in_rent"] + totals["in_interest"] + totals["in_salary"]
+
+
+def read_income_events_csv(path):
+    """Yields (date, kind, amount) events from a CSV file with date,kind,amount columns."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row["date"], row["kind"], float(row["amount"])
+
+
+def resident_months(tax_year, arrival=None, departure=None):
+    """
+    Number of calendar months not entirely spent outside Germany. The months of
+    arrival and departure count as resident.
+    """
+    first = arrival.month if arrival and arrival.year == tax_year else 1
+    last = departure.month if departure and departure.year == tax_year else 12
+    return max(0, last - first + 1)
+
+
+def parents_support_cap(tax_year, months, supported_persons=1):
+    """Maximum Unterhalt deduction for parents in India over the resident months."""
+    if tax_year not in constants.TAX_YEAR_CONSTANTS:
+        raise ValueError(f"Tax constants for year {tax_year} are not available.")
+    basic_allowance = constants.TAX_YEAR_CONSTANTS[tax_year]['BASIC_ALLOWANCE']
+    return basic_allowance * constants.UNTERHALT_INDIA_FACTOR * supported_persons * months / 12
+
+
+def split_income_events(events, tax_year, arrival=None, departure=None):
+    """
+    Aggregates a stream of (date, kind, amount) events in one pass.
+
+    Args:
+        events (iterable): Dated Indian income events; amounts in INR for income and
+                           TDS, in EUR for parents_support. Consumed lazily.
+        tax_year (int): Events outside this calendar year are ignored.
+        arrival (date): First day of German residency, None if resident all year.
+        departure (date): Last day of German residency, None if resident all year.
+
+    Returns:
+        dict: {"resident": {field: sum}, "non_resident": {field: sum}}
+    """
+    arrival = _as_date(arrival) if arrival else None
+    departure = _as_date(departure) if departure else None
+    totals = {
+        "resident": {field: 0.0 for field in EVENT_FIELDS.values()},
+        "non_resident": {field: 0.0 for field in EVENT_FIELDS.values()},
+    }
+    for when, kind, amount in events:
+        when = _as_date(when)
+        if when.year != tax_year:
+            continue
+        if kind not in EVENT_FIELDS:
+            raise ValueError(f"Unknown income event kind '{kind}'.")
+        resident = (arrival is None or when >= arrival) and (departure is None or when <= departure)
+        totals["resident" if resident else "non_resident"][EVENT_FIELDS[kind]] += amount
+    return totals
+
+
+def generate_partial_year_report(data, events, arrival=None, departure=None):
+    """
+    Runs generate_full_report for a client who moved to or from Germany during the year.
+
+    Args:
+        data (dict): Wizard input. German salary figures come from the
+                     Lohnsteuerbescheinigung and already cover the resident period only.
+                     in_rent, in_interest, in_salary, in_tds_inr and parents_support are
+                     replaced by the event totals. supported_persons (default 1)
+                     is the number of parents the support is paid to.
+        events (iterable): Dated Indian income events, see split_income_events.
+        arrival (date or str): Date of moving to Germany, if within the tax year.
+        departure (date or str): Date of leaving Germany, if within the tax year.
+
+    Returns:
+        dict: The full report plus the residency split.
+    """
+    tax_year = int(data.get("tax_year", "2024"))
+    arrival = _as_date(arrival) if arrival else None
+    departure = _as_date(departure) if departure else None
+    split = split_income_events(events, tax_year, arrival, departure)
+    resident, non_resident = split["resident"], split["non_resident"]
+    months = resident_months(tax_year, arrival, departure)
+
+    adjusted = dict(data)
+    # Both parts feed the Progressionsvorbehalt
+    adjusted["in_rent"] = resident["in_rent"] + non_resident["in_rent"]
+    adjusted["in_interest"] = resident["in_interest"] + non_resident["in_interest"]
+    adjusted["in_salary"] = resident["in_salary"] + non_resident["in_salary"]
+    # Indian TDS is only creditable for income earned while resident
+    adjusted["in_tds_inr"] = resident["in_tds_inr"]
+
+    # Unterhalt paid while resident, at most the cap of the supported persons
+    support_cap = parents_support_cap(tax_year, months, data.get("supported_persons", 1))
+    adjusted["parents_support"] = min(resident["parents_support"], support_cap)
+
+    moved = (arrival is not None and arrival.year == tax_year) or (departure is not None and departure.year == tax_year)
+    if moved:
+        adjusted["moving_costs_a"] = data.get("moving_costs_a", 0.0) + constants.MOVING_LUMP_SUM_NON_EU
+
+    report = generate_full_report(adjusted)
+    report.update({
+        "resident_months": months,
+        "foreign_income_resident": _foreign_inr(resident) * constants.INR_TO_EUR_RATE,
+        "foreign_income_non_resident": _foreign_inr(non_resident) * constants.INR_TO_EUR_RATE,
+        "tds_non_creditable": non_resident["in_tds_inr"] * constants.INR_TO_EUR_RATE,
+    })
+    return report
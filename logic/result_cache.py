@@ -0,0 +1,150 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+from . import constants
+from .report_generator import generate_full_report
+
+
+def canonicalize_input(data):
+    """
+    Normalizes a wizard input dict so that equivalent inputs hash identically:
+    keys are sorted, numbers become floats, the tax year becomes an int and
+    unset (None) values are dropped.
+    """
+    canonical = {}
+    for key in sorted(data):
+        value = data[key]
+        if value is None:
+            continue
+        if key == "tax_year":
+            value = int(value)
+        elif isinstance(value, bool):
+            pass
+        elif isinstance(value, (int, float)):
+            value = float(value)
+        canonical[key] = value
+    return canonical
+
+
+def rules_version():
+    """
+    Fingerprint of every rule constant (rates, flat amounts, TAX_YEAR_CONSTANTS,
+    SOLI_EXEMPTION_LIMITS). Any change to logic/constants.py yields a new version.
+    """
+    rules = {
+        name: getattr(constants, name)
+        for name in dir(constants) if name.isupper()
+    }
+    payload = json.dumps(rules, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def input_key(data, version=None):
+    """Cache key: content hash of the canonical input plus the rules version."""
+    payload = json.dumps(canonicalize_input(data), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{version or rules_version()}:{digest}"
+
+
+class ResultCache:
+    """
+    On-disk cache of generate_full_report results, backed by SQLite.
+
+    Entries are evicted least-recently-used once the stored reports exceed
+    `max_bytes`. Hit and miss counts are kept per instance (see `stats`).
+    """
+
+    def __init__(self, path="tax_report_cache.sqlite", max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.version = rules_version()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            " key TEXT PRIMARY KEY, report TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reports_last_used ON reports(last_used)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+
+    def get(self, data):
+        """Returns the cached report for `data`, or None on a miss."""
+        key = input_key(data, self.version)
+        row = self._conn.execute("SELECT report FROM reports WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute("UPDATE reports SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, data, report):
+        """Stores `report` for `data` and evicts old entries if the size budget is exceeded."""
+        key = input_key(data, self.version)
+        payload = json.dumps(report, separators=(",", ":"))
+        old = self._conn.execute("SELECT size FROM reports WHERE key = ?", (key,)).fetchone()
+        self._total_bytes += len(payload) - (old[0] if old else 0)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO reports (key, report, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, payload, len(payload), time.time()),
+        )
+        self._evict()
+        self._conn.commit()
+
+    def report(self, data):
+        """Returns the cached report for `data`, computing and storing it on a miss."""
+        cached = self.get(data)
+        if cached is not None:
+            return cached
+        report = generate_full_report(data)
+        self.put(data, report)
+        return report
+
+    def reports(self, households):
+        """Cached variant of running generate_full_report over many households."""
+        results = [self.report(data) for data in households]
+        self._conn.commit()
+        return results
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        excess = self._total_bytes - self.max_bytes
+        rows = self._conn.execute("SELECT key, size FROM reports ORDER BY last_used")
+        stale = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            stale.append((key,))
+            excess -= size
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM reports WHERE key = ?", stale)
+
+    def purge_stale_versions(self):
+        """Deletes entries computed under older rule versions."""
+        self._conn.execute("DELETE FROM reports WHERE key NOT LIKE ?", (f"{self.version}:%",))
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import report_generator
+from .report_generator import generate_full_report
+
+# Local HTTP/JSON service around the calculation core, for tools that cannot
+# drive the wizard (CRM, payroll checks). Standard library only and offline:
+#
+#   POST /report   one household (wizard input dict)  -> report
+#   POST /batch    list of households                 -> list of reports
+#   GET  /metrics  request count and latency percentiles per endpoint
+#   GET  /health
+#
+# Connections are kept alive (HTTP/1.1). The calculations run on a process
+# pool so the event loop only parses requests and serializes responses.
+#
+# Run with: python -m logic.service --port 8765
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+BATCH_CHUNK_SIZE = 256
+LATENCY_WINDOW = 10000  # Latencies kept per endpoint for the percentiles
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def _init_worker():
+    report_generator.DEBUG = False
+
+
+def _compute_reports(households):
+    """Worker: reports for a chunk of households."""
+    return [generate_full_report(data) for data in households]
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _check_household(data, label="Household"):
+    """
+    Rejects values the core would misread: every field is a number or a boolean,
+    except tax_year, which may also be a string of digits ("2025"). null is
+    rejected too; leave the field out to get the core's default.
+    """
+    if not isinstance(data, dict):
+        raise HTTPError(400, f"{label}: expected a JSON object.")
+    for field, value in data.items():
+        if field == "tax_year" and isinstance(value, str) and value.strip().isdigit():
+            continue
+        if value is None:
+            raise HTTPError(400, f"{label}: '{field}' is null; omit it to use the default.")
+        if not isinstance(value, (bool, int, float)):
+            raise HTTPError(400, f"{label}: '{field}' must be a number, not {type(value).__name__}.")
+
+
+class TaxService:
+    """Asyncio HTTP server exposing generate_full_report."""
+
+    def __init__(self, max_workers=None):
+        self.pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        self.routes = {
+            "/report": ("POST", self._report),
+            "/batch": ("POST", self._batch),
+            "/metrics": ("GET", self._metrics),
+            "/health": ("GET", self._health),
+        }
+        self.latencies = {path: deque(maxlen=LATENCY_WINDOW) for path in self.routes}
+        self.counts = {path: 0 for path in self.routes}
+        self.errors = {path: 0 for path in self.routes}
+        self.connections = set()
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Idle keep-alive connections would otherwise hold the server open
+            for task in list(self.connections):
+                task.cancel()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+            await self.server.wait_closed()
+        self.pool.shutdown()
+
+    # --- Endpoints ---
+
+    async def _report(self, payload):
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Expected one household as a JSON object.")
+        _check_household(payload)
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(self.pool, _compute_reports, [payload]))[0]
+
+    async def _batch(self, payload):
+        if not isinstance(payload, list) or not all(isinstance(item, dict) for item in payload):
+            raise HTTPError(400, "Expected a JSON array of households.")
+        for i, item in enumerate(payload):
+            _check_household(item, f"Household {i}")
+        loop = asyncio.get_running_loop()
+        chunks = [payload[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(payload), BATCH_CHUNK_SIZE)]
+        results = await asyncio.gather(*(loop.run_in_executor(self.pool, _compute_reports, chunk) for chunk in chunks))
+        return [report for chunk in results for report in chunk]
+
+    async def _metrics(self, payload):
+        return self.metrics()
+
+    async def _health(self, payload):
+        return {"status": "ok"}
+
+    def metrics(self):
+        """Per endpoint: requests, errors and latency percentiles in milliseconds."""
+        result = {}
+        for path, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            result[path] = {
+                "requests": self.counts[path],
+                "errors": self.errors[path],
+                "p50_ms": _percentile(ordered, 50) * 1000,
+                "p99_ms": _percentile(ordered, 99) * 1000,
+                "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+            }
+        return result
+
+    # --- HTTP ---
+
+    async def _dispatch(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path not in self.routes:
+            raise HTTPError(404, f"Unknown endpoint '{path}'.")
+        expected, handler = self.routes[path]
+        if method != expected:
+            raise HTTPError(405, f"Use {expected} for {path}.")
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        try:
+            return await handler(payload)
+        except ValueError as e:
+            # e.g. a tax year without constants
+            raise HTTPError(422, str(e))
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    self._write_response(writer, 400, {"error": "Malformed request line."}, False)
+                    await writer.drain()
+                    break
+                method, path, version = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                start = time.perf_counter()
+                if length < 0:
+                    # The body cannot be framed, so the connection cannot be reused
+                    status, result, keep_alive = 400, {"error": "Invalid Content-Length."}, False
+                elif length > MAX_BODY_BYTES:
+                    status, result, keep_alive = 413, {"error": "Request body too large."}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, result = await self._respond(method, path, body)
+
+                self._write_response(writer, status, result, keep_alive)
+                await writer.drain()
+                route = path.split("?", 1)[0]
+                if route in self.latencies:
+                    self.latencies[route].append(time.perf_counter() - start)
+                    self.counts[route] += 1
+                    self.errors[route] += status != 200
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Service shutdown; end the connection quietly
+            pass
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def _respond(self, method, path, body):
+        try:
+            return 200, await self._dispatch(method, path, body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    def _write_response(writer, status, result, keep_alive):
+        body = json.dumps(result).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+
+
+async def http_request(reader, writer, method, path, payload=None, host="127.0.0.1"):
+    """
+    Minimal HTTP/1.1 client call on an open (keep-alive) connection.
+
+    Returns:
+        tuple: (status, decoded JSON body)
+    """
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def serve(host, port, max_workers):
+    service = TaxService(max_workers)
+    await service.start(host, port)
+    print(f"Serving on http://{host}:{service.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON service for the tax calculation core.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    report_generator.DEBUG = False
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_SESSION_DIR = "sessions"
+INDEX_FILE = "index.json"
+# Ids that would clash with the store's own files
+RESERVED_IDS = {os.path.splitext(INDEX_FILE)[0]}
+
+
+def _client_id(name):
+    """Turns a client name into a file-system safe identifier."""
+    client_id = re.sub(r"[^A-Za-z0-9_-]+", "_", name.strip()).strip("_").lower()
+    if not client_id:
+        raise ValueError("Client name must contain at least one letter or digit.")
+    return client_id
+
+
+class SessionStore:
+    """
+    Stores wizard state as one compact JSON file per client.
+
+    A small index (client id -> name, tax year, last update) is kept in memory and
+    mirrored to `index.json`, so listing clients never touches the session files and
+    opening one session reads a single file. Saves can run on a background thread.
+    """
+
+    def __init__(self, directory=DEFAULT_SESSION_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-save")
+        self._index = self._load_index()
+
+    def _load_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_atomic(self, path, payload):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def clients(self):
+        """Returns the indexed clients, most recently updated first."""
+        with self._lock:
+            entries = [{"client_id": cid, **meta} for cid, meta in self._index.items()]
+        return sorted(entries, key=lambda e: e["updated"], reverse=True)
+
+    def save(self, name, state):
+        """
+        Writes the wizard state of one client and updates the index.
+
+        Args:
+            name (str): Display name of the client.
+            state (dict): Wizard field name -> value.
+
+        Returns:
+            str: The client id the session was stored under.
+        """
+        base_id = _client_id(name)
+        payload = json.dumps(state, separators=(",", ":"))
+        with self._lock:
+            client_id = self._free_id(base_id, name)
+            self._write_atomic(os.path.join(self.directory, f"{client_id}.json"), payload)
+            self._index[client_id] = {
+                "name": name,
+                "tax_year": state.get("tax_year"),
+                "updated": time.time(),
+            }
+            self._write_atomic(os.path.join(self.directory, INDEX_FILE), json.dumps(self._index, separators=(",", ":")))
+        return client_id
+
+    def _free_id(self, base_id, name):
+        """
+        The id of the client called `name`: its existing id, else the first of
+        base_id, base_id_2, ... that is neither reserved nor taken by another
+        client (e.g. "Müller" and "M ller" both reduce to "m_ller").
+        """
+        candidate, suffix = base_id, 1
+        while True:
+            if candidate not in RESERVED_IDS:
+                meta = self._index.get(candidate)
+                if meta is not None and meta["name"] == name:
+                    return candidate
+                if meta is None and not os.path.exists(os.path.join(self.directory, f"{candidate}.json")):
+                    return candidate
+            suffix += 1
+            candidate = f"{base_id}_{suffix}"
+
+    def save_async(self, name, state):
+        """Schedules `save` on the background thread and returns its Future."""
+        return self._executor.submit(self.save, name, dict(state))
+
+    def load(self, client_id):
+        """Reads the saved wizard state of a client."""
+        if client_id not in self._index:
+            raise KeyError(f"No saved session for client '{client_id}'.")
+        with open(os.path.join(self.directory, f"{client_id}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def delete(self, client_id):
+        with self._lock:
+            self._index.pop(client_id, None)
+            path = os.path.join(self.directory, f"{client_id}.json")
+            if os.path.exists(path):
+                os.remove(path)
+            self._write_atomic(os.path.join(self.directory, INDEX_FILE), json.dumps(self._index, separators=(",", ":")))
+
+    def close(self):
+        """Waits for pending background saves to finish."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import constants
+from .household_store import HouseholdStore, INPUT_FIELDS
+
+# Monte Carlo simulation of the refund for one household.
+#
+# Uncertain inputs (the year-average INR rate, estimated home office days,
+# deductions, income) are drawn from distributions and every scenario is run
+# through the vectorized core. Scenarios are generated in batches, each with its
+# own child seed of one SeedSequence, so results are reproducible regardless of
+# how many processes share the work.
+#
+# Draws below zero are clipped to 0 (censored, not truncated): the probability
+# mass of the negative tail ends up at exactly 0 and the sampled mean is higher
+# than the distribution's. Prefer distributions without a negative tail
+# (uniform/triangular with low >= 0, lognormal) or a normal whose mean is
+# several standard deviations above 0.
+
+# Pseudo-field for the EUR-per-INR rate. All INR inputs enter the calculation
+# linearly, so a sampled rate is applied by rescaling them.
+FX_RATE = "fx_rate"
+INR_FIELDS = ("in_rent", "in_interest", "in_salary", "in_tds_inr")
+
+DISTRIBUTIONS = {
+    # kind: (number of parameters, sampler)
+    "normal": (2, lambda rng, n, mean, sd: rng.normal(mean, sd, n)),
+    "uniform": (2, lambda rng, n, low, high: rng.uniform(low, high, n)),
+    "triangular": (3, lambda rng, n, low, mode, high: rng.triangular(low, mode, high, n)),
+    "lognormal": (2, lambda rng, n, mean, sigma: rng.lognormal(mean, sigma, n)),
+}
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _check_uncertainty(uncertainty):
+    for field, spec in uncertainty.items():
+        if field != FX_RATE and field not in INPUT_FIELDS:
+            raise ValueError(f"Unknown input field '{field}'.")
+        if field != FX_RATE and np.dtype(INPUT_FIELDS[field][0]).kind != "f":
+            # Flags and counts (is_married, tax_class, num_kids, ...) are not continuous
+            raise ValueError(f"'{field}' is not a continuous amount and cannot be sampled.")
+        if spec[0] not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{spec[0]}' for '{field}'.")
+        if len(spec) - 1 != DISTRIBUTIONS[spec[0]][0]:
+            raise ValueError(f"Distribution '{spec[0]}' for '{field}' needs {DISTRIBUTIONS[spec[0]][0]} parameters.")
+
+
+def sample_scenarios(base, uncertainty, size, rng):
+    """
+    Draws `size` scenarios of one household.
+
+    Args:
+        base (dict): Wizard input with the expected values.
+        uncertainty (dict): {field or FX_RATE: (distribution, *parameters)}, e.g.
+                            {"ho_days_a": ("triangular", 100, 140, 180),
+                             "fx_rate": ("normal", 0.011, 0.0004)}. Only float
+                            fields can be sampled; negative draws are clipped to 0.
+        size (int): Number of scenarios.
+        rng (np.random.Generator): Source of randomness.
+
+    Returns:
+        dict: Input columns for vectorized.generate_batch_report.
+    """
+    columns = HouseholdStore.repeat(base, size).columns()
+    for field, (kind, *params) in uncertainty.items():
+        # Amounts, days and rates cannot become negative (censored at 0, see above)
+        values = np.maximum(DISTRIBUTIONS[kind][1](rng, size, *params), 0.0)
+        if field == FX_RATE:
+            for inr_field in INR_FIELDS:
+                columns[inr_field] = columns[inr_field] * (values / constants.INR_TO_EUR_RATE)
+        else:
+            columns[field] = values.astype(INPUT_FIELDS[field][0])
+    return columns
+
+
+def _simulate_batch(base, uncertainty, size, seed):
+    """Worker: the refunds of one batch of scenarios."""
+    columns = sample_scenarios(base, uncertainty, size, np.random.default_rng(seed))
+    return HouseholdStore(columns).calculate()["refund_or_payment"]
+
+
+def simulate_refund(base, uncertainty, scenarios=10000, seed=0, batch_size=10000, max_workers=1,
+                    percentiles=DEFAULT_PERCENTILES):
+    """
+    Runs the Monte Carlo simulation for one household.
+
+    Args:
+        base (dict): Wizard input.
+        uncertainty (dict): See sample_scenarios.
+        scenarios (int): Total number of scenarios.
+        seed (int): Seed of the SeedSequence; same seed, same result.
+        batch_size (int): Scenarios per batch (one vectorized pass each).
+        max_workers (int): Processes to spread the batches over; 1 runs in-process.
+
+    Returns:
+        dict: scenarios, mean, std, p<percentile> for each requested percentile and
+              probability_refund (share of scenarios with a refund).
+
+    Raises:
+        ValueError: If scenarios or batch_size is not a positive integer, or the
+                    uncertainty spec is invalid.
+    """
+    for name, value in (("scenarios", scenarios), ("batch_size", batch_size)):
+        if isinstance(value, bool) or not isinstance(value, (int, np.integer)) or value <= 0:
+            raise ValueError(f"{name} must be a positive integer, got {value!r}.")
+    _check_uncertainty(uncertainty)
+    sizes = [batch_size] * (scenarios // batch_size)
+    if scenarios % batch_size:
+        sizes.append(scenarios % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if max_workers == 1 or len(sizes) == 1:
+        parts = [_simulate_batch(base, uncertainty, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parts = list(pool.map(_simulate_batch, [base] * len(sizes), [uncertainty] * len(sizes), sizes, seeds))
+    refunds = np.concatenate(parts)
+
+    result = {
+        "scenarios": len(refunds),
+        "mean": float(refunds.mean()),
+        "std": float(refunds.std()),
+        "probability_refund": float((refunds > 0).mean()),
+    }
+    for p, value in zip(percentiles, np.percentile(refunds, percentiles)):
+        result[f"p{p}"] = float(value)
+    return result
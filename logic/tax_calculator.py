@@ -1,7 +1,8 @@
 # logic/tax_calculator.py
-from .constants import TAX_YEAR_CONSTANTS
+from . import constants
+from .constants import TAX_YEAR_CONSTANTS, SOLI_EXEMPTION_LIMITS
 
-def calculate_german_tax(zvE, year, is_married=True):
+def calculate_german_tax(zvE, year, is_married=True, trace=None):
     """
     Calculates German income tax based on the official formula (approximated for recent years).
     
@@ -9,6 +10,7 @@ def calculate_german_tax(zvE, year, is_married=True):
         zvE (float): The taxable income (zu versteuerndes Einkommen).
         year (int): The tax year to use for constants.
         is_married (bool): True if filing jointly, which triggers the 'Splitting' method.
+        trace (CalculationTrace): Optional, records the tariff zone used.
         
     Returns:
         float: The calculated income tax amount.
@@ -17,6 +19,7 @@ def calculate_german_tax(zvE, year, is_married=True):
         raise ValueError(f"Tax constants for year {year} are not available.")
 
     basic_allowance = TAX_YEAR_CONSTANTS[year]['BASIC_ALLOWANCE']
+    t = TAX_YEAR_CONSTANTS[year]['TARIFF']
 
     # For married couples (Splittingverfahren), we halve the income, 
     # calculate tax, then double the result.
@@ -25,40 +28,67 @@ def calculate_german_tax(zvE, year, is_married=True):
         # The basic allowance is also halved for the formula
         basic_allowance = basic_allowance / 2
 
-    # NOTE: The tax brackets below are a rough approximation based on 2023/2024 values.
-    # A real-world application would need to update these for each year.
-    # The primary change for this function is using the dynamic basic_allowance.
-    tax = 0
-    if zvE <= basic_allowance:
+    # NOTE: The tariff zones (constants.TAX_YEAR_CONSTANTS[year]['TARIFF']) are a
+    # rough approximation based on 2024 values.
+    zone = tariff_zone(zvE, basic_allowance, t)
+    if zone == 0:
         tax = 0
-    elif zvE <= 17005: # This threshold is for 2024
+    elif zone == 1:
         y = (zvE - basic_allowance) / 10000
-        tax = (922.98 * y + 1400) * y
-    elif zvE <= 66760: # This threshold is for 2024
-        # The formula needs to be adjusted based on the prior bracket's calculation
-        # For simplicity, we'll keep the old formula but acknowledge it's an approximation
-        z = (zvE - 17005) / 10000
-        tax = (181.19 * z + 2397) * z + 1025.38
-    elif zvE <= 277825:
-        tax = 0.42 * zvE - 10602.13
+        tax = (t['ZONE_1_A'] * y + t['ZONE_1_B']) * y
+    elif zone == 2:
+        z = (zvE - t['ZONE_1_END']) / 10000
+        tax = (t['ZONE_2_A'] * z + t['ZONE_2_B']) * z + t['ZONE_2_C']
+    elif zone == 3:
+        tax = t['ZONE_3_RATE'] * zvE - t['ZONE_3_OFFSET']
     else:
-        tax = 0.45 * zvE - 18936.88
+        tax = t['ZONE_4_RATE'] * zvE - t['ZONE_4_OFFSET']
+
+    if trace is not None:
+        _trace_tariff_zone(trace, zone, zvE, basic_allowance, tax, is_married, t)
 
     return (tax * 2) if is_married else tax
 
-def calculate_soli(tax_liability, tax_year, is_married):
+def tariff_zone(zvE, basic_allowance, tariff):
+    """Tariff zone (0 to 4) of a per-person zvE, for a TAX_YEAR_CONSTANTS[year]['TARIFF'] table."""
+    if zvE <= basic_allowance:
+        return 0
+    if zvE <= tariff['ZONE_1_END']:
+        return 1
+    if zvE <= tariff['ZONE_2_END']:
+        return 2
+    if zvE <= tariff['ZONE_3_END']:
+        return 3
+    return 4
+
+def _trace_tariff_zone(trace, zone, zvE, basic_allowance, tax, is_married, t):
+    if zone == 0:
+        label, formula = "0 (basic allowance)", "0"
+    elif zone == 1:
+        label, formula = "1 (entry zone)", (
+            f"({t['ZONE_1_A']} * y + {t['ZONE_1_B']}) * y, y = (zvE - BASIC_ALLOWANCE) / 10000")
+    elif zone == 2:
+        label, formula = "2 (progression zone)", (
+            f"({t['ZONE_2_A']} * z + {t['ZONE_2_B']}) * z + {t['ZONE_2_C']}, z = (zvE - {t['ZONE_1_END']}) / 10000")
+    else:
+        rate, offset = t[f'ZONE_{zone}_RATE'], t[f'ZONE_{zone}_OFFSET']
+        label, formula = f"{zone} ({rate:.0%} zone)", f"{rate} * zvE - {offset}"
+    trace.record("tariff_zone", label, "zone of zvE" + (" / 2 (splitting)" if is_married else ""),
+                 zvE=zvE, BASIC_ALLOWANCE=basic_allowance)
+    trace.record("tariff_tax", tax * 2 if is_married else tax, formula + (", doubled (splitting)" if is_married else ""))
+
+def calculate_soli(tax_liability, tax_year, is_married, trace=None):
     # Thresholds for 2024-2026 (Tax Liability amount)
-    thresholds = {
-        2024: 18130,
-        2025: 19450,
-        2026: 20350
-    }
-    
-    limit = thresholds.get(tax_year, 20350)
+    limit = SOLI_EXEMPTION_LIMITS.get(tax_year, 20350)
     if is_married:
         limit *= 2  # Double for joint assessment
         
     if tax_liability <= limit:
+        if trace is not None:
+            trace.record("soli", 0.0, "0 (tax liability <= Freigrenze)", tax_liability=tax_liability, limit=limit)
         return 0.0
     # Sliding zone logic (Milderungszone) can be added here
-    return tax_liability * 0.055
\ No newline at end of file
+    if trace is not None:
+        trace.record("soli", tax_liability * constants.SOLI_RATE, "tax_liability * SOLI_RATE (above Freigrenze)",
+                     tax_liability=tax_liability, limit=limit, SOLI_RATE=constants.SOLI_RATE)
+    return tax_liability * constants.SOLI_RATE
\ No newline at end of file
@@ -0,0 +1,172 @@
+from .constants import TAX_YEAR_CONSTANTS
+from .report_generator import generate_full_report, _calculate_deductions, _calculate_credits
+
+# Multi-year household timeline: all tax years (2024-2026) of a household in one call.
+#
+# The input of each year starts from the previous year's input (salary, commute,
+# children, support to parents, ...) with that year's changes applied on top;
+# one-off items such as moving costs are not carried forward. Deductions and
+# credits do not depend on the tax year, so years with unchanged inputs share
+# them and only the tariff part is recomputed.
+
+# Items that only apply to the year they were entered for
+NON_RECURRING_FIELDS = ("moving_costs_a", "moving_costs_b")
+
+# Report keys that are not compared between years
+DIFF_IGNORED_KEYS = ("tax_year", "warnings")
+
+
+def timeline_inputs(base, changes=None, years=None):
+    """
+    Builds the input of every year.
+
+    Args:
+        base (dict): Wizard input of the first year.
+        changes (dict): {year: {field: value}} for whatever differs in that year.
+        years (iterable): Tax years, defaults to all years with constants.
+
+    Returns:
+        dict: {year: input dict}
+    """
+    years = sorted(years or TAX_YEAR_CONSTANTS)
+    changes = changes or {}
+    inputs = {}
+    previous = dict(base)
+    for i, year in enumerate(years):
+        current = dict(previous)
+        if i > 0:
+            for field in NON_RECURRING_FIELDS:
+                current.pop(field, None)
+        current.update(changes.get(year, {}))
+        current["tax_year"] = year
+        inputs[year] = previous = current
+    return inputs
+
+
+def _shared_key(data):
+    return tuple(sorted((key, value) for key, value in data.items() if key != "tax_year"))
+
+
+def generate_timeline(base, changes=None, years=None, traces=None):
+    """
+    Computes the report of every year for one household (see timeline_inputs).
+
+    Args:
+        traces (dict): Optional {year: CalculationTrace} recording the steps of
+                       those years, deductions included.
+
+    Returns:
+        dict: {year: report}
+    """
+    traces = traces or {}
+    shared = {}
+    reports = {}
+    for year, data in timeline_inputs(base, changes, years).items():
+        key = _shared_key(data)
+        trace = traces.get(year)
+        # A traced year records its own deduction steps
+        if key not in shared or trace is not None:
+            shared[key] = (
+                _calculate_deductions(data, data.get("is_married", False),
+                                      data.get("de_gross_a", 0.0), data.get("de_gross_b", 0.0), trace),
+                _calculate_credits(data),
+            )
+        deductions, credits = shared[key]
+        reports[year] = generate_full_report(data, trace=trace, deductions=deductions, credits=credits)
+    return reports
+
+
+def diff_timeline(reports):
+    """
+    Compares consecutive years of a timeline.
+
+    Returns:
+        dict: {(from_year, to_year): {key: {"from", "to", "change"}}} for every report
+              value that changed, plus "warnings" with the added and removed messages.
+    """
+    years = sorted(reports)
+    diffs = {}
+    for from_year, to_year in zip(years, years[1:]):
+        before, after = reports[from_year], reports[to_year]
+        changed = {}
+        for key, value in after.items():
+            if key in DIFF_IGNORED_KEYS:
+                continue
+            old = before.get(key, 0.0)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                if value != old:
+                    changed[key] = {"from": old, "to": value}
+            elif abs(value - old) > 1e-9:
+                changed[key] = {"from": old, "to": value, "change": value - old}
+        added = [w for w in after.get("warnings", []) if w not in before.get("warnings", [])]
+        removed = [w for w in before.get("warnings", []) if w not in after.get("warnings", [])]
+        if added or removed:
+            changed["warnings"] = {"added": added, "removed": removed}
+        diffs[(from_year, to_year)] = changed
+    return diffs
+
+
+def generate_timeline_batch(columns, changes=None, years=None):
+    """
+    Batch mode: the timelines of a whole portfolio on the vectorized path.
+
+    Args:
+        columns: Input columns of the first year (a HouseholdStore or a mapping
+                 like HouseholdStore.columns()).
+        changes (dict): {year: {field: column or scalar}} applied on top of the
+                        previous year, as in timeline_inputs.
+        years (iterable): Tax years, defaults to all years with constants.
+
+    Returns:
+        dict: {year: report columns (see vectorized.generate_batch_report)}
+    """
+    import numpy as np
+    from .household_store import INPUT_FIELDS
+    from .vectorized import generate_batch_report, calculate_deductions_array, calculate_credits_array
+
+    if hasattr(columns, "columns"):
+        columns = columns.columns()
+    years = sorted(years or TAX_YEAR_CONSTANTS)
+    changes = changes or {}
+    size = len(columns["tax_year"])
+
+    reports = {}
+    previous, shared = dict(columns), None
+    for i, year in enumerate(years):
+        current = dict(previous)
+        changed = shared is None
+        if i > 0:
+            for field in NON_RECURRING_FIELDS:
+                if current[field].any():
+                    current[field] = np.zeros(size, dtype=INPUT_FIELDS[field][0])
+                    changed = True
+        for field, value in changes.get(year, {}).items():
+            current[field] = np.broadcast_to(np.asarray(value, dtype=INPUT_FIELDS[field][0]), (size,))
+            changed = True
+        current["tax_year"] = np.full(size, year, dtype=INPUT_FIELDS["tax_year"][0])
+
+        if changed:
+            is_married = np.asarray(current["is_married"], dtype=bool)
+            shared = (
+                calculate_deductions_array(current, is_married, current["de_gross_a"], current["de_gross_b"]),
+                calculate_credits_array(current),
+            )
+        reports[year] = generate_batch_report(current, *shared)
+        previous = current
+    return reports
+
+
+def diff_timeline_batch(reports):
+    """{(from_year, to_year): {key: change column}} for the numeric report columns."""
+    import numpy as np
+
+    years = sorted(reports)
+    diffs = {}
+    for from_year, to_year in zip(years, years[1:]):
+        before, after = reports[from_year], reports[to_year]
+        diffs[(from_year, to_year)] = {
+            key: np.asarray(after[key], dtype=np.float64) - before[key]
+            for key in after
+            if key not in DIFF_IGNORED_KEYS and np.asarray(after[key]).dtype != bool
+        }
+    return diffs
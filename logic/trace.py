@@ -0,0 +1,52 @@
+# Opt-in calculation trace.
+#
+# The calculation functions take an optional `trace` argument. When it is None
+# (the default) nothing is recorded and no formula strings are built; when a
+# CalculationTrace is passed, every intermediate step is appended as a plain
+# tuple and only turned into text when render() is called.
+
+
+class CalculationTrace:
+    """Append-only list of calculation steps: (step, value, formula, constants used)."""
+
+    __slots__ = ("events",)
+
+    def __init__(self):
+        self.events = []
+
+    def record(self, step, value, formula, **used):
+        self.events.append((step, value, formula, used))
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def steps(self, prefix):
+        """The events whose step name starts with `prefix` (e.g. "wk_a" or "tariff")."""
+        return [event for event in self.events if event[0].startswith(prefix)]
+
+    def render(self):
+        """Formats the recorded steps as text, one step per line."""
+        lines = []
+        for step, value, formula, used in self.events:
+            shown = _format_amount(value)
+            line = f"{step:<28} = {shown:>14}   {formula}"
+            if used:
+                line += "   [" + ", ".join(f"{name}={_format_value(v)}" for name, v in used.items()) + "]"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def _format_amount(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return str(value)
+    # Rates get more precision than amounts
+    return f"{value:.4f}" if 0 < abs(value) < 1 else f"{value:,.2f}"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
@@ -0,0 +1,252 @@
+import ast
+import operator
+
+from . import constants
+from .constants import TAX_YEAR_CONSTANTS
+from .utils import estimate_social_security
+
+# Declarative plausibility checks.
+#
+# Every rule is an expression over the input fields, the report keys and a few
+# per-year limits (see year_limits). The expressions are data: compile_rules
+# parses them once into predicates built from the operator module, nothing is
+# passed to eval. A predicate works on scalars (one report) as well as on NumPy
+# columns (a whole portfolio), so the expressions may only use names, numbers,
+# + - * /, unary minus, one comparison per operand pair and the element-wise
+# operators & and | (not `and`, `or`, `not`). Fields that are missing count as 0.
+
+VALIDATION_RULES = [
+    # Social security
+    {"id": "social_security_missing", "check": "(total_vorsorge == 0) & (total_gross > 20000)",
+     "message": "Social security contributions seem missing. This will cause an overestimation of tax."},
+    {"id": "pension_above_cap_a", "check": "de_pension_a > max_pension * 1.01",
+     "message": "Person A: Pension insurance (23a) is above the maximum employee contribution for the year."},
+    {"id": "pension_above_cap_b", "check": "de_pension_b > max_pension * 1.01",
+     "message": "Person B: Pension insurance (23a) is above the maximum employee contribution for the year."},
+    {"id": "health_above_cap_a", "check": "de_health_a > max_health * 1.01",
+     "message": "Person A: Health insurance (25) is above the maximum employee contribution for the year."},
+    {"id": "health_above_cap_b", "check": "de_health_b > max_health * 1.01",
+     "message": "Person B: Health insurance (25) is above the maximum employee contribution for the year."},
+    {"id": "nursing_above_cap_a", "check": "de_nursing_a > max_nursing * 1.01",
+     "message": "Person A: Nursing care insurance (26) is above the maximum employee contribution for the year."},
+    {"id": "nursing_above_cap_b", "check": "de_nursing_b > max_nursing * 1.01",
+     "message": "Person B: Nursing care insurance (26) is above the maximum employee contribution for the year."},
+    {"id": "unemployment_above_cap_a", "check": "de_unemployment_a > max_unemployment * 1.01",
+     "message": "Person A: Unemployment insurance (27) is above the maximum employee contribution for the year."},
+    {"id": "unemployment_above_cap_b", "check": "de_unemployment_b > max_unemployment * 1.01",
+     "message": "Person B: Unemployment insurance (27) is above the maximum employee contribution for the year."},
+
+    # Withholding (Lohnsteuer line 4 vs. gross line 3)
+    {"id": "withholding_ratio_a", "check": "(de_gross_a > 0) & (de_tax_paid_a > 0.45 * de_gross_a)",
+     "message": "Person A: Lohnsteuer is more than 45% of the gross salary. Please check lines 3 and 4."},
+    {"id": "withholding_ratio_b", "check": "(de_gross_b > 0) & (de_tax_paid_b > 0.45 * de_gross_b)",
+     "message": "Person B: Lohnsteuer is more than 45% of the gross salary. Please check lines 3 and 4."},
+    {"id": "withholding_missing_a", "check": "(de_gross_a > 2 * basic_allowance) & (de_tax_paid_a == 0)",
+     "message": "Person A: No Lohnsteuer was entered although the salary is well above the basic allowance."},
+    {"id": "withholding_missing_b", "check": "(de_gross_b > 2 * basic_allowance) & (de_tax_paid_b == 0)",
+     "message": "Person B: No Lohnsteuer was entered although the salary is well above the basic allowance."},
+
+    # Work days and commute
+    {"id": "work_days_a", "check": "office_days_a + ho_days_a > 230",
+     "message": "Person A: Office days plus home office days exceed 230 working days."},
+    {"id": "work_days_b", "check": "office_days_b + ho_days_b > 230",
+     "message": "Person B: Office days plus home office days exceed 230 working days."},
+    {"id": "commute_without_days_a", "check": "(commute_km_a > 0) & (office_days_a == 0)",
+     "message": "Person A: A commute distance was entered but no office days."},
+    {"id": "commute_without_days_b", "check": "(commute_km_b > 0) & (office_days_b == 0)",
+     "message": "Person B: A commute distance was entered but no office days."},
+    {"id": "work_expenses_without_salary_b", "check": "(de_gross_b == 0) & (office_days_b + ho_days_b > 0)",
+     "message": "Person B: Work days were entered but no salary."},
+
+    # Family and household
+    {"id": "married_tax_class_1", "check": "(is_married != 0) & (tax_class == 1)",
+     "message": "You are filing as married but using Tax Class 1. Tax Class 4 (Splitting) is usually more beneficial."},
+    {"id": "single_with_spouse_income", "check": "(is_married == 0) & (de_gross_b > 0)",
+     "message": "Income for Person B was entered, but you are not filing jointly."},
+    {"id": "child_allowance_applied", "check": "(num_kids > 0) & (final_tax_liability > 3000)",
+     "message": "The tool has applied the Child Allowance (Kinderfreibetrag) as it was more beneficial than Kindergeld."},
+    {"id": "kita_without_children", "check": "(kita_costs > 0) & (num_kids == 0)",
+     "message": "Childcare costs were entered, but no children."},
+    {"id": "parents_support_above_max", "check": "parents_support > max_parents_support * supported_persons",
+     "message": "Support to parents exceeds the Unterhalt maximum for parents in India (a quarter of the basic allowance per supported person) and will not be fully deductible."},
+
+    # Indian income
+    {"id": "tds_above_income", "check": "(in_tds_inr > 0) & (in_tds_inr > 0.35 * (in_rent + in_interest + in_salary))",
+     "message": "Indian TDS is more than 35% of the declared Indian income. Please check Form 26AS."},
+]
+
+
+# Input fields whose default is not 0 (see household_store.INPUT_FIELDS)
+FIELD_DEFAULTS = {"supported_persons": 1}
+
+
+def year_limits(year):
+    """
+    Per-year values the rules can refer to: the basic allowance, the Unterhalt
+    maximum per supported person in India and the maximum employee contributions.
+    """
+    caps = TAX_YEAR_CONSTANTS[year]['SOCIAL_SECURITY_CAPS']
+    # Highest possible contributions: salary above both caps, childless nursing rate
+    maximum = estimate_social_security(max(caps.values()) + 1, year, 0)
+    return {
+        "basic_allowance": TAX_YEAR_CONSTANTS[year]['BASIC_ALLOWANCE'],
+        "max_parents_support": TAX_YEAR_CONSTANTS[year]['BASIC_ALLOWANCE'] * constants.UNTERHALT_INDIA_FACTOR,
+        "max_pension": maximum["pension"],
+        "max_health": maximum["health"],
+        "max_nursing": maximum["nursing"],
+        "max_unemployment": maximum["unemployment"],
+    }
+
+
+class _Namespace(dict):
+    """Field mapping passed to the rule predicates; fields that are missing (or None) are 0."""
+
+    def __missing__(self, key):
+        return 0
+
+
+# The only operators a rule expression may use
+_BINARY_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.BitAnd: operator.and_, ast.BitOr: operator.or_,
+}
+_COMPARISONS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+
+
+def _build(node, rule_id):
+    """Turns one node of a parsed rule expression into a function of the namespace."""
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda f: f[name]
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda f: value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        operand = _build(node.operand, rule_id)
+        return lambda f: -operand(f)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        op, left, right = _BINARY_OPERATORS[type(node.op)], _build(node.left, rule_id), _build(node.right, rule_id)
+        return lambda f: op(left(f), right(f))
+    if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in _COMPARISONS:
+        op, left, right = _COMPARISONS[type(node.ops[0])], _build(node.left, rule_id), _build(node.comparators[0], rule_id)
+        return lambda f: op(left(f), right(f))
+    raise ValueError(f"Rule '{rule_id}': unsupported expression '{ast.unparse(node)}'.")
+
+
+def _predicate(rule):
+    try:
+        tree = ast.parse(rule["check"], mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Rule '{rule['id']}': invalid expression '{rule['check']}'.") from e
+    return _build(tree.body, rule["id"])
+
+
+def compile_rules(rules=VALIDATION_RULES):
+    """
+    Parses the rule expressions once. Returns a list of (id, message, predicate).
+
+    Raises:
+        ValueError: If an expression is not valid or uses anything but the
+                    operators listed in the module comment.
+    """
+    return [(rule["id"], rule["message"], _predicate(rule)) for rule in rules]
+
+
+COMPILED_RULES = compile_rules()
+
+
+def evaluate_rules(data, report, rules=COMPILED_RULES):
+    """
+    Runs all rules against one household.
+
+    Args:
+        data (dict): Wizard input.
+        report (dict): Calculated report; its keys take precedence over the input
+                       (e.g. the actual tax class instead of the combo box index).
+
+    Returns:
+        list: The messages of the rules that fired, in rule order.
+    """
+    namespace = _Namespace(FIELD_DEFAULTS)
+    namespace.update({key: value for key, value in data.items() if value is not None})
+    namespace.update(report)
+    year = int(namespace.get("tax_year") or 2024)
+    if year in TAX_YEAR_CONSTANTS:
+        namespace.update(year_limits(year))
+    return [message for _, message, predicate in rules if predicate(namespace)]
+
+
+class WarningMatrix:
+    """
+    Sparse (coordinate format) result of a portfolio screening: one entry per
+    household and rule that fired.
+    """
+
+    def __init__(self, rows, cols, rule_ids, messages, num_rows):
+        self.rows = rows
+        self.cols = cols
+        self.rule_ids = rule_ids
+        self.messages = messages
+        self.shape = (num_rows, len(rule_ids))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def counts(self):
+        """Number of flagged households per rule id."""
+        import numpy as np
+        return dict(zip(self.rule_ids, np.bincount(self.cols, minlength=len(self.rule_ids)).tolist()))
+
+    def households(self, rule_id):
+        """Row indices flagged by one rule."""
+        return self.rows[self.cols == self.rule_ids.index(rule_id)]
+
+    def warnings_for(self, row):
+        """The messages for one household, in rule order."""
+        return [self.messages[col] for col in sorted(self.cols[self.rows == row].tolist())]
+
+    def to_dense(self):
+        import numpy as np
+        dense = np.zeros(self.shape, dtype=bool)
+        dense[self.rows, self.cols] = True
+        return dense
+
+
+def evaluate_rules_batch(inputs, report, rules=COMPILED_RULES):
+    """
+    Runs all rules over a portfolio in one vectorized pass per rule.
+
+    Args:
+        inputs (dict): Input field -> NumPy column (e.g. HouseholdStore.columns()).
+        report (dict): Report key -> column (vectorized.generate_batch_report).
+
+    Returns:
+        WarningMatrix: The fired (household, rule) pairs.
+    """
+    import numpy as np
+    from .vectorized import _year_lookup
+
+    namespace = _Namespace(FIELD_DEFAULTS)
+    namespace.update(inputs)
+    namespace.update(report)
+    num_rows = len(report["tax_year"])
+    limits = {year: year_limits(year) for year in TAX_YEAR_CONSTANTS}
+    for name in limits[next(iter(limits))]:
+        namespace[name] = _year_lookup(report["tax_year"], {y: values[name] for y, values in limits.items()})
+
+    rows, cols = [], []
+    for col, (_, _, predicate) in enumerate(rules):
+        fired = np.broadcast_to(np.asarray(predicate(namespace), dtype=bool), (num_rows,))
+        hits = np.flatnonzero(fired)
+        rows.append(hits)
+        cols.append(np.full(len(hits), col, dtype=np.int32))
+    return WarningMatrix(
+        np.concatenate(rows) if rows else np.empty(0, dtype=np.intp),
+        np.concatenate(cols) if cols else np.empty(0, dtype=np.int32),
+        [rule_id for rule_id, _, _ in rules],
+        [message for _, message, _ in rules],
+        num_rows,
+    )
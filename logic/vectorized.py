@@ -0,0 +1,332 @@
+import numpy as np
+
+from . import constants
+from .constants import TAX_YEAR_CONSTANTS, SOLI_EXEMPTION_LIMITS
+
+# Column-wise (NumPy) versions of the calculation core. Every function here mirrors
+# its scalar counterpart in tax_calculator.py / report_generator.py and must give
+# the same numbers for the same inputs, just for many households at once.
+
+# Soli limit used by calculate_soli for years without an explicit entry.
+DEFAULT_SOLI_LIMIT = 20350
+
+
+def _year_lookup(year, table, default=None):
+    """Maps an array of tax years onto the matching values of a {year: value} table."""
+    year = np.asarray(year)
+    unknown = ~np.isin(year, list(table.keys()))
+    if default is None and unknown.any():
+        missing = int(year[unknown].flat[0])
+        raise ValueError(f"Tax constants for year {missing} are not available.")
+    out = np.full(year.shape, np.nan if default is None else default, dtype=np.float64)
+    for y, value in table.items():
+        out[year == y] = value
+    return out
+
+
+def basic_allowance_array(year):
+    """Returns the basic allowance (Grundfreibetrag) for each entry of `year`."""
+    return _year_lookup(year, {y: c['BASIC_ALLOWANCE'] for y, c in TAX_YEAR_CONSTANTS.items()})
+
+
+def tariff_arrays(year, shape=None):
+    """
+    The tariff table (TAX_YEAR_CONSTANTS[year]['TARIFF']) of each entry of `year`,
+    as {key: array}, broadcast to `shape` if given.
+    """
+    # One year lookup, then a gather per key
+    row = _year_lookup(year, {y: i for i, y in enumerate(TAX_YEAR_CONSTANTS)}).astype(np.intp)
+    tariffs = [c['TARIFF'] for c in TAX_YEAR_CONSTANTS.values()]
+    tables = {key: np.array([t[key] for t in tariffs], dtype=np.float64)[row] for key in tariffs[0]}
+    if shape is not None:
+        tables = {key: np.broadcast_to(values, shape) for key, values in tables.items()}
+    return tables
+
+
+def calculate_german_tax_array(zvE, year, is_married=True):
+    """
+    Vectorized version of tax_calculator.calculate_german_tax.
+
+    Args:
+        zvE (array-like): Taxable income per household.
+        year (int or array-like): Tax year per household.
+        is_married (bool or array-like): Joint assessment flag per household.
+
+    Returns:
+        np.ndarray: The calculated income tax per household.
+    """
+    zvE = np.asarray(zvE, dtype=np.float64)
+    is_married = np.broadcast_to(np.asarray(is_married, dtype=bool), zvE.shape)
+    basic_allowance = np.broadcast_to(basic_allowance_array(year), zvE.shape)
+
+    # Splittingverfahren: halve income and allowance, double the result.
+    zvE = np.where(is_married, zvE / 2, zvE)
+    basic_allowance = np.where(is_married, basic_allowance / 2, basic_allowance)
+
+    t = tariff_arrays(year, zvE.shape)
+    y = (zvE - basic_allowance) / 10000
+    z = (zvE - t['ZONE_1_END']) / 10000
+    tax = np.select(
+        [zvE <= basic_allowance, zvE <= t['ZONE_1_END'], zvE <= t['ZONE_2_END'], zvE <= t['ZONE_3_END']],
+        [
+            0.0,
+            (t['ZONE_1_A'] * y + t['ZONE_1_B']) * y,
+            (t['ZONE_2_A'] * z + t['ZONE_2_B']) * z + t['ZONE_2_C'],
+            t['ZONE_3_RATE'] * zvE - t['ZONE_3_OFFSET'],
+        ],
+        default=t['ZONE_4_RATE'] * zvE - t['ZONE_4_OFFSET'],
+    )
+    return np.where(is_married, tax * 2, tax)
+
+
+def marginal_tax_rate_array(zvE, year, is_married=True):
+    """
+    Analytic derivative d(tax)/d(zvE) of calculate_german_tax, zone by zone.
+
+    Under splitting tax(zvE) = 2 * T(zvE / 2), so the marginal rate is T'(zvE / 2).
+    """
+    zvE = np.asarray(zvE, dtype=np.float64)
+    is_married = np.broadcast_to(np.asarray(is_married, dtype=bool), zvE.shape)
+    basic_allowance = np.broadcast_to(basic_allowance_array(year), zvE.shape)
+
+    zvE = np.where(is_married, zvE / 2, zvE)
+    basic_allowance = np.where(is_married, basic_allowance / 2, basic_allowance)
+
+    t = tariff_arrays(year, zvE.shape)
+    y = (zvE - basic_allowance) / 10000
+    z = (zvE - t['ZONE_1_END']) / 10000
+    return np.select(
+        [zvE <= basic_allowance, zvE <= t['ZONE_1_END'], zvE <= t['ZONE_2_END'], zvE <= t['ZONE_3_END']],
+        [
+            0.0,
+            (2 * t['ZONE_1_A'] * y + t['ZONE_1_B']) / 10000,
+            (2 * t['ZONE_2_A'] * z + t['ZONE_2_B']) / 10000,
+            t['ZONE_3_RATE'],
+        ],
+        default=t['ZONE_4_RATE'],
+    )
+
+
+def tax_curvature_array(zvE, year, is_married=True):
+    """
+    Second derivative d²(tax)/d(zvE)² of calculate_german_tax: constant within a
+    zone (the quadratic term of zones 1 and 2), 0 in the linear zones.
+
+    Under splitting tax(zvE) = 2 * T(zvE / 2), so the curvature is T''(zvE / 2) / 2.
+    """
+    zvE = np.asarray(zvE, dtype=np.float64)
+    is_married = np.broadcast_to(np.asarray(is_married, dtype=bool), zvE.shape)
+    basic_allowance = np.broadcast_to(basic_allowance_array(year), zvE.shape)
+
+    zvE = np.where(is_married, zvE / 2, zvE)
+    basic_allowance = np.where(is_married, basic_allowance / 2, basic_allowance)
+
+    t = tariff_arrays(year, zvE.shape)
+    curvature = np.select(
+        [zvE <= basic_allowance, zvE <= t['ZONE_1_END'], zvE <= t['ZONE_2_END']],
+        [0.0, 2 * t['ZONE_1_A'] / 10000**2, 2 * t['ZONE_2_A'] / 10000**2],
+        default=0.0,
+    )
+    return np.where(is_married, curvature / 2, curvature)
+
+
+def calculate_soli_array(tax_liability, tax_year, is_married):
+    """Vectorized version of tax_calculator.calculate_soli."""
+    tax_liability = np.asarray(tax_liability, dtype=np.float64)
+    limit = _year_lookup(tax_year, SOLI_EXEMPTION_LIMITS, default=DEFAULT_SOLI_LIMIT)
+    limit = np.where(is_married, limit * 2, limit)
+    return np.where(tax_liability <= limit, 0.0, tax_liability * constants.SOLI_RATE)
+
+
+def calculate_single_werbungskosten_array(ho_days, commute_km, office_days, moving_costs=0.0):
+    """Vectorized version of report_generator._calculate_single_werbungskosten."""
+    ho_days = np.asarray(ho_days, dtype=np.float64)
+    commute_km = np.asarray(commute_km, dtype=np.float64)
+    office_days = np.asarray(office_days, dtype=np.float64)
+
+    ho = np.minimum(ho_days * constants.HOME_OFFICE_DAY_RATE, constants.MAX_HOME_OFFICE_DEDUCTION)
+
+    threshold = constants.COMMUTE_ALLOWANCE_THRESHOLD_KM
+    low = commute_km * constants.COMMUTE_ALLOWANCE_LOW_KM * office_days
+    split = (threshold * constants.COMMUTE_ALLOWANCE_LOW_KM * office_days
+             + (commute_km - threshold) * constants.COMMUTE_ALLOWANCE_HIGH_KM * office_days)
+    commute = np.where(commute_km <= threshold, low, split)
+    commute = np.where((commute_km > 0) & (office_days > 0), commute, 0.0)
+
+    wk = np.maximum(constants.WERBUNGSKOSTEN_PAUSCHALE, ho + commute + moving_costs)
+    return ho, commute, wk
+
+
+def calculate_deductions_array(cols, is_married, de_gross_a, de_gross_b):
+    """
+    Vectorized version of report_generator._calculate_deductions.
+
+    `cols` is any mapping of field name -> column (e.g. a HouseholdStore).
+    """
+    results = {}
+
+    # 1. Social Security Contributions (Vorsorgeaufwendungen)
+    results["vorsorge_a"] = cols["de_pension_a"] + cols["de_health_a"] + cols["de_nursing_a"] + cols["de_unemployment_a"]
+    results["vorsorge_b"] = cols["de_pension_b"] + cols["de_health_b"] + cols["de_nursing_b"] + cols["de_unemployment_b"]
+    results["total_vorsorge"] = results["vorsorge_a"] + results["vorsorge_b"]
+
+    # 2. Income-Related Expenses (Werbungskosten)
+    has_a = de_gross_a > 0
+    has_b = is_married & (de_gross_b > 0)
+    for person, active in (("a", has_a), ("b", has_b)):
+        ho, commute, wk_raw = calculate_single_werbungskosten_array(
+            cols[f"ho_days_{person}"], cols[f"commute_km_{person}"], cols[f"office_days_{person}"],
+            cols[f"moving_costs_{person}"]
+        )
+        applied = active & (wk_raw < constants.WERBUNGSKOSTEN_PAUSCHALE)
+        results[f"ho_{person}"] = np.where(active, ho, 0.0)
+        results[f"commute_{person}"] = np.where(active, commute, 0.0)
+        results[f"moving_{person}"] = np.where(active, cols[f"moving_costs_{person}"], 0.0)
+        results[f"wk_{person}"] = np.where(active, np.where(applied, constants.WERBUNGSKOSTEN_PAUSCHALE, wk_raw), 0.0)
+        results[f"pauschale_{person}_applied"] = applied
+
+        # 3. Flat-Rate Deductions, added to the Werbungskosten pool
+        results[f"bank_fee_{person}"] = np.where(
+            active & cols[f"bank_fee_{person}"].astype(bool), constants.BANK_FEE_FLAT_RATE, 0.0
+        )
+        results[f"internet_{person}"] = np.where(active, cols[f"internet_{person}"], 0.0)
+        results[f"wk_{person}"] = results[f"wk_{person}"] + np.where(
+            applied, 0.0, results[f"bank_fee_{person}"] + results[f"internet_{person}"]
+        )
+
+    results["total_wk"] = results["wk_a"] + results["wk_b"]
+    results["total_flat_rates"] = np.zeros_like(results["total_wk"])
+
+    # 4. Other Deductions (Sonderausgaben, außergewöhnliche Belastungen)
+    results["kita_deduction"] = cols["kita_costs"] * constants.KITA_DEDUCTION_RATE
+    results["parents_support_deduction"] = cols["parents_support"]
+    results["other_deductions"] = results["kita_deduction"] + results["parents_support_deduction"]
+
+    # 5. Grand Total
+    results["total_deductions"] = results["total_vorsorge"] + results["total_wk"] + results["other_deductions"]
+    return results
+
+
+def calculate_credits_array(cols):
+    """Vectorized version of report_generator._calculate_credits."""
+    nk_credit = cols["nk_labor"] * constants.NEBENKOSTEN_LABOR_CREDIT_RATE
+    tds_credit_eur = cols["in_tds_inr"] * constants.INR_TO_EUR_RATE
+    return {
+        "nebenkosten_credit": nk_credit,
+        "tds_credit": tds_credit_eur,
+        "total_credits": nk_credit + tds_credit_eur,
+    }
+
+
+def generate_batch_report(cols, deductions=None, credits=None):
+    """
+    Column-wise counterpart of report_generator.generate_full_report.
+
+    Args:
+        cols: Mapping of input field name -> NumPy column, one entry per household
+              (see household_store.INPUT_FIELDS).
+        deductions, credits: Optional precomputed results of calculate_deductions_array /
+              calculate_credits_array for the same inputs (they do not depend on
+              the tax year).
+
+    Returns:
+        dict: Report key -> column of results. Warnings are not part of the batch report.
+    """
+    # 1. Basic Inputs
+    tax_year = np.asarray(cols["tax_year"])
+    de_gross_a = np.asarray(cols["de_gross_a"], dtype=np.float64)
+    de_gross_b = np.asarray(cols["de_gross_b"], dtype=np.float64)
+    total_gross = de_gross_a + de_gross_b
+    total_tax_paid = cols["de_tax_paid_a"] + cols["de_tax_paid_b"]
+
+    is_married = np.asarray(cols["is_married"], dtype=bool)
+    tax_class = np.where(is_married, cols["tax_class"] + 3, 1)
+
+    # 2. Foreign Income (converted to EUR)
+    in_rent_eur = cols["in_rent"] * constants.INR_TO_EUR_RATE
+    in_interest_eur = cols["in_interest"] * constants.INR_TO_EUR_RATE
+    in_salary_eur = cols["in_salary"] * constants.INR_TO_EUR_RATE
+    foreign_income = in_rent_eur + in_interest_eur + in_salary_eur
+
+    # 3. Deductions and Credits
+    if deductions is None:
+        deductions = calculate_deductions_array(cols, is_married, de_gross_a, de_gross_b)
+    if credits is None:
+        credits = calculate_credits_array(cols)
+
+    # 4. Taxable Income (zvE)
+    taxable_income_de = np.maximum(0.0, total_gross - deductions["total_deductions"])
+
+    # 5. Progression Clause (Progressionsvorbehalt)
+    global_income_for_rate = taxable_income_de + foreign_income
+    tax_on_global = calculate_german_tax_array(global_income_for_rate, tax_year, is_married)
+    safe_global = np.where(global_income_for_rate > 0, global_income_for_rate, 1.0)
+    effective_rate = np.where(global_income_for_rate > 0, tax_on_global / safe_global, 0.0)
+
+    # 6. Final Tax Liability
+    final_tax_liability = taxable_income_de * effective_rate
+    soli = calculate_soli_array(final_tax_liability, tax_year, is_married)
+    net_german_tax_due = np.maximum(0.0, final_tax_liability + soli - credits["total_credits"])
+
+    # 7. Final Refund or Payment
+    refund_or_payment = total_tax_paid - net_german_tax_due
+
+    return {
+        "tax_year": tax_year,
+        "de_gross_a": de_gross_a, "de_tax_paid_a": cols["de_tax_paid_a"],
+        "de_gross_b": de_gross_b, "de_tax_paid_b": cols["de_tax_paid_b"],
+        "total_gross": total_gross, "total_tax_paid": total_tax_paid,
+        **deductions,
+        **credits,
+        "taxable_income_de": taxable_income_de,
+        "in_rent_eur": in_rent_eur,
+        "in_interest_eur": in_interest_eur,
+        "in_salary_eur": in_salary_eur,
+        "foreign_income": foreign_income,
+        "global_income_for_rate": global_income_for_rate,
+        "effective_tax_rate": effective_rate,
+        "final_tax_liability": final_tax_liability,
+        "soli": soli,
+        "net_german_tax_due": net_german_tax_due,
+        "refund_or_payment": refund_or_payment,
+        "tax_class": tax_class,
+    }
+
+
+def _nursing_rate_array(num_children):
+    num_children = np.asarray(num_children)
+    reduction = np.clip(num_children - 1, 0, 4) * 0.0025
+    return np.where(num_children == 0, 0.023, 0.017 - reduction)
+
+
+def estimate_social_security_array(gross_salary, year, num_children=0):
+    """Vectorized version of utils.estimate_social_security."""
+    gross_salary = np.asarray(gross_salary, dtype=np.float64)
+    caps = {y: c['SOCIAL_SECURITY_CAPS'] for y, c in TAX_YEAR_CONSTANTS.items()}
+    pension_cap = _year_lookup(year, {y: c['pension'] for y, c in caps.items()})
+    health_cap = _year_lookup(year, {y: c['health'] for y, c in caps.items()})
+    additional_health_rate = _year_lookup(
+        year, {y: c['ADDITIONAL_HEALTH_INSURANCE_RATE'] for y, c in TAX_YEAR_CONSTANTS.items()}
+    )
+
+    pension_base = np.minimum(gross_salary, pension_cap)
+    health_base = np.minimum(gross_salary, health_cap)
+    return {
+        "pension": pension_base * 0.093,
+        "unemployment": pension_base * 0.013,
+        "health": health_base * (0.073 + additional_health_rate / 2),
+        "nursing": health_base * _nursing_rate_array(num_children),
+    }
+
+
+def social_security_marginal_rate_array(gross_salary, year, num_children=0):
+    """Derivative of the total estimate_social_security_array contribution w.r.t. gross salary."""
+    gross_salary = np.asarray(gross_salary, dtype=np.float64)
+    caps = {y: c['SOCIAL_SECURITY_CAPS'] for y, c in TAX_YEAR_CONSTANTS.items()}
+    pension_cap = _year_lookup(year, {y: c['pension'] for y, c in caps.items()})
+    health_cap = _year_lookup(year, {y: c['health'] for y, c in caps.items()})
+    additional_health_rate = _year_lookup(
+        year, {y: c['ADDITIONAL_HEALTH_INSURANCE_RATE'] for y, c in TAX_YEAR_CONSTANTS.items()}
+    )
+    health_rate = 0.073 + additional_health_rate / 2 + _nursing_rate_array(num_children)
+    return np.where(gross_salary < pension_cap, 0.093 + 0.013, 0.0) + np.where(gross_salary < health_cap, health_rate, 0.0)
@@ -1,15 +1,21 @@
 import sys
-from PyQt6.QtWidgets import QApplication, QWizard
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWizard, QInputDialog, QMessageBox
 
+from logic.sessions import SessionStore
+from ui.workspace import WorkspaceDialog
 from ui.pages import (
-    IntroPage, PersonalFamilyPage, GermanIncomePage, 
-    IndianIncomePage, DeductionsPage, ResultPage
+    IntroPage, PersonalFamilyPage, GermanIncomePage,
+    IndianIncomePage, DeductionsPage, ResultPage, SESSION_FIELD_NAMES
 )
 
 class TaxApp(QWizard):
     """
     Main application window, a QWizard that guides the user through tax-related pages.
     """
+    # Emitted from the session-save thread; delivered on the GUI thread
+    session_save_failed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         # Add all the UI pages to the wizard in the correct order
@@ -19,10 +25,68 @@ class TaxApp(QWizard):
         self.addPage(IndianIncomePage())
         self.addPage(DeductionsPage())
         self.addPage(ResultPage())
-        
+
+        # Session persistence: save / reopen the wizard state per client
+        self.sessions = SessionStore()
+        self.setButtonText(QWizard.WizardButton.CustomButton1, "Save Session")
+        self.setButtonText(QWizard.WizardButton.CustomButton2, "Open Session")
+        self.setButtonText(QWizard.WizardButton.CustomButton3, "Workspace")
+        self.setOption(QWizard.WizardOption.HaveCustomButton1, True)
+        self.setOption(QWizard.WizardOption.HaveCustomButton2, True)
+        self.setOption(QWizard.WizardOption.HaveCustomButton3, True)
+        self.customButtonClicked.connect(self._on_custom_button)
+        self.session_save_failed.connect(self._on_session_save_failed, Qt.ConnectionType.QueuedConnection)
+
         self.setWindowTitle("Indo-German Expat Tax Tool")
         self.resize(800, 700)
 
+    def _on_custom_button(self, which):
+        if which == QWizard.WizardButton.CustomButton1.value:
+            self.save_session()
+        elif which == QWizard.WizardButton.CustomButton2.value:
+            self.open_session()
+        elif which == QWizard.WizardButton.CustomButton3.value:
+            self.open_workspace()
+
+    def save_session(self):
+        name, ok = QInputDialog.getText(self, "Save Session", "Client name:")
+        if not ok or not name.strip():
+            return
+        state = {field: self.field(field) for field in SESSION_FIELD_NAMES}
+        # Written on a background thread so the UI does not stall
+        future = self.sessions.save_async(name, state)
+        future.add_done_callback(self._on_session_saved)
+
+    def _on_session_saved(self, future):
+        # Runs on the save thread: only hand the error over to the GUI thread
+        error = future.exception()
+        if error is not None:
+            self.session_save_failed.emit(str(error))
+
+    def _on_session_save_failed(self, message):
+        QMessageBox.warning(self, "Save Session", f"The session could not be saved:\n{message}")
+
+    def open_session(self):
+        clients = self.sessions.clients()
+        if not clients:
+            QMessageBox.information(self, "Open Session", "There are no saved sessions yet.")
+            return
+        labels = [f"{c['name']} ({c['tax_year']})" for c in clients]
+        label, ok = QInputDialog.getItem(self, "Open Session", "Client:", labels, 0, False)
+        if not ok:
+            return
+        state = self.sessions.load(clients[labels.index(label)]["client_id"])
+        for name in SESSION_FIELD_NAMES:
+            if state.get(name) is not None:
+                self.setField(name, state[name])
+
+    def open_workspace(self):
+        WorkspaceDialog(self.sessions, self).exec()
+
+    def closeEvent(self, event):
+        self.sessions.close()
+        super().closeEvent(event)
+
 def main():
     """
     Main function to initialize and run the PyQt application.
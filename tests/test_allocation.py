@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.report_generator import generate_full_report
+
+# A is above the Werbungskosten-Pauschale through the commute, B is below it
+HOUSEHOLD = {
+    "is_married": True, "tax_class": 1, "tax_year": 2025,
+    "de_gross_a": 70000, "de_tax_paid_a": 14000, "commute_km_a": 40, "office_days_a": 180, "ho_days_a": 40,
+    "de_gross_b": 30000, "de_tax_paid_b": 3000, "ho_days_b": 150,
+    "internet_b": 400, "bank_fee_b": True,
+}
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestAllocation(unittest.TestCase):
+
+    def test_moves_days_to_spouse_above_pauschale(self):
+        from logic.allocation import optimize_allocation
+        result = optimize_allocation(HOUSEHOLD)
+        allocation = result["allocation"]
+        # A can take at most 230 - 180 office days = 50 home office days
+        self.assertEqual(allocation["ho_days_a"], 50)
+        self.assertEqual(allocation["ho_days_a"] + allocation["ho_days_b"], 190)
+        # Items that make no difference stay where they were entered
+        self.assertEqual(allocation["internet_b"], 400)
+        self.assertTrue(allocation["bank_fee_b"])
+
+        entered = generate_full_report(HOUSEHOLD)["net_german_tax_due"]
+        optimized = generate_full_report(dict(HOUSEHOLD, **allocation))["net_german_tax_due"]
+        self.assertAlmostEqual(result["net_german_tax_due"], optimized, places=6)
+        self.assertAlmostEqual(result["saving"], entered - optimized, places=6)
+        self.assertGreater(result["saving"], 0)
+
+    def test_candidates_respect_caps(self):
+        from logic.allocation import allocation_candidates, MAX_HOME_OFFICE_DAYS
+        candidates = allocation_candidates(dict(HOUSEHOLD, ho_days_a=200, ho_days_b=200, office_days_a=0))
+        self.assertTrue((candidates["ho_days_a"][1:] <= MAX_HOME_OFFICE_DAYS).all())
+        self.assertTrue((candidates["ho_days_b"][1:] <= MAX_HOME_OFFICE_DAYS).all())
+        self.assertTrue(np.allclose(candidates["internet_a"] + candidates["internet_b"], 400))
+
+    def test_single_household_unchanged(self):
+        from logic.allocation import optimize_allocation
+        single = dict(HOUSEHOLD, is_married=False)
+        result = optimize_allocation(single)
+        self.assertEqual(result["candidates"], 1)
+        self.assertEqual(result["saving"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
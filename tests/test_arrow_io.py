@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    import pyarrow
+except ImportError:
+    np = pyarrow = None
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestArrowIO(unittest.TestCase):
+
+    def setUp(self):
+        from logic.household_store import HouseholdStore
+        self.tmpdir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(11)
+        n = 2500
+        self.store = HouseholdStore({
+            "tax_year": rng.choice([2024, 2025, 2026], n),
+            "is_married": rng.random(n) < 0.5,
+            "de_gross_a": rng.uniform(10000, 150000, n),
+            "de_tax_paid_a": rng.uniform(0, 30000, n),
+            "ho_days_a": rng.integers(0, 200, n).astype(float),
+            "in_rent": rng.uniform(0, 300000, n),
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_compute_parquet_in_row_groups(self):
+        """Results are streamed one row group per batch and match the in-memory batch run."""
+        import pyarrow.parquet as pq
+        from logic.arrow_io import write_columns, compute_file
+        columns = {"client_id": np.arange(len(self.store)), **self.store.columns()}
+        write_columns(self.path("in.parquet"), columns)
+        stats = compute_file(self.path("in.parquet"), self.path("out.parquet"), batch_size=1000)
+        self.assertEqual((stats["rows"], stats["batches"]), (2500, 3))
+
+        out = pq.ParquetFile(self.path("out.parquet"))
+        self.assertEqual(out.num_row_groups, 3)
+        table = out.read()
+        self.assertEqual(table.schema.names[0], "client_id")
+        expected = self.store.calculate()
+        np.testing.assert_allclose(table.column("refund_or_payment").to_numpy(), expected["refund_or_payment"])
+        np.testing.assert_array_equal(table.column("client_id").to_numpy(), np.arange(2500))
+
+    def test_report_names_are_not_duplicated(self):
+        """A source column named like a report column is not copied next to it."""
+        import pyarrow.parquet as pq
+        from logic.arrow_io import write_columns, compute_file
+        columns = {"client_id": np.arange(len(self.store)), "total_gross": np.zeros(len(self.store)),
+                   **self.store.columns()}
+        write_columns(self.path("in.parquet"), columns)
+        compute_file(self.path("in.parquet"), self.path("out.parquet"))
+        names = pq.read_schema(self.path("out.parquet")).names
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(names[0], "client_id")
+        with self.assertRaises(ValueError):
+            compute_file(self.path("in.parquet"), self.path("out2.parquet"), keep=["total_gross"])
+
+    def test_empty_source(self):
+        """An empty source gives an empty output with the report columns."""
+        import pyarrow.parquet as pq
+        from logic.arrow_io import write_columns, compute_file
+        empty = {"client_id": np.empty(0, dtype=np.int64), **{k: v[:0] for k, v in self.store.columns().items()}}
+        write_columns(self.path("in.arrow"), empty)
+        stats = compute_file(self.path("in.arrow"), self.path("out.parquet"))
+        self.assertEqual(stats["rows"], 0)
+        table = pq.read_table(self.path("out.parquet"))
+        self.assertEqual(table.num_rows, 0)
+        self.assertIn("refund_or_payment", table.schema.names)
+        self.assertEqual(table.schema.names[0], "client_id")
+
+    def test_write_format(self):
+        """The written format comes from the extension or format=, never from a missing file."""
+        from logic.arrow_io import write_columns, file_format
+        columns = self.store.columns()
+        write_columns(self.path("out.bin"), columns, format="ipc")
+        self.assertEqual(file_format(self.path("out.bin")), "ipc")
+        with self.assertRaises(ValueError):
+            write_columns(self.path("out.dat"), columns)
+
+    def test_arrow_ipc_and_missing_fields(self):
+        """IPC input is read memory-mapped; absent fields and nulls take the defaults."""
+        import pyarrow as pa
+        from logic.arrow_io import read_columns, file_format
+        table = pa.table({
+            "tax_year": pa.array([2025, 2025], type=pa.int64()),
+            "de_gross_a": pa.array([50000.0, None]),
+        })
+        path = self.path("in.data")
+        with pa.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+        self.assertEqual(file_format(path), "ipc")
+        columns = read_columns(path)
+        self.assertEqual(columns["de_gross_a"].tolist(), [50000.0, 0.0])
+        self.assertEqual(columns["is_married"].dtype, np.bool_)
+        self.assertEqual(columns["tax_year"].dtype, np.int16)
+
+    def test_unknown_format(self):
+        from logic.arrow_io import file_format
+        with open(self.path("in.csv"), "w") as f:
+            f.write("tax_year\n2025\n")
+        with self.assertRaises(ValueError):
+            file_format(self.path("in.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
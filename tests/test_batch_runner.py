@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.batch_runner import recompute_clients, report_file_path
+from logic.report_generator import generate_full_report
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.households = {
+            f"client_{i}": {"tax_year": "2025", "de_gross_a": 40000 + 1000 * i, "de_tax_paid_a": 8000}
+            for i in range(6)
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_writes_one_file_per_client(self):
+        """Every client gets its own report file and progress reaches the total."""
+        updates = []
+        results, failures = recompute_clients(
+            self.households, self.tmpdir.name, max_workers=2,
+            progress=lambda done, total: updates.append((done, total)),
+        )
+        self.assertEqual(set(results), set(self.households))
+        self.assertEqual(failures, {})
+        self.assertEqual(updates[-1], (6, 6))
+        for client_id, data in self.households.items():
+            self.assertTrue(os.path.exists(report_file_path(self.tmpdir.name, client_id)))
+            self.assertAlmostEqual(
+                results[client_id]["refund_or_payment"], generate_full_report(data)["refund_or_payment"]
+            )
+
+    def test_cancel_stops_early(self):
+        """A set cancel event stops collecting results."""
+        cancel = threading.Event()
+        cancel.set()
+        results, failures = recompute_clients(self.households, self.tmpdir.name, max_workers=1, cancel_event=cancel)
+        self.assertEqual(results, {})
+        self.assertEqual(failures, {})
+
+    def test_failing_client_does_not_stop_the_others(self):
+        """A client the core rejects is reported as a failure next to the other results."""
+        households = dict(self.households, bad={"tax_year": "2030", "de_gross_a": 50000})
+        updates = []
+        results, failures = recompute_clients(
+            households, self.tmpdir.name, max_workers=2,
+            progress=lambda done, total: updates.append((done, total)),
+        )
+        self.assertEqual(set(results), set(self.households))
+        self.assertEqual(list(failures), ["bad"])
+        self.assertIn("ValueError", failures["bad"])
+        self.assertEqual(updates[-1], (7, 7))
+        self.assertFalse(os.path.exists(report_file_path(self.tmpdir.name, "bad")))
+
+
+if __name__ == '__main__':
+    unittest.main()
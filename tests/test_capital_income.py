@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.report_generator import generate_full_report
+from logic.capital_income import (
+    match_lots, realized_gains_by_year, allocate_sparer_pauschbetrag,
+    calculate_capital_income_tax, read_trades_csv
+)
+
+
+class TestCapitalIncome(unittest.TestCase):
+
+    def test_fifo_matching(self):
+        """Sells consume the oldest lots first, including partial lots."""
+        trades = [
+            {"date": "2024-01-10", "symbol": "ETF", "side": "buy", "quantity": 10, "price": 100.0},
+            {"date": "2024-03-10", "symbol": "ETF", "side": "buy", "quantity": 10, "price": 120.0},
+            {"date": "2024-06-10", "symbol": "ETF", "side": "sell", "quantity": 15, "price": 130.0, "fees": 5.0},
+        ]
+        sale = list(match_lots(trades))[0]
+        self.assertAlmostEqual(sale["cost_basis"], 10 * 100 + 5 * 120)
+        self.assertAlmostEqual(sale["gain"], 15 * 130 - 5 - 1600)
+
+    def test_unsorted_input_and_overselling(self):
+        trades = [
+            {"date": "2025-02-01", "symbol": "X", "side": "sell", "quantity": 1, "price": 50.0},
+            {"date": "2024-12-01", "symbol": "X", "side": "buy", "quantity": 1, "price": 40.0},
+        ]
+        self.assertEqual(realized_gains_by_year(trades, presorted=False), {2025: 10.0})
+        with self.assertRaises(ValueError):
+            list(match_lots(trades))
+
+    def test_trades_from_csv(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trades.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("date,symbol,side,quantity,price,fees\n"
+                        "2024-01-02,ABC,Buy,4,10,1\n2024-05-02,ABC,Sell,4,12,1\n")
+            self.assertAlmostEqual(realized_gains_by_year(read_trades_csv(path))[2024], 48 - 1 - 41)
+
+    def test_invalid_quantity_or_price(self):
+        """A zero quantity or a negative price is a ValueError naming the trade, not a ZeroDivisionError."""
+        for quantity, price in ((0, 10.0), (-1, 10.0), (1, -10.0)):
+            trade = {"date": "2024-01-10", "symbol": "ETF", "side": "buy", "quantity": quantity, "price": price}
+            with self.assertRaisesRegex(ValueError, "2024-01-10"):
+                list(match_lots([trade]))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trades.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("date,symbol,side,quantity,price\n2024-01-02,ABC,Buy,4,10\n2024-01-03,ABC,Buy,0,10\n")
+            with self.assertRaisesRegex(ValueError, "line 3"):
+                list(read_trades_csv(path))
+
+    def test_sparer_pauschbetrag_transfer_between_spouses(self):
+        allocation = allocate_sparer_pauschbetrag(1500.0, 200.0, is_married=True)
+        self.assertEqual(allocation["allowance_a"], 1500.0)
+        self.assertEqual(allocation["allowance_b"], 200.0)
+        self.assertEqual(allocation["taxable_a"], 0.0)
+
+        single = allocate_sparer_pauschbetrag(1500.0, 200.0, is_married=False)
+        self.assertEqual(single["taxable_a"], 500.0)
+        self.assertEqual(single["allowance_b"], 0.0)
+
+    def test_guenstigerpruefung(self):
+        """Low earners are better off with the tariff, high earners with the flat tax."""
+        low = generate_full_report({"tax_year": "2024", "de_gross_a": 14000})
+        result = calculate_capital_income_tax(low, 3000.0)
+        self.assertTrue(result["guenstigerpruefung_applied"])
+        self.assertLess(result["capital_income_tax"], result["abgeltungsteuer"])
+
+        high = generate_full_report({"tax_year": "2024", "de_gross_a": 150000})
+        result = calculate_capital_income_tax(high, 3000.0)
+        self.assertFalse(result["guenstigerpruefung_applied"])
+        self.assertAlmostEqual(result["capital_income_tax"], 2000 * 0.25 * 1.055)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic import constants
+
+
+def _portfolio(n=5000, seed=3):
+    from logic.household_store import HouseholdStore
+    rng = np.random.default_rng(seed)
+    married = rng.random(n) < 0.5
+    return HouseholdStore({
+        "tax_year": rng.choice([2024, 2025, 2026], n),
+        "is_married": married,
+        "de_gross_a": rng.uniform(0, 160000, n),
+        "de_tax_paid_a": rng.uniform(0, 30000, n) * (rng.random(n) < 0.9),
+        "de_gross_b": np.where(married, rng.uniform(0, 100000, n), 0.0),
+        "de_pension_a": rng.uniform(0, 10000, n),
+        "de_health_a": rng.uniform(0, 6500, n),
+        "de_nursing_a": rng.uniform(0, 1700, n),
+        "commute_km_a": rng.integers(0, 60, n).astype(float),
+        "office_days_a": rng.integers(0, 230, n).astype(float),
+        "ho_days_a": rng.integers(0, 230, n).astype(float),
+        "bank_fee_a": rng.random(n) < 0.5,
+        "kita_costs": rng.uniform(0, 4000, n) * (rng.random(n) < 0.2),
+        "in_rent": rng.uniform(0, 500000, n) * (rng.random(n) < 0.3),
+        "parents_support": rng.uniform(0, 15000, n) * (rng.random(n) < 0.1),
+    })
+
+
+def _results(store):
+    """Report columns plus the fired warnings of a portfolio, for comparison."""
+    report = store.calculate()
+    keys = ("net_german_tax_due", "refund_or_payment", "total_deductions", "soli")
+    values = np.column_stack([report[key] for key in keys])
+    return values, store.validate(report).to_dense()
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestDependencyIndex(unittest.TestCase):
+
+    def setUp(self):
+        from logic.dependency_index import DependencyIndex
+        self.store = _portfolio()
+        self.index = DependencyIndex.build(self.store)
+        self.before = _results(self.store)
+
+    def assertCovers(self, changes, patcher):
+        """Every household whose result changes under the patch is in the affected set."""
+        affected = self.index.affected(changes)
+        with patcher:
+            values, warnings = _results(self.store)
+        changed = (np.abs(values - self.before[0]) > 1e-6).any(axis=1) | (warnings != self.before[1]).any(axis=1)
+        self.assertTrue(changed.any())
+        self.assertFalse((changed & ~affected).any())
+        self.assertLess(affected.sum(), len(self.store))
+        return affected, changed
+
+    def test_commute_high_rate_only_long_commutes(self):
+        affected, changed = self.assertCovers(
+            {"COMMUTE_ALLOWANCE_HIGH_KM": (0.38, 0.40)},
+            mock.patch.object(constants, "COMMUTE_ALLOWANCE_HIGH_KM", 0.40),
+        )
+        km = self.store["commute_km_a"]
+        self.assertFalse(affected[km <= constants.COMMUTE_ALLOWANCE_THRESHOLD_KM].any())
+
+    def test_commute_threshold(self):
+        self.assertCovers(
+            {"COMMUTE_ALLOWANCE_THRESHOLD_KM": (20, 15)},
+            mock.patch.object(constants, "COMMUTE_ALLOWANCE_THRESHOLD_KM", 15),
+        )
+
+    def test_soli_limit(self):
+        affected, changed = self.assertCovers(
+            {"SOLI_EXEMPTION_LIMITS.2025": (19450, 25000)},
+            mock.patch.dict(constants.SOLI_EXEMPTION_LIMITS, {2025: 25000}),
+        )
+        self.assertFalse(affected[self.store["tax_year"] != 2025].any())
+
+    def test_health_cap(self):
+        caps = dict(constants.TAX_YEAR_CONSTANTS[2025]["SOCIAL_SECURITY_CAPS"], health=60000)
+        self.assertCovers(
+            {"TAX_YEAR_CONSTANTS.2025.SOCIAL_SECURITY_CAPS.health": (66150, 60000)},
+            mock.patch.dict(constants.TAX_YEAR_CONSTANTS[2025], {"SOCIAL_SECURITY_CAPS": caps}),
+        )
+
+    def test_basic_allowance(self):
+        self.assertCovers(
+            {"TAX_YEAR_CONSTANTS.2024.BASIC_ALLOWANCE": (11784, 12500)},
+            mock.patch.dict(constants.TAX_YEAR_CONSTANTS[2024], {"BASIC_ALLOWANCE": 12500}),
+        )
+
+    def test_unterhalt_factor(self):
+        affected, _ = self.assertCovers(
+            {"UNTERHALT_INDIA_FACTOR": (0.25, 0.5)},
+            mock.patch.object(constants, "UNTERHALT_INDIA_FACTOR", 0.5),
+        )
+        self.assertFalse(affected[self.store["parents_support"] == 0].any())
+
+    def test_soli_rate(self):
+        self.assertCovers({"SOLI_RATE": (0.055, 0.06)}, mock.patch.object(constants, "SOLI_RATE", 0.06))
+
+    def test_pauschale_and_home_office_cap(self):
+        self.assertCovers(
+            {"WERBUNGSKOSTEN_PAUSCHALE": (1230.0, 1500.0), "MAX_HOME_OFFICE_DEDUCTION": (1260.0, 1000.0)},
+            mock.patch.multiple(constants, WERBUNGSKOSTEN_PAUSCHALE=1500.0, MAX_HOME_OFFICE_DEDUCTION=1000.0),
+        )
+
+    def test_diff_constants_and_unused(self):
+        from logic.dependency_index import flatten_constants, diff_constants
+        before = flatten_constants()
+        self.assertIn("TAX_YEAR_CONSTANTS.2025.SOCIAL_SECURITY_CAPS.health", before)
+        with mock.patch.object(constants, "INTERNET_PHONE_FLAT_RATE", 300.0):
+            changes = diff_constants(before, flatten_constants())
+        self.assertEqual(changes, {"INTERNET_PHONE_FLAT_RATE": (240.0, 300.0)})
+        self.assertEqual(len(self.index.households(changes)), 0)
+        # Unknown constants recompute everything
+        self.assertTrue(self.index.affected({"NEW_RULE": (None, 1.0)}).all())
+
+    def test_touched_records_branches(self):
+        touched = self.index.touched()
+        long_commute = (self.store["commute_km_a"] > 20) & (self.store["office_days_a"] > 0) & (self.store["de_gross_a"] > 0)
+        np.testing.assert_array_equal(touched["COMMUTE_ALLOWANCE_HIGH_KM"], long_commute)
+        row = int(np.flatnonzero(long_commute)[0])
+        self.assertIn("COMMUTE_ALLOWANCE_HIGH_KM", self.index.touched_by(row))
+
+
+if __name__ == "__main__":
+    unittest.main()
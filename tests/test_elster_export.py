@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+from logic.report_generator import generate_full_report
+from logic.elster_export import iter_elster_xml, write_elster_xml, validate_elster_xml
+
+
+class TestElsterExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "export.xml")
+        self.report = generate_full_report({
+            "tax_year": "2024", "is_married": True, "tax_class": 1,
+            "de_gross_a": 70000, "de_tax_paid_a": 12000, "de_gross_b": 30000,
+            "in_interest": 10000, "parents_support": 2400,
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_streamed_document(self):
+        """The document is produced chunk by chunk, one block per return."""
+        chunks = list(iter_elster_xml([("1", self.report), ("2", self.report)]))
+        xml = "".join(chunks)
+        self.assertEqual(xml.count("<Nutzdatenblock>"), 2)
+        self.assertIn('<Anlage name="Anlage Unterhalt">', xml)
+        self.assertIn(f">{self.report['de_gross_a']:.2f}</Feld>", xml)
+
+    @unittest.skipIf(lxml is None, "lxml is not installed")
+    def test_export_validates_against_bundled_schema(self):
+        count = write_elster_xml(((str(i), self.report) for i in range(50)), self.path)
+        self.assertEqual(count, 50)
+        self.assertEqual(validate_elster_xml(self.path), 50)
+
+    @unittest.skipIf(lxml is None, "lxml is not installed")
+    def test_invalid_document_is_rejected(self):
+        write_elster_xml([("1", self.report)], self.path)
+        with open(self.path, encoding="utf-8") as f:
+            xml = f.read()
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(xml.replace('Jahr="2024"', 'Jahr="last year"'))
+        with self.assertRaises(ValueError):
+            validate_elster_xml(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
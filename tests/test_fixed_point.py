@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.tax_calculator import calculate_german_tax, calculate_soli
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestFixedPoint(unittest.TestCase):
+
+    def setUp(self):
+        from logic import fixed_point
+        self.fp = fixed_point
+        rng = random.Random(7)
+        # Even cent amounts so that halving for splitting is exact in both paths
+        self.samples = [(2 * rng.randint(0, 20_000_000), rng.choice([2024, 2025, 2026]), rng.random() < 0.5)
+                        for _ in range(5000)]
+
+    def test_agrees_with_float_path_within_one_cent(self):
+        for cents, year, married in self.samples:
+            exact = self.fp.calculate_german_tax_cents(cents, year, married, statutory=False)
+            self.assertLessEqual(abs(exact - calculate_german_tax(cents / 100, year, married) * 100), 1.01)
+
+    def test_statutory_rounding(self):
+        """zvE and tax are floored to full euros, the Soli to cents."""
+        tax = self.fp.calculate_german_tax_cents(5_000_099, 2024, False)
+        self.assertEqual(tax % 100, 0)
+        self.assertEqual(tax, self.fp.calculate_german_tax_cents(5_000_000, 2024, False))
+        self.assertLessEqual(abs(tax - int(calculate_german_tax(50000, 2024, False)) * 100), 100)
+
+        soli = self.fp.calculate_soli_cents(2_000_000, 2024, False)
+        self.assertEqual(soli, 110_000)
+        self.assertLessEqual(abs(soli - calculate_soli(20000.0, 2024, False) * 100), 1)
+
+    def test_array_matches_scalar(self):
+        cents = np.array([c for c, _, _ in self.samples], dtype=np.int64)
+        years = np.array([y for _, y, _ in self.samples])
+        married = np.array([m for _, _, m in self.samples])
+        for statutory in (True, False):
+            array_result = self.fp.calculate_german_tax_cents_array(cents, years, married, statutory)
+            scalar_result = [self.fp.calculate_german_tax_cents(c, y, m, statutory) for c, y, m in self.samples]
+            self.assertEqual(array_result.tolist(), scalar_result)
+
+    def test_liability_with_progression(self):
+        scalar = self.fp.calculate_liability_cents(6_000_000, 1_000_000, 2025, False)
+        array = self.fp.calculate_liability_cents_array(np.array([6_000_000]), np.array([1_000_000]), 2025, False)
+        self.assertEqual(scalar["final_tax_liability"], int(array["final_tax_liability"][0]))
+        self.assertEqual(scalar["final_tax_liability"] % 100, 0)
+
+        tax_on_global = calculate_german_tax(70000.0, 2025, False)
+        expected = 60000.0 * tax_on_global / 70000.0
+        loose = self.fp.calculate_liability_cents(6_000_000, 1_000_000, 2025, False, statutory=False)
+        self.assertLessEqual(abs(loose["final_tax_liability"] - expected * 100), 2)
+
+    def test_unknown_year(self):
+        with self.assertRaises(ValueError):
+            self.fp.calculate_german_tax_cents(100, 2023, False)
+
+
+if __name__ == '__main__':
+    unittest.main()
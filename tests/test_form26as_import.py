@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from datetime import date
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import constants
+from logic.form26as_import import (
+    iter_statement_entries, aggregate_statement, to_wizard_fields, import_statements,
+    categorize, parse_amount, _iter_json
+)
+
+TRACES_TEXT = """Annual Tax Statement under Section 203AA
+PART-A - Details of Tax Deducted at Source
+
+Sr. No.^Name of Deductor^TAN of Deductor^^^^^Total Amount Paid / Credited^Total Tax Deducted^Total TDS Deposited
+1^STATE BANK OF INDIA^MUMS12345A^^^^^30,000.00^3,000.00^3,000.00
+
+Sr. No.^Section^Transaction Date^Status of Booking^Date of Booking^Remarks^Amount Paid / Credited^Tax Deducted^TDS Deposited
+1^194A^31-Mar-2024^F^15-May-2024^-^10,000.00^1,000.00^1,000.00
+2^194A^30-Sep-2024^F^15-Nov-2024^-^20,000.00^2,000.00^2,000.00
+3^194IB^15-Oct-2024^F^15-Nov-2024^-^1,20,000.00^6,000.00^6,000.00
+^^^^^^1,50,000.00^9,000.00^9,000.00
+"""
+
+
+class TestForm26ASImport(unittest.TestCase):
+
+    def _write(self, folder, name, content):
+        path = os.path.join(folder, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_traces_text_export(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = self._write(folder, "26AS.txt", TRACES_TEXT)
+            entries = list(iter_statement_entries(path))
+        # The summary table has no transaction dates and the total row is skipped
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[2]["date"], date(2024, 10, 15))
+        self.assertEqual(entries[2]["amount_inr"], 120000.0)
+
+        totals = aggregate_statement(entries, tax_year=2024)
+        self.assertEqual(totals["interest"]["income_inr"], 30000.0)
+        self.assertEqual(totals["rent"]["tds_inr"], 6000.0)
+
+    def test_per_transaction_fx(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = self._write(folder, "ais.csv",
+                               "Section,Transaction Date,Amount,TDS\n"
+                               "194A,2024-03-31,10000,1000\n"
+                               "194A,2024-09-30,10000,1000\n"
+                               "194A,2023-12-31,99999,0\n")
+            rates = {"2024-03": 0.010, "2024-09-30": 0.012}
+            fields = import_statements([path], 2024, rates)
+        expected_eur = 10000 * 0.010 + 10000 * 0.012
+        self.assertAlmostEqual(fields["in_interest"] * constants.INR_TO_EUR_RATE, expected_eur)
+        self.assertAlmostEqual(fields["in_tds_inr"] * constants.INR_TO_EUR_RATE, expected_eur / 10)
+        self.assertNotIn("in_rent", fields)
+
+    def test_json_array_streamed_in_small_chunks(self):
+        objs = [{"Information Description": "Rent received", "Date": "01/0%d/2024" % m, "Amount": 5000}
+                for m in range(1, 10)]
+        streamed = list(_iter_json(io.StringIO(json.dumps(objs, indent=1)), chunk_size=16))
+        self.assertEqual(streamed, objs)
+        lines = "\n".join(json.dumps(obj) for obj in objs)
+        self.assertEqual(list(_iter_json(io.StringIO(lines), chunk_size=7)), objs)
+        with self.assertRaises(ValueError):
+            list(_iter_json(io.StringIO('[{"a": 1}, {"b"'), chunk_size=4))
+
+    def test_categories_and_amounts(self):
+        self.assertEqual(categorize("194I(a)"), "rent")
+        self.assertEqual(categorize("194I(b)"), "rent")
+        self.assertEqual(categorize("194-I (a)"), "rent")
+        self.assertEqual(categorize("194IB"), "rent")
+        self.assertEqual(categorize("195", "Interest from deposit"), "interest")
+        self.assertEqual(categorize("194IA"), "other")
+        self.assertEqual(parse_amount("1,23,456.50"), 123456.5)
+        self.assertEqual(parse_amount("-"), 0.0)
+        fields = to_wizard_fields({"other": {"income_eur": 100.0, "tds_eur": 10.0}})
+        self.assertEqual(fields, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.report_generator import generate_full_report
+from logic.form_mapping import (
+    get_form_mapping, get_form_mappings, update_form_mapping, build_rule_index, RULE_INDEX
+)
+
+
+class TestFormMapping(unittest.TestCase):
+
+    def setUp(self):
+        self.report = generate_full_report({
+            "tax_year": "2025", "is_married": False,
+            "de_gross_a": 60000, "de_tax_paid_a": 11000, "de_pension_a": 5580,
+            "ho_days_a": 200, "commute_km_a": 30, "office_days_a": 30,
+            "in_rent": 100000, "in_interest": 20000, "in_tds_inr": 2000, "kita_costs": 3000,
+        })
+
+    def test_single_report(self):
+        instructions = get_form_mapping(self.report)
+        lines = [(i["form"], i["line"]) for i in instructions]
+        self.assertIn(("Anlage N (Person A)", "Line 3 (Bruttoarbeitslohn)"), lines)
+        self.assertIn(("Anlage N (Person A)", "Lines 31-87 (Werbungskosten)"), lines)
+        self.assertIn(("Anlage AUS", "Table 1"), lines)
+        self.assertNotIn(("Anlage N (Person B)", "Line 3 (Bruttoarbeitslohn)"), lines)
+
+        kita = next(i for i in instructions if i["form"] == "Anlage Kind")
+        self.assertAlmostEqual(kita["amount"], 3000.0)
+
+    def test_pauschale_only_is_not_listed(self):
+        report = generate_full_report({"de_gross_a": 40000})
+        lines = [i["line"] for i in get_form_mapping(report)]
+        self.assertNotIn("Lines 31-87 (Werbungskosten)", lines)
+
+    def test_incremental_update_matches_full_mapping(self):
+        state = {}
+        update_form_mapping(state, self.report, RULE_INDEX.keys())
+        changed = dict(self.report, in_rent_eur=0.0, de_gross_b=1000.0)
+        result = update_form_mapping(state, changed, ["in_rent_eur", "de_gross_b"])
+        self.assertEqual(result, get_form_mapping(changed))
+
+    def test_bulk_and_invalid_rule(self):
+        results = list(get_form_mappings([self.report, self.report]))
+        self.assertEqual(results[0], results[1])
+        with self.assertRaises(ValueError):
+            build_rule_index([{"key": "x", "form": "f", "line": "l", "note": "", "condition": "sometimes"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.report_generator import generate_full_report
+from logic.utils import estimate_social_security
+
+
+def _household_with_gross(base, gross):
+    ss = estimate_social_security(gross, int(base["tax_year"]), base.get("num_kids", 0))
+    return {
+        **base, "de_gross_a": gross,
+        "de_pension_a": ss["pension"], "de_health_a": ss["health"],
+        "de_nursing_a": ss["nursing"], "de_unemployment_a": ss["unemployment"],
+    }
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestGrossUp(unittest.TestCase):
+
+    def setUp(self):
+        self.base = {
+            "tax_year": 2025, "is_married": False, "tax_class": 0,
+            "in_rent": 500000, "commute_km_a": 15, "office_days_a": 150,
+        }
+
+    def test_gross_for_target_net(self):
+        """The solved gross reproduces the target net in the scalar report."""
+        from logic.gross_up import solve_gross_for_net
+        targets = [30000, 45000, 60000, 90000]
+        gross = solve_gross_for_net(self.base, targets)
+        for g, target in zip(gross, targets):
+            report = generate_full_report(_household_with_gross(self.base, float(g)))
+            net = report["total_gross"] - report["total_vorsorge"] - report["net_german_tax_due"]
+            self.assertAlmostEqual(net, target, delta=0.01)
+
+    def test_gross_for_target_refund(self):
+        from logic.gross_up import solve_gross_for_refund
+        base = {**self.base, "de_tax_paid_a": 15000}
+        gross = solve_gross_for_refund(base, [2000.0, -1000.0])
+        for g, target in zip(gross, [2000.0, -1000.0]):
+            report = generate_full_report(_household_with_gross(base, float(g)))
+            self.assertAlmostEqual(report["refund_or_payment"], target, delta=0.01)
+
+    def test_unreachable_targets_are_nan(self):
+        from logic.gross_up import solve_gross
+        result = solve_gross(self.base, [-5.0, 50000.0])
+        self.assertTrue(np.isnan(result[0]))
+        self.assertFalse(np.isnan(result[1]))
+        with self.assertRaises(ValueError):
+            solve_gross(self.base, [1.0], mode="gross")
+
+    def test_unconverged_targets_are_nan(self):
+        from unittest import mock
+        from logic import gross_up
+        with mock.patch.object(gross_up, "MAX_ITERATIONS", 1):
+            result = gross_up.solve_gross(self.base, [50000.0])
+        self.assertTrue(np.isnan(result[0]))
+
+    def test_zone_inversion_converges_in_few_steps(self):
+        """Without foreign income each step solves the zone's quadratic exactly."""
+        from unittest import mock
+        from logic import gross_up
+        base = {"tax_year": 2025, "is_married": False, "tax_class": 0}
+        targets = [20000.0, 45000.0, 80000.0, 200000.0]
+        with mock.patch.object(gross_up, "MAX_ITERATIONS", 3):
+            gross = gross_up.solve_gross_for_net(base, targets)
+        self.assertFalse(np.isnan(gross).any())
+        for g, target in zip(gross, targets):
+            report = generate_full_report(_household_with_gross(base, float(g)))
+            net = report["total_gross"] - report["total_vorsorge"] - report["net_german_tax_due"]
+            self.assertAlmostEqual(net, target, delta=0.01)
+
+    def test_tax_curvature_matches_finite_differences(self):
+        from logic.vectorized import calculate_german_tax_array, tax_curvature_array
+        zvE = np.array([14000.0, 40000.0, 90000.0, 300000.0])
+        h = 1.0
+        for married in (False, True):
+            tax = lambda z: calculate_german_tax_array(z, 2025, married)
+            numeric = (tax(zvE + h) - 2 * tax(zvE) + tax(zvE - h)) / h ** 2
+            np.testing.assert_allclose(tax_curvature_array(zvE, 2025, married), numeric, atol=1e-8)
+
+    def test_many_targets_in_one_batch(self):
+        from logic.gross_up import solve_gross_for_net
+        gross = solve_gross_for_net(self.base, np.linspace(25000, 150000, 2000))
+        self.assertFalse(np.isnan(gross).any())
+        self.assertTrue((np.diff(gross) > 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.report_generator import generate_full_report
+
+SAMPLE_HOUSEHOLDS = [
+    {
+        "tax_year": 2024, "is_married": False, "tax_class": 0,
+        "de_gross_a": 60000, "de_tax_paid_a": 12000,
+        "de_pension_a": 5580, "de_health_a": 4890, "de_nursing_a": 1380, "de_unemployment_a": 780,
+        "commute_km_a": 25, "office_days_a": 120, "ho_days_a": 80, "internet_a": 240, "bank_fee_a": True,
+        "in_rent": 300000, "in_interest": 50000, "in_tds_inr": 20000,
+    },
+    {
+        "tax_year": 2025, "is_married": True, "tax_class": 1, "num_kids": 2,
+        "de_gross_a": 100000, "de_tax_paid_a": 25000,
+        "de_pension_a": 8000, "de_health_a": 5000, "de_nursing_a": 1000, "de_unemployment_a": 1000,
+        "de_gross_b": 50000, "de_tax_paid_b": 10000,
+        "de_pension_b": 4000, "de_health_b": 2500, "de_nursing_b": 500, "de_unemployment_b": 500,
+        "commute_km_b": 12, "office_days_b": 200, "internet_b": 240,
+        "kita_costs": 4000, "nk_labor": 600, "parents_support": 3000,
+    },
+    {
+        "tax_year": 2026, "is_married": True, "tax_class": 0,
+        "de_gross_a": 300000, "de_tax_paid_a": 110000, "in_rent": 2000000,
+    },
+    {"tax_year": 2026, "is_married": False, "tax_class": 0, "de_gross_a": 9000},
+]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestHouseholdStore(unittest.TestCase):
+
+    def setUp(self):
+        from logic.household_store import HouseholdStore
+        self.store = HouseholdStore.from_records(SAMPLE_HOUSEHOLDS)
+
+    def test_batch_matches_scalar_report(self):
+        """The column-wise calculation must match generate_full_report row by row."""
+        batch = self.store.calculate()
+        for i, household in enumerate(SAMPLE_HOUSEHOLDS):
+            report = generate_full_report(household)
+            for key in ("total_deductions", "taxable_income_de", "final_tax_liability",
+                        "soli", "net_german_tax_due", "refund_or_payment", "tax_class"):
+                self.assertAlmostEqual(report[key], float(batch[key][i]), places=6, msg=key)
+
+    def test_slicing_is_zero_copy(self):
+        """Slices share memory with the parent store."""
+        part = self.store[1:3]
+        self.assertEqual(len(part), 2)
+        self.assertTrue(np.shares_memory(part["de_gross_a"], self.store["de_gross_a"]))
+        self.assertEqual(part["de_gross_a"][0], 100000)
+
+    def test_filters(self):
+        """Filtering by tax year, marital status and Steuerklasse selects the right rows."""
+        self.assertEqual(list(self.store.where(tax_year=2026).indices), [2, 3])
+        self.assertEqual(list(self.store.where(is_married=True).indices), [1, 2])
+        self.assertEqual(list(self.store.where(tax_class=4).indices), [1])
+
+        view = self.store.where(tax_year=2026, is_married=True)
+        batch = view.calculate()
+        expected = generate_full_report(SAMPLE_HOUSEHOLDS[2])
+        self.assertAlmostEqual(expected["refund_or_payment"], float(batch["refund_or_payment"][0]), places=6)
+
+    def test_record_round_trip(self):
+        """A stored row can be materialized back into an input dict."""
+        record = self.store.record(0)
+        self.assertEqual(record["tax_year"], 2024)
+        self.assertTrue(record["bank_fee_a"])
+        self.assertEqual(record["de_gross_b"], 0.0)
+
+    def test_record_out_of_range(self):
+        """Rows past the logical size (preallocated capacity) are not households."""
+        self.assertEqual(self.store.record(-1), self.store.record(len(self.store) - 1))
+        with self.assertRaises(IndexError):
+            self.store.record(len(self.store))
+
+
+if __name__ == '__main__':
+    unittest.main()
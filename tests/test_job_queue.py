@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import report_generator
+from logic.job_queue import JobQueue, RUNNING
+from logic.report_generator import generate_full_report
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        report_generator.DEBUG = False
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "jobs.sqlite")
+        self.households = {
+            f"client-{i}": {"tax_year": 2025, "is_married": False, "de_gross_a": 40000 + 1000 * i,
+                            "de_tax_paid_a": 6000}
+            for i in range(10)
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_run_computes_every_job(self):
+        """All jobs finish and the stored reports match the scalar core."""
+        with JobQueue(self.path) as queue:
+            run_id = queue.enqueue(self.households, run_id="test")
+            stats = queue.run(run_id, max_workers=2, chunk_size=3)
+            self.assertEqual(stats["done"], 10)
+            self.assertEqual(stats["pending"] + stats["running"] + stats["failed"], 0)
+            self.assertGreater(stats["mean_seconds"], 0.0)
+            expected = generate_full_report(self.households["client-4"])
+            self.assertAlmostEqual(queue.result(run_id, "client-4")["refund_or_payment"],
+                                   expected["refund_or_payment"])
+
+    def test_resume_after_crash(self):
+        """Jobs claimed by a crashed process are picked up at once; finished ones are not redone."""
+        with JobQueue(self.path) as queue:
+            run_id = queue.enqueue(self.households, run_id="test")
+        # A separate process claims one chunk and dies before writing it
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        crash = ("import os, sys; from logic.job_queue import JobQueue; "
+                 "JobQueue(sys.argv[1])._claim('test', 4); os._exit(1)")
+        subprocess.run([sys.executable, "-c", crash, self.path], cwd=root, check=False)
+        with JobQueue(self.path) as queue:
+            claimed = [job_id for (job_id,) in queue._conn.execute("SELECT id FROM jobs WHERE status = ?", (RUNNING,))]
+            self.assertEqual(len(claimed), 4)
+            stats = queue.run(run_id, max_workers=1)
+            self.assertEqual(stats["done"], 10)
+            attempts = dict(queue._conn.execute("SELECT id, attempts FROM jobs").fetchall())
+            self.assertEqual(attempts[claimed[0]], 2)
+            # A second run has nothing left to do
+            queue.run(run_id, max_workers=1)
+            self.assertEqual(queue._conn.execute("SELECT MAX(attempts) FROM jobs").fetchone()[0], 2)
+
+    def test_live_leases_are_kept(self):
+        """Jobs another process claimed recently are left to it; claims never overlap."""
+        with JobQueue(self.path) as queue, JobQueue(self.path) as other:
+            run_id = queue.enqueue(self.households, run_id="test")
+            claimed = {job_id for job_id, _ in other._claim(run_id, 4)}
+            stats = queue.run(run_id, max_workers=1)
+            self.assertEqual(stats["done"], 6)
+            running = {job_id for (job_id,) in queue._conn.execute("SELECT id FROM jobs WHERE status = ?", (RUNNING,))}
+            self.assertEqual(running, claimed)
+
+    def test_old_queue_gets_lease_column(self):
+        """A queue file without the lease column is upgraded in place."""
+        import sqlite3
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, client_id TEXT NOT NULL,"
+            " input TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " duration REAL, finished REAL, error TEXT, UNIQUE(run_id, client_id))"
+        )
+        conn.execute("INSERT INTO jobs (run_id, client_id, input, status) VALUES ('test', 'a', '{}', 'running')")
+        conn.commit()
+        conn.close()
+        with JobQueue(self.path) as queue:
+            self.assertEqual(queue.run("test", max_workers=1)["done"], 1)
+
+    def test_enqueue_is_idempotent(self):
+        """Enqueueing the same clients again adds no jobs."""
+        with JobQueue(self.path) as queue:
+            queue.enqueue(self.households, run_id="test")
+            queue.enqueue(self.households, run_id="test")
+            self.assertEqual(queue.stats("test")["total"], 10)
+
+    def test_failed_jobs_are_recorded(self):
+        """A household the core cannot compute is marked failed with its error."""
+        with JobQueue(self.path) as queue:
+            queue.enqueue({"bad": {"tax_year": 1999, "de_gross_a": 1000}}, run_id="test")
+            stats = queue.run("test", max_workers=1)
+            self.assertEqual(stats["failed"], 1)
+            self.assertIn("ValueError", queue.failures("test")["bad"])
+            self.assertIsNone(queue.result("test", "bad"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest import mock
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import lohnsteuer_import
+from logic.lohnsteuer_import import (
+    parse_lohnsteuerbescheinigung, to_wizard_fields, import_folder, parse_german_amount, CACHE_FILE
+)
+
+CERTIFICATE_TEXT = """Ausdruck der elektronischen Lohnsteuerbescheinigung für 2024
+1. Dauer des Dienstverhältnisses 01.01.-31.12.
+3. Bruttoarbeitslohn einschl. Sachbezüge ohne 9. und 10. 65.000,00
+4. Einbehaltene Lohnsteuer von 3. 11.234,56
+5. Einbehaltener Solidaritätszuschlag von 3. 0,00
+22. Arbeitgeberanteil a) zur gesetzlichen Rentenversicherung 6.045,00
+23. Arbeitnehmeranteil a) zur gesetzlichen Rentenversicherung 6.045,00
+23. Arbeitnehmeranteil b) an berufsständische Versorgungseinrichtungen 1.000,00
+25. Arbeitnehmerbeiträge zur gesetzlichen Krankenversicherung 5.297,50
+26. Arbeitnehmerbeiträge zur sozialen Pflegeversicherung 1.105,00
+27. Arbeitnehmerbeiträge zur Arbeitslosenversicherung 845,00
+"""
+
+
+class TestLohnsteuerImport(unittest.TestCase):
+
+    def test_parse_certificate_lines(self):
+        values = parse_lohnsteuerbescheinigung(CERTIFICATE_TEXT)
+        self.assertEqual(values, {
+            "gross": 65000.0,
+            "tax_paid": 11234.56,
+            "pension": 6045.0,
+            "health": 5297.5,
+            "nursing": 1105.0,
+            "unemployment": 845.0,
+        })
+
+    def test_wizard_fields(self):
+        fields = to_wizard_fields({"gross": 50000.0, "tax_paid": 8000.0}, person="b")
+        self.assertEqual(fields, {"de_gross_b": 50000.0, "de_tax_paid_b": 8000.0})
+        self.assertAlmostEqual(parse_german_amount("1.234.567,89"), 1234567.89)
+
+    def test_import_folder_uses_hash_cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ("anna.txt", "ben.txt"):
+                with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+                    f.write(CERTIFICATE_TEXT)
+            cache_path = os.path.join(folder, CACHE_FILE)
+            results = import_folder(folder, max_workers=2, cache_path=cache_path)
+            self.assertEqual(sorted(results), ["anna.txt", "ben.txt"])
+            self.assertEqual(results["anna.txt"]["gross"], 65000.0)
+
+            # Identical files share one cache entry; a poisoned entry proves the cache is read
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            self.assertEqual(len(cache), 1)
+            key = next(iter(cache))
+            cache[key]["gross"] = 1.0
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            self.assertEqual(import_folder(folder, cache_path=cache_path)["ben.txt"]["gross"], 1.0)
+
+            # A new parser version does not reuse the old entries
+            with mock.patch.object(lohnsteuer_import, "PARSER_VERSION", lohnsteuer_import.PARSER_VERSION + 1):
+                self.assertEqual(import_folder(folder, cache_path=cache_path)["ben.txt"]["gross"], 65000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
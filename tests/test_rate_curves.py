@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.tax_calculator import calculate_german_tax
+from logic.report_generator import generate_full_report
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestRateCurves(unittest.TestCase):
+
+    def test_tariff_curve_matches_scalar_tax(self):
+        from logic.rate_curves import tariff_curve
+        grid = np.linspace(0, 400000, 4001)
+        for married in (False, True):
+            curve = tariff_curve(grid, 2025, married)
+            for zvE in grid[::250]:
+                i = int(zvE / 100)
+                self.assertAlmostEqual(curve["tax"][i], calculate_german_tax(zvE, 2025, married), places=6)
+
+    def test_marginal_rate_is_the_derivative(self):
+        """The analytic marginal rate matches a central difference away from zone edges."""
+        from logic.rate_curves import tariff_curve
+        grid = np.array([9000.0, 15000.0, 40000.0, 120000.0, 500000.0])
+        h = 0.01
+        for married in (False, True):
+            curve = tariff_curve(grid, 2024, married)
+            up = tariff_curve(grid + h, 2024, married)["tax"]
+            down = tariff_curve(grid - h, 2024, married)["tax"]
+            np.testing.assert_allclose(curve["marginal_rate"], (up - down) / (2 * h), atol=1e-6)
+
+    def test_household_curve_includes_progression(self):
+        """At the household's own taxable income the curve equals the report's tax."""
+        from logic.rate_curves import household_rate_curve
+        data = {"tax_year": "2026", "is_married": False, "de_gross_a": 70000, "in_rent": 900000}
+        report = generate_full_report(data)
+        curve = household_rate_curve(data, [report["taxable_income_de"]])
+        self.assertAlmostEqual(curve["tax"][0], report["final_tax_liability"], places=6)
+        self.assertGreater(curve["average_rate"][0], curve["average_rate_domestic"][0])
+
+    def test_dense_grid(self):
+        from logic.rate_curves import tariff_curve
+        curve = tariff_curve(np.linspace(0, 300000, 10**6), 2026)
+        self.assertEqual(curve["marginal_rate"].shape, (10**6,))
+        self.assertTrue((np.diff(curve["tax"]) >= 0).all())
+
+    def test_all_paths_follow_the_tariff_constants(self):
+        """A tariff edit in constants reaches the scalar, vectorized, fixed-point and curve paths."""
+        from unittest import mock
+        from logic import constants
+        from logic.rate_curves import tariff_curve
+        from logic.vectorized import calculate_german_tax_array
+        from logic.fixed_point import calculate_german_tax_cents
+        zvE = 150000.0
+        with mock.patch.dict(constants.TAX_YEAR_CONSTANTS[2025]["TARIFF"], {"ZONE_3_OFFSET": 10000.0}):
+            expected = 0.42 * zvE - 10000.0
+            self.assertAlmostEqual(calculate_german_tax(zvE, 2025, False), expected)
+            self.assertAlmostEqual(calculate_german_tax_array([zvE], 2025, False)[0], expected)
+            self.assertAlmostEqual(tariff_curve([zvE], 2025)["tax"][0], expected)
+            self.assertEqual(calculate_german_tax_cents(int(zvE * 100), 2025, False, statutory=False),
+                             round(expected * 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
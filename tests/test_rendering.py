@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import csv
+import io
+import json
+import tempfile
+import zipfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.report_generator import generate_full_report
+from logic.rendering import render_report, render_bulk, get_template
+
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.report = generate_full_report({
+            "is_married": False, "de_gross_a": 50000, "de_tax_paid_a": 10000,
+        })
+
+    def test_text_report_is_fully_rendered(self):
+        """No unrendered placeholders end up in the text output."""
+        text = render_report(self.report, "text")
+        self.assertNotIn("{", text)
+        self.assertIn(f"{self.report['taxable_income_de']:,.2f}", text)
+        self.assertIn("ESTIMATED", text)
+        self.assertNotIn("&rarr;", text)
+
+    def test_html_includes_warnings(self):
+        """The missing social security warning is shown in the HTML view."""
+        html = render_report(self.report, "html")
+        self.assertIn("Please Note:", html)
+        self.assertIn(self.report["warnings"][0], html)
+
+    def test_csv_and_json(self):
+        """CSV and JSON carry the same values as the report dict."""
+        rows = list(csv.DictReader(io.StringIO(render_report(self.report, "csv"))))
+        self.assertAlmostEqual(float(rows[0]["refund_or_payment"]), self.report["refund_or_payment"])
+        self.assertEqual(json.loads(render_report(self.report, "json"))["warnings"], self.report["warnings"])
+
+    def test_templates_are_compiled_once(self):
+        self.assertIs(get_template("text"), get_template("text"))
+        with self.assertRaises(ValueError):
+            render_report(self.report, "pdf")
+
+    def test_bulk_to_directory_and_archive(self):
+        reports = [(f"client_{i}", self.report) for i in range(3)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertEqual(render_bulk(iter(reports), os.path.join(tmpdir, "out"), "html"), 3)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "out", "client_2.html")))
+
+            archive_path = os.path.join(tmpdir, "out.zip")
+            self.assertEqual(render_bulk(iter(reports), archive_path, "json"), 3)
+            with zipfile.ZipFile(archive_path) as archive:
+                self.assertEqual(sorted(archive.namelist()), ["client_0.json", "client_1.json", "client_2.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic import report_generator
+from logic.report_generator import generate_full_report
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestClientRepository(unittest.TestCase):
+
+    def setUp(self):
+        from logic.repository import ClientRepository
+        report_generator.DEBUG = False
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "clients.sqlite")
+        self.repository = ClientRepository(self.path)
+        self.household = {"tax_year": "2025", "is_married": False, "de_gross_a": 60000,
+                          "de_tax_paid_a": 100, "office_days_a": 200, "ho_days_a": 100}
+
+    def tearDown(self):
+        self.repository.close()
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Every report key and the warnings come back as they were computed."""
+        report = generate_full_report(self.household)
+        self.assertTrue(report["warnings"])
+        self.repository.save("c1", self.household, report)
+        self.assertEqual(self.repository.report("c1"), report)
+        stored = self.repository.input("c1")
+        self.assertEqual(stored["tax_year"], 2025)
+        self.assertIs(stored["is_married"], False)
+        self.assertIsNone(self.repository.report("missing"))
+
+    def test_queries(self):
+        owing = dict(self.household)
+        refund = {**self.household, "tax_year": 2024, "de_tax_paid_a": 20000}
+        self.repository.save_many([
+            ("owing", owing, generate_full_report(owing)),
+            ("refund", refund, generate_full_report(refund)),
+        ])
+        self.assertEqual(self.repository.find(tax_year=2025, owing_more_than=1000), ["owing"])
+        self.assertEqual(self.repository.find(refund_more_than=0), ["refund"])
+        self.assertEqual(self.repository.count(tax_class=1), 2)
+        self.assertEqual(self.repository.find(warning="withholding_ratio_a"), [])
+        self.assertEqual(self.repository.warning_counts().get("work_days_a"), 2)
+
+    def test_resave_replaces_warnings(self):
+        self.repository.save("c1", self.household, generate_full_report(self.household))
+        fixed = {**self.household, "ho_days_a": 10}
+        self.repository.save("c1", fixed, generate_full_report(fixed))
+        self.assertEqual(self.repository.count(warning="work_days_a"), 0)
+        self.assertEqual(len(self.repository), 1)
+
+    def test_save_batch_matches_scalar(self):
+        """A vectorized portfolio run stores the same reports as the scalar path."""
+        from logic.household_store import HouseholdStore
+        records = [self.household, {**self.household, "is_married": True, "de_gross_b": 30000, "tax_class": 1}]
+        store = HouseholdStore.from_records(records)
+        report = store.calculate()
+        self.repository.save_batch(["a", "b"], store, report, store.validate(report))
+        for client_id, record in zip(["a", "b"], records):
+            expected = generate_full_report(record)
+            stored = self.repository.report(client_id)
+            self.assertEqual(stored["warnings"], expected["warnings"])
+            for key, value in expected.items():
+                if key != "warnings":
+                    self.assertAlmostEqual(stored[key], value, places=6, msg=key)
+
+    def test_older_database_is_migrated(self):
+        """Columns added since the file was created are appended and read back by name."""
+        from logic.repository import ClientRepository
+        self.repository.save("c1", self.household, generate_full_report(self.household))
+        self.repository.close()
+        conn = sqlite3.connect(self.path)
+        conn.execute("ALTER TABLE inputs DROP COLUMN moving_costs_a")
+        conn.execute("ALTER TABLE reports DROP COLUMN total_gross")
+        conn.commit()
+        conn.close()
+
+        self.repository = ClientRepository(self.path)
+        self.assertEqual(self.repository.input("c1")["moving_costs_a"], 0.0)
+        self.assertIsNone(self.repository.report("c1")["total_gross"])
+        data = dict(self.household, moving_costs_a=890, parents_support=20000)
+        report = generate_full_report(data)
+        self.repository.save("c2", data, report)
+        self.assertEqual(self.repository.input("c2")["moving_costs_a"], 890)
+        self.assertEqual(self.repository.report("c2"), report)
+        self.assertEqual(self.repository.input("c1")["de_gross_a"], 60000)
+
+    def test_wal_mode_allows_concurrent_reader(self):
+        self.repository.save("c1", self.household, generate_full_report(self.household))
+        reader = sqlite3.connect(self.path)
+        self.assertEqual(reader.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM reports").fetchone()[0], 1)
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import constants
+from logic.report_generator import generate_full_report
+from logic.residency import (
+    generate_partial_year_report, split_income_events, resident_months, read_income_events_csv,
+    parents_support_cap,
+)
+
+
+class TestResidency(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {"tax_year": "2025", "is_married": False, "de_gross_a": 45000, "de_tax_paid_a": 7000, "ho_days_a": 150}
+        # Monthly rent of 30,000 INR with 10% TDS; arrival on 1 July
+        self.events = []
+        for month in range(1, 13):
+            self.events.append((date(2025, month, 5), "in_rent", 30000.0))
+            self.events.append((date(2025, month, 5), "in_tds", 3000.0))
+        self.arrival = date(2025, 7, 1)
+
+    def test_split_by_arrival_date(self):
+        totals = split_income_events(iter(self.events), 2025, arrival=self.arrival)
+        self.assertEqual(totals["resident"]["in_rent"], 180000.0)
+        self.assertEqual(totals["non_resident"]["in_rent"], 180000.0)
+        self.assertEqual(totals["resident"]["in_tds_inr"], 18000.0)
+
+    def test_salary_before_arrival_raises_rate(self):
+        """Indian salary earned before arrival feeds the Progressionsvorbehalt, not the zvE."""
+        events = [(date(2025, month, 28), "in_salary", 150000.0) for month in range(1, 7)]
+        report = generate_partial_year_report(self.data, events, arrival=self.arrival)
+        without = generate_partial_year_report(self.data, [], arrival=self.arrival)
+        self.assertAlmostEqual(report["in_salary_eur"], 900000 * constants.INR_TO_EUR_RATE)
+        self.assertAlmostEqual(report["foreign_income_non_resident"], 900000 * constants.INR_TO_EUR_RATE)
+        self.assertEqual(report["foreign_income_resident"], 0.0)
+        self.assertEqual(report["taxable_income_de"], without["taxable_income_de"])
+        self.assertGreater(report["effective_tax_rate"], without["effective_tax_rate"])
+
+    def test_resident_months(self):
+        self.assertEqual(resident_months(2025, arrival=date(2025, 7, 15)), 6)
+        self.assertEqual(resident_months(2025, departure=date(2025, 3, 31)), 3)
+        self.assertEqual(resident_months(2025), 12)
+
+    def test_partial_year_report(self):
+        """Whole-year rent raises the rate, only resident TDS is credited, moving lump sum applies."""
+        report = generate_partial_year_report(self.data, iter(self.events), arrival="2025-07-01")
+        self.assertAlmostEqual(report["foreign_income"], 360000 * constants.INR_TO_EUR_RATE)
+        self.assertAlmostEqual(report["tds_credit"], 18000 * constants.INR_TO_EUR_RATE)
+        self.assertAlmostEqual(report["tds_non_creditable"], 18000 * constants.INR_TO_EUR_RATE)
+        self.assertEqual(report["moving_a"], constants.MOVING_LUMP_SUM_NON_EU)
+        self.assertEqual(report["resident_months"], 6)
+
+        full_year = generate_full_report({**self.data, "in_rent": 360000, "in_tds_inr": 36000})
+        self.assertLess(report["taxable_income_de"], full_year["taxable_income_de"])
+
+    def test_support_is_prorated(self):
+        events = [(date(2025, month, 1), "parents_support", 2000.0) for month in range(1, 13)]
+        report = generate_partial_year_report(self.data, events, arrival=self.arrival)
+        basic_allowance = constants.TAX_YEAR_CONSTANTS[2025]['BASIC_ALLOWANCE']
+        self.assertAlmostEqual(report["other_deductions"], basic_allowance / 4 * 6 / 12)
+
+    def test_support_cap_per_supported_person(self):
+        """Each parent has its own cap, a quarter of the basic allowance for India."""
+        basic_allowance = constants.TAX_YEAR_CONSTANTS[2025]['BASIC_ALLOWANCE']
+        self.assertAlmostEqual(parents_support_cap(2025, 12, 2), basic_allowance / 2)
+        events = [(date(2025, month, 1), "parents_support", 2000.0) for month in range(7, 13)]
+        report = generate_partial_year_report({**self.data, "supported_persons": 2}, events, arrival=self.arrival)
+        self.assertAlmostEqual(report["parents_support_deduction"], basic_allowance / 2 * 6 / 12)
+
+    def test_events_replace_wizard_support(self):
+        """Support events replace the wizard value, even when none fall in the resident period."""
+        data = {**self.data, "parents_support": 5000}
+        report = generate_partial_year_report(data, [(date(2025, 2, 1), "parents_support", 3000.0)],
+                                              arrival=self.arrival)
+        self.assertEqual(report["parents_support_deduction"], 0.0)
+
+    def test_full_year_report_keeps_support(self):
+        """Outside the residency engine the support to parents is deducted as entered."""
+        report = generate_full_report({**self.data, "parents_support": 20000})
+        self.assertEqual(report["parents_support_deduction"], 20000)
+
+    def test_events_from_csv(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "events.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("date,kind,amount\n2025-02-01,in_interest,1000\n2025-09-01,in_interest,500\n")
+            totals = split_income_events(read_income_events_csv(path), 2025, arrival=self.arrival)
+        self.assertEqual(totals["non_resident"]["in_interest"], 1000.0)
+        self.assertEqual(totals["resident"]["in_interest"], 500.0)
+        with self.assertRaises(ValueError):
+            split_income_events([("2025-01-01", "bonus", 1.0)], 2025)
+
+
+if __name__ == '__main__':
+    unittest.main()
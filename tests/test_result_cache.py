@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import constants
+from logic.result_cache import ResultCache, input_key, rules_version
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.household = {"tax_year": "2025", "is_married": False, "de_gross_a": 55000, "de_tax_paid_a": 9000}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_equivalent_inputs_share_a_key(self):
+        """Key order, int vs. float and string tax years do not change the key."""
+        other = {"de_tax_paid_a": 9000.0, "de_gross_a": 55000.0, "is_married": False, "tax_year": 2025}
+        self.assertEqual(input_key(self.household), input_key(other))
+        self.assertNotEqual(input_key(self.household), input_key({**other, "de_gross_a": 55001}))
+
+    def test_rerun_hits_cache(self):
+        """A second run over unchanged inputs is served from disk."""
+        with ResultCache(self.path) as cache:
+            first = cache.report(self.household)
+        with ResultCache(self.path) as cache:
+            second = cache.report(self.household)
+            self.assertEqual(cache.stats["hits"], 1)
+            self.assertEqual(cache.stats["hit_rate"], 1.0)
+        self.assertAlmostEqual(first["refund_or_payment"], second["refund_or_payment"])
+
+    def test_constants_change_invalidates(self):
+        """Changing a rule constant changes the rules version."""
+        before = rules_version()
+        original = constants.HOME_OFFICE_DAY_RATE
+        constants.HOME_OFFICE_DAY_RATE = original + 1
+        try:
+            self.assertNotEqual(before, rules_version())
+        finally:
+            constants.HOME_OFFICE_DAY_RATE = original
+        self.assertEqual(before, rules_version())
+
+    def test_tariff_change_invalidates(self):
+        """The tariff zones are rule constants too."""
+        before = rules_version()
+        tariff = constants.TAX_YEAR_CONSTANTS[2025]["TARIFF"]
+        original = tariff["ZONE_3_OFFSET"]
+        tariff["ZONE_3_OFFSET"] = original + 1
+        try:
+            self.assertNotEqual(before, rules_version())
+        finally:
+            tariff["ZONE_3_OFFSET"] = original
+        self.assertEqual(before, rules_version())
+
+    def test_size_bounded_eviction(self):
+        """The oldest entries are evicted once the size budget is exceeded."""
+        with ResultCache(self.path, max_bytes=5000) as cache:
+            for gross in range(40000, 40010):
+                cache.report({**self.household, "de_gross_a": gross})
+            count, total = cache._conn.execute("SELECT COUNT(*), SUM(size) FROM reports").fetchone()
+            self.assertLess(count, 10)
+            self.assertLessEqual(total, 5000)
+            self.assertIsNone(cache.get({**self.household, "de_gross_a": 40000}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.report_generator import generate_full_report
+from logic.service import TaxService, http_request
+
+HOUSEHOLD = {
+    "is_married": True, "tax_class": 1, "tax_year": 2025,
+    "de_gross_a": 70000, "de_tax_paid_a": 14000, "de_pension_a": 6500, "de_health_a": 5000,
+    "in_rent": 300000,
+}
+
+
+class TestTaxService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = TaxService(max_workers=1)
+        await self.service.start("127.0.0.1", 0)
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.service.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.service.close()
+
+    async def test_report_and_batch_on_one_connection(self):
+        expected = generate_full_report(HOUSEHOLD)
+        status, report = await http_request(self.reader, self.writer, "POST", "/report", HOUSEHOLD)
+        self.assertEqual(status, 200)
+        self.assertEqual(report["refund_or_payment"], expected["refund_or_payment"])
+
+        households = [dict(HOUSEHOLD, de_gross_a=50000 + i * 100) for i in range(600)]
+        status, reports = await http_request(self.reader, self.writer, "POST", "/batch", households)
+        self.assertEqual(status, 200)
+        self.assertEqual(len(reports), 600)
+        self.assertEqual(reports[599]["de_gross_a"], 50000 + 599 * 100)
+
+    async def test_errors(self):
+        status, body = await http_request(self.reader, self.writer, "POST", "/report", [1, 2])
+        self.assertEqual(status, 400)
+        status, body = await http_request(self.reader, self.writer, "POST", "/report", dict(HOUSEHOLD, tax_year=1999))
+        self.assertEqual(status, 422)
+        self.assertIn("1999", body["error"])
+        status, _ = await http_request(self.reader, self.writer, "GET", "/report")
+        self.assertEqual(status, 405)
+        status, _ = await http_request(self.reader, self.writer, "GET", "/nothing")
+        self.assertEqual(status, 404)
+
+    async def test_input_types(self):
+        status, body = await http_request(self.reader, self.writer, "POST", "/report",
+                                          dict(HOUSEHOLD, de_gross_a="70000"))
+        self.assertEqual(status, 400)
+        self.assertIn("de_gross_a", body["error"])
+        status, body = await http_request(self.reader, self.writer, "POST", "/batch",
+                                          [HOUSEHOLD, dict(HOUSEHOLD, is_married="false")])
+        self.assertEqual(status, 400)
+        self.assertIn("Household 1", body["error"])
+        status, body = await http_request(self.reader, self.writer, "POST", "/report", dict(HOUSEHOLD, de_gross_a=None))
+        self.assertEqual(status, 400)
+        self.assertIn("de_gross_a", body["error"])
+        status, _ = await http_request(self.reader, self.writer, "POST", "/report", dict(HOUSEHOLD, tax_year="2025"))
+        self.assertEqual(status, 200)
+
+    async def _raw_status(self, request):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.service.port)
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+        return int(status_line.split()[1])
+
+    async def test_malformed_requests(self):
+        self.assertEqual(await self._raw_status(b"GARBAGE\r\n\r\n"), 400)
+        self.assertEqual(await self._raw_status(
+            b"POST /report HTTP/1.1\r\nContent-Length: ten\r\n\r\n{}"), 400)
+
+    async def test_metrics(self):
+        for _ in range(3):
+            await http_request(self.reader, self.writer, "GET", "/health")
+        status, metrics = await http_request(self.reader, self.writer, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["/health"]["requests"], 3)
+        self.assertGreaterEqual(metrics["/health"]["p99_ms"], metrics["/health"]["p50_ms"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.sessions import SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state = {"tax_year": "2025", "is_married": True, "tax_class": 1, "de_gross_a": 72000.0, "bank_fee_a": True}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_save_and_load_round_trip(self):
+        """A saved wizard state is restored unchanged."""
+        store = SessionStore(self.tmpdir.name)
+        client_id = store.save("Priya Sharma", self.state)
+        self.assertEqual(client_id, "priya_sharma")
+        self.assertEqual(store.load(client_id), self.state)
+        store.close()
+
+    def test_index_survives_reopen(self):
+        """The client list is read from the index without opening session files."""
+        store = SessionStore(self.tmpdir.name)
+        store.save_async("Client A", self.state).result()
+        store.save_async("Client B", {**self.state, "tax_year": "2026"}).result()
+        store.close()
+
+        reopened = SessionStore(self.tmpdir.name)
+        clients = {c["client_id"]: c for c in reopened.clients()}
+        self.assertCountEqual(clients, ["client_a", "client_b"])
+        self.assertEqual(clients["client_b"]["tax_year"], "2026")
+        reopened.close()
+
+    def test_colliding_names_keep_their_own_files(self):
+        """Names reducing to the same id, or to the index file, never overwrite each other."""
+        store = SessionStore(self.tmpdir.name)
+        first = store.save("Müller", self.state)
+        second = store.save("M ller", {**self.state, "tax_year": "2026"})
+        self.assertEqual((first, second), ("m_ller", "m_ller_2"))
+        self.assertEqual(store.save("Müller", self.state), first)
+        self.assertEqual(store.load(first)["tax_year"], "2025")
+        self.assertEqual(store.load(second)["tax_year"], "2026")
+
+        index_client = store.save("Index", self.state)
+        self.assertEqual(index_client, "index_2")
+        store.close()
+
+        reopened = SessionStore(self.tmpdir.name)
+        self.assertCountEqual([c["client_id"] for c in reopened.clients()], ["m_ller", "m_ller_2", "index_2"])
+        reopened.close()
+
+    def test_unknown_client(self):
+        store = SessionStore(self.tmpdir.name)
+        with self.assertRaises(KeyError):
+            store.load("nobody")
+        with self.assertRaises(ValueError):
+            store.save("   ", self.state)
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
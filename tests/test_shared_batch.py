@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSharedBatch(unittest.TestCase):
+
+    def setUp(self):
+        from logic.household_store import HouseholdStore
+        rng = np.random.default_rng(7)
+        n = 1000
+        self.store = HouseholdStore({
+            "tax_year": rng.choice([2024, 2025, 2026], n),
+            "is_married": rng.random(n) < 0.5,
+            "de_gross_a": rng.uniform(10000, 150000, n),
+            "de_tax_paid_a": rng.uniform(0, 30000, n),
+            "de_gross_b": rng.uniform(0, 80000, n),
+            "commute_km_a": rng.integers(0, 50, n).astype(float),
+            "office_days_a": rng.integers(0, 200, n).astype(float),
+            "in_rent": rng.uniform(0, 300000, n),
+        })
+
+    def test_matches_single_process(self):
+        """Ranges computed in the workers give the same columns as one in-process run."""
+        from logic.shared_batch import generate_batch_report_shared
+        expected = self.store.calculate()
+        report = generate_batch_report_shared(self.store, max_workers=2, chunk_size=128)
+        self.assertEqual(set(report), set(expected))
+        for key in expected:
+            np.testing.assert_array_equal(report[key], expected[key])
+
+    def test_missing_fields_use_defaults(self):
+        from logic.shared_batch import generate_batch_report_shared
+        report = generate_batch_report_shared({"tax_year": np.array([2025, 2025]), "de_gross_a": np.array([50000.0, 0.0])},
+                                              max_workers=1)
+        self.assertEqual(len(report["refund_or_payment"]), 2)
+        self.assertEqual(report["total_gross"][1], 0.0)
+
+    def test_shared_columns_layout(self):
+        """Attached blocks see the owner's data; columns are aligned."""
+        from logic.shared_batch import SharedColumns, ALIGNMENT
+        owner = SharedColumns({"a": np.int8, "b": np.float64}, 10)
+        try:
+            owner.arrays["a"][:] = np.arange(10)
+            owner.arrays["b"][:] = 1.5
+            other = SharedColumns(owner.schema, 10, owner.name)
+            np.testing.assert_array_equal(other.arrays["a"], np.arange(10))
+            self.assertEqual(other.arrays["b"].ctypes.data % ALIGNMENT, owner.arrays["a"].ctypes.data % ALIGNMENT)
+            other.close()
+        finally:
+            owner.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.report_generator import generate_full_report
+
+HOUSEHOLD = {
+    "is_married": True, "tax_class": 1, "tax_year": 2025,
+    "de_gross_a": 70000, "de_tax_paid_a": 14000, "de_pension_a": 6500, "de_health_a": 5000,
+    "commute_km_a": 25, "office_days_a": 100, "ho_days_a": 120,
+    "in_rent": 500000, "in_interest": 100000, "in_tds_inr": 30000,
+}
+UNCERTAINTY = {
+    "fx_rate": ("normal", 0.011, 0.0005),
+    "ho_days_a": ("triangular", 80, 120, 160),
+    "internet_a": ("uniform", 0, 480),
+}
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSimulation(unittest.TestCase):
+
+    def test_reproducible_across_workers(self):
+        from logic.simulation import simulate_refund
+        single = simulate_refund(HOUSEHOLD, UNCERTAINTY, scenarios=5000, seed=42, batch_size=1000)
+        pooled = simulate_refund(HOUSEHOLD, UNCERTAINTY, scenarios=5000, seed=42, batch_size=1000, max_workers=2)
+        self.assertEqual(single, pooled)
+        self.assertNotEqual(single, simulate_refund(HOUSEHOLD, UNCERTAINTY, scenarios=5000, seed=7, batch_size=1000))
+        self.assertLess(single["p5"], single["p50"])
+        self.assertLess(single["p50"], single["p95"])
+
+    def test_degenerate_distribution_matches_report(self):
+        from logic.simulation import simulate_refund
+        fixed = {"fx_rate": ("uniform", 0.011, 0.011), "ho_days_a": ("uniform", 120, 120)}
+        result = simulate_refund(HOUSEHOLD, fixed, scenarios=100)
+        self.assertAlmostEqual(result["p50"], generate_full_report(HOUSEHOLD)["refund_or_payment"], places=6)
+        self.assertAlmostEqual(result["std"], 0.0, places=6)
+
+    def test_fx_rate_rescales_indian_income(self):
+        from logic.simulation import sample_scenarios
+        columns = sample_scenarios(HOUSEHOLD, {"fx_rate": ("uniform", 0.022, 0.022)}, 3, np.random.default_rng(0))
+        self.assertTrue(np.allclose(columns["in_rent"], 1000000))
+        self.assertTrue(np.allclose(columns["in_tds_inr"], 60000))
+
+    def test_invalid_specs(self):
+        from logic.simulation import simulate_refund
+        with self.assertRaises(ValueError):
+            simulate_refund(HOUSEHOLD, {"salary": ("normal", 1, 1)})
+        with self.assertRaises(ValueError):
+            simulate_refund(HOUSEHOLD, {"ho_days_a": ("poisson", 100)})
+        with self.assertRaises(ValueError):
+            simulate_refund(HOUSEHOLD, {"ho_days_a": ("normal", 100)})
+        for field in ("tax_class", "is_married", "num_kids"):
+            with self.assertRaises(ValueError):
+                simulate_refund(HOUSEHOLD, {field: ("uniform", 0, 2)})
+        for kwargs in ({"scenarios": 0}, {"batch_size": 0}, {"batch_size": -5}, {"scenarios": 2.5}):
+            with self.assertRaises(ValueError):
+                simulate_refund(HOUSEHOLD, {}, **kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
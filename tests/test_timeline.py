@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.report_generator import generate_full_report
+from logic.timeline import timeline_inputs, generate_timeline, diff_timeline
+
+BASE = {
+    "is_married": True, "tax_class": 1, "num_kids": 1,
+    "de_gross_a": 70000, "de_tax_paid_a": 12000, "de_pension_a": 6500, "de_health_a": 5000,
+    "commute_km_a": 25, "office_days_a": 150, "ho_days_a": 60,
+    "de_gross_b": 30000, "de_tax_paid_b": 3000,
+    "in_rent": 300000, "kita_costs": 4000, "moving_costs_a": 2500,
+}
+CHANGES = {2025: {"de_gross_a": 75000, "de_tax_paid_a": 13500}}
+
+
+class TestTimeline(unittest.TestCase):
+
+    def test_carry_forward(self):
+        inputs = timeline_inputs(BASE, CHANGES)
+        self.assertEqual(sorted(inputs), [2024, 2025, 2026])
+        self.assertEqual(inputs[2026]["de_gross_a"], 75000)
+        self.assertEqual(inputs[2026]["kita_costs"], 4000)
+        # Moving costs are a one-off of the first year
+        self.assertEqual(inputs[2024]["moving_costs_a"], 2500)
+        self.assertNotIn("moving_costs_a", inputs[2025])
+
+    def test_matches_single_year_reports(self):
+        reports = generate_timeline(BASE, CHANGES)
+        for year, data in timeline_inputs(BASE, CHANGES).items():
+            self.assertEqual(reports[year], generate_full_report(data))
+
+    def test_diff(self):
+        diffs = diff_timeline(generate_timeline(BASE, CHANGES))
+        first = diffs[(2024, 2025)]
+        self.assertEqual(first["de_gross_a"]["change"], 5000)
+        self.assertEqual(first["moving_a"]["to"], 0.0)
+        # 2026 has the same inputs, so the deductions are shared and unchanged
+        self.assertNotIn("total_deductions", diffs[(2025, 2026)])
+
+    def test_deductions_do_not_depend_on_the_year(self):
+        """Only the year varies: the deductions are shared, support to parents included."""
+        from logic.report_generator import _calculate_deductions
+
+        def deductions(data, year):
+            data = dict(data, tax_year=year)
+            return _calculate_deductions(data, data["is_married"], data["de_gross_a"], data["de_gross_b"])
+
+        supported = dict(BASE, parents_support=12000)
+        self.assertEqual(deductions(supported, 2024), deductions(supported, 2025))
+        self.assertEqual(deductions(supported, 2025), deductions(supported, 2026))
+        reports = generate_timeline(supported)
+        for year, data in timeline_inputs(supported).items():
+            self.assertEqual(reports[year], generate_full_report(data))
+
+    def test_traced_years_record_deductions(self):
+        from logic.trace import CalculationTrace
+        trace = CalculationTrace()
+        reports = generate_timeline(BASE, CHANGES, traces={2026: trace})
+        self.assertEqual(reports[2026], generate_full_report(timeline_inputs(BASE, CHANGES)[2026]))
+        self.assertTrue(trace.steps("wk_a"))
+        self.assertTrue(trace.steps("tariff_zone"))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batch_matches_scalar(self):
+        from logic.household_store import HouseholdStore
+        from logic.timeline import generate_timeline_batch, diff_timeline_batch
+        other = dict(BASE, is_married=False, tax_class=0, de_gross_b=0, moving_costs_a=0, parents_support=12000)
+        store = HouseholdStore.from_records([BASE, other])
+        changes = {2025: {"de_gross_a": np.array([75000, 50000]), "de_tax_paid_a": np.array([13500, 9000])}}
+        batch = generate_timeline_batch(store, changes)
+        for i, record in enumerate([BASE, other]):
+            record_changes = {2025: {k: float(v[i]) for k, v in changes[2025].items()}}
+            for year, report in generate_timeline(record, record_changes).items():
+                self.assertAlmostEqual(batch[year]["refund_or_payment"][i], report["refund_or_payment"], places=6)
+        # Only the year changes
+        unchanged = generate_timeline_batch(HouseholdStore.from_records([other]))
+        for year, report in generate_timeline(other).items():
+            self.assertAlmostEqual(unchanged[year]["refund_or_payment"][0], report["refund_or_payment"], places=6)
+        diffs = diff_timeline_batch(batch)
+        self.assertEqual(diffs[(2024, 2025)]["de_gross_a"].tolist(), [5000.0, -20000.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import constants
+from logic.report_generator import generate_full_report, _calculate_single_werbungskosten
+from logic.trace import CalculationTrace
+
+HOUSEHOLD = {
+    "is_married": True, "tax_class": 1, "tax_year": 2025,
+    "de_gross_a": 80000, "de_tax_paid_a": 15000,
+    "commute_km_a": 30, "office_days_a": 100, "ho_days_a": 80,
+    "de_gross_b": 30000, "in_rent": 200000, "kita_costs": 3000,
+}
+
+
+class TestCalculationTrace(unittest.TestCase):
+
+    def test_trace_does_not_change_results(self):
+        trace = CalculationTrace()
+        self.assertEqual(generate_full_report(HOUSEHOLD, trace), generate_full_report(HOUSEHOLD))
+        self.assertGreater(len(trace), 10)
+
+    def test_werbungskosten_breakdown(self):
+        trace = CalculationTrace()
+        report = generate_full_report(HOUSEHOLD, trace)
+        steps = {step: (value, used) for step, value, _, used in trace}
+        self.assertEqual(steps["ho_a"][0], report["ho_a"])
+        self.assertEqual(steps["commute_a"][0], report["commute_a"])
+        self.assertEqual(steps["commute_a"][1]["COMMUTE_ALLOWANCE_HIGH_KM"], constants.COMMUTE_ALLOWANCE_HIGH_KM)
+        self.assertEqual(steps["wk_a"][0], report["wk_a"])
+        self.assertEqual(steps["refund_or_payment"][0], report["refund_or_payment"])
+
+    def test_tariff_zone_and_soli(self):
+        trace = CalculationTrace()
+        generate_full_report(HOUSEHOLD, trace)
+        self.assertEqual(trace.steps("tariff_zone")[0][1], "2 (progression zone)")
+        soli = trace.steps("soli")[0]
+        self.assertEqual(soli[1], 0.0)
+        self.assertIn("Freigrenze", soli[2])
+
+    def test_render(self):
+        trace = CalculationTrace()
+        _calculate_single_werbungskosten(100, 10, 50, trace=trace, person="b")
+        text = trace.render()
+        self.assertEqual(len(text.splitlines()), 3)
+        self.assertIn("commute_b", text)
+        self.assertIn("COMMUTE_ALLOWANCE_LOW_KM=0.3", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.report_generator import generate_full_report
+from logic.validation_rules import evaluate_rules, compile_rules, year_limits, VALIDATION_RULES
+
+HOUSEHOLDS = [
+    {"is_married": True, "tax_class": 1, "num_kids": 0, "tax_year": 2025,
+     "de_gross_a": 80000, "de_tax_paid_a": 20000,
+     "de_pension_a": 7000, "de_health_a": 4500, "de_nursing_a": 800, "de_unemployment_a": 800},
+    {"is_married": False, "tax_class": 0, "tax_year": 2024,
+     "de_gross_a": 60000, "de_tax_paid_a": 30000, "office_days_a": 200, "ho_days_a": 60,
+     "de_pension_a": 9000, "de_health_a": 4000, "de_nursing_a": 700, "de_unemployment_a": 700,
+     "de_gross_b": 10000, "kita_costs": 3000},
+    {"is_married": True, "tax_class": 0, "num_kids": 1, "tax_year": 2026,
+     "de_gross_a": 50000, "de_tax_paid_a": 0, "commute_km_a": 25,
+     "in_rent": 100000, "in_tds_inr": 50000, "parents_support": 20000},
+]
+
+
+class TestValidationRules(unittest.TestCase):
+
+    def test_new_checks_fire(self):
+        warnings = generate_full_report(HOUSEHOLDS[1])["warnings"]
+        self.assertEqual(len(warnings), 5)
+        self.assertIn("Person A: Office days plus home office days exceed 230 working days.", warnings)
+        self.assertIn("Person A: Pension insurance (23a) is above the maximum employee contribution for the year.",
+                      warnings)
+        self.assertIn("Person A: Lohnsteuer is more than 45% of the gross salary. Please check lines 3 and 4.",
+                      warnings)
+
+    def test_clean_household(self):
+        self.assertEqual(generate_full_report(HOUSEHOLDS[0])["warnings"], [])
+
+    def test_year_limits(self):
+        limits = year_limits(2024)
+        self.assertAlmostEqual(limits["max_pension"], 90600 * 0.093)
+        self.assertAlmostEqual(limits["max_nursing"], 62100 * 0.023)
+
+    def test_parents_support_limit_per_supported_person(self):
+        """The Unterhalt maximum for India is a quarter of the basic allowance per supported parent."""
+        message = next(rule["message"] for rule in VALIDATION_RULES if rule["id"] == "parents_support_above_max")
+        data = {"tax_year": 2025, "parents_support": 5000}
+        self.assertIn(message, evaluate_rules(data, {}))
+        self.assertNotIn(message, evaluate_rules(dict(data, supported_persons=2), {}))
+        self.assertNotIn(message, evaluate_rules(dict(data, parents_support=3000), {}))
+
+    def test_year_limits_follow_the_constants(self):
+        from unittest import mock
+        from logic import constants
+        with mock.patch.dict(constants.TAX_YEAR_CONSTANTS[2024]["SOCIAL_SECURITY_CAPS"], {"pension": 100000}):
+            self.assertAlmostEqual(year_limits(2024)["max_pension"], 100000 * 0.093)
+        self.assertAlmostEqual(year_limits(2024)["max_pension"], 90600 * 0.093)
+
+    def test_custom_rules(self):
+        rules = compile_rules([{"id": "rich", "check": "total_gross > 100000", "message": "High income"}])
+        self.assertEqual(evaluate_rules({}, {"total_gross": 150000}, rules), ["High income"])
+        self.assertEqual(evaluate_rules({}, {}, rules), [])
+
+    def test_expressions_are_parsed_not_evaluated(self):
+        """Calls, attributes and boolean keywords are rejected when the rules are compiled."""
+        for check in ("__import__('os').system('true')", "total_gross.real > 0", "total_gross > 0 and num_kids > 0",
+                      "0 < total_gross < 10", "total_gross >"):
+            with self.assertRaises(ValueError):
+                compile_rules([{"id": "bad", "check": check, "message": "Bad"}])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batch_matches_single_reports(self):
+        from logic.household_store import HouseholdStore
+        store = HouseholdStore.from_records(HOUSEHOLDS * 100)
+        matrix = store.validate()
+        self.assertEqual(matrix.shape, (300, len(VALIDATION_RULES)))
+        for i, household in enumerate(HOUSEHOLDS):
+            self.assertEqual(matrix.warnings_for(i), generate_full_report(household)["warnings"])
+        counts = matrix.counts()
+        self.assertEqual(counts["work_days_a"], 100)
+        self.assertEqual(matrix.households("withholding_missing_a")[:2].tolist(), [2, 5])
+        self.assertEqual(int(matrix.to_dense().sum()), len(matrix))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,37 @@ import re
 from PyQt6.QtWidgets import (
     QApplication, QWizard, QWizardPage, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QComboBox, QFormLayout, QDoubleSpinBox,
-    QCheckBox, QGroupBox, QScrollArea, QWidget, QPushButton, QMessageBox
+    QCheckBox, QGroupBox, QScrollArea, QWidget, QPushButton, QMessageBox, QFileDialog
 )
 from PyQt6.QtCore import Qt
 from logic.report_generator import generate_full_report
+from logic.trace import CalculationTrace
+from logic.rendering import render_report
+from logic.elster_export import write_elster_xml
+from logic.lohnsteuer_import import extract_text, parse_lohnsteuerbescheinigung, to_wizard_fields
+from logic.form26as_import import import_statements, read_fx_rates_csv
 from logic.utils import estimate_social_security
-from logic.constants import TAX_YEAR_CONSTANTS
+from logic.constants import TAX_YEAR_CONSTANTS, INR_TO_EUR_RATE
+
+# All wizard fields that feed generate_full_report
+FIELD_NAMES = [
+    "is_married", "tax_class", "num_kids", "parents_support",
+    # Person A
+    "de_gross_a", "de_tax_paid_a",
+    "de_pension_a", "de_health_a", "de_nursing_a", "de_unemployment_a",
+    "commute_km_a", "office_days_a", "ho_days_a", "internet_a", "bank_fee_a",
+    # Person B
+    "de_gross_b", "de_tax_paid_b",
+    "de_pension_b", "de_health_b", "de_nursing_b", "de_unemployment_b",
+    "commute_km_b", "office_days_b", "ho_days_b", "internet_b", "bank_fee_b",
+    # Shared
+    "in_rent", "in_interest", "in_salary",
+    "kita_costs", "nk_labor", "in_tds_inr",
+]
+
+# Everything a saved session restores. "is_married" must be restored before
+# "tax_class" because it repopulates the tax class combo box.
+SESSION_FIELD_NAMES = ["tax_year"] + FIELD_NAMES
 
 # ==========================================
 # UI PAGES
@@ -113,6 +138,10 @@ class GermanIncomePage(QWizardPage):
         layout_a.addRow("Health Insurance (25):", self.health_a)
         layout_a.addRow("Nursing Care Insurance (26):", self.nursing_a)
         layout_a.addRow("Unemployment Insurance (27):", self.unemployment_a)
+        import_button_a = QPushButton("Import Lohnsteuerbescheinigung...")
+        import_button_a.setToolTip("Fill these fields from a Lohnsteuerbescheinigung PDF")
+        import_button_a.clicked.connect(lambda: self._import_certificate("a"))
+        layout_a.addRow(import_button_a)
         group_a.setLayout(layout_a)
 
         # PERSON B COLUMN
@@ -140,6 +169,10 @@ class GermanIncomePage(QWizardPage):
         layout_b.addRow("Health Insurance (25):", self.health_b)
         layout_b.addRow("Nursing Care Insurance (26):", self.nursing_b)
         layout_b.addRow("Unemployment Insurance (27):", self.unemployment_b)
+        import_button_b = QPushButton("Import Lohnsteuerbescheinigung...")
+        import_button_b.setToolTip("Fill these fields from a Lohnsteuerbescheinigung PDF")
+        import_button_b.clicked.connect(lambda: self._import_certificate("b"))
+        layout_b.addRow(import_button_b)
         group_b.setLayout(layout_b)
 
         main_layout.addWidget(group_a)
@@ -194,6 +227,25 @@ class GermanIncomePage(QWizardPage):
         self.nursing_b.setValue(estimates["nursing"])
         self.unemployment_b.setValue(estimates["unemployment"])
 
+    def _import_certificate(self, person):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, f"Lohnsteuerbescheinigung for Person {person.upper()}", "",
+            "Lohnsteuerbescheinigung (*.pdf *.txt)")
+        if not file_path:
+            return
+
+        try:
+            values = parse_lohnsteuerbescheinigung(extract_text(file_path))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read the Lohnsteuerbescheinigung: {e}")
+            return
+
+        if not values:
+            QMessageBox.warning(self, "Nothing Found", "No Lohnsteuerbescheinigung lines were recognized in this file.")
+            return
+        for name, amount in to_wizard_fields(values, person).items():
+            self.setField(name, amount)
+
 
 class IndianIncomePage(QWizardPage):
     def __init__(self):
@@ -211,10 +263,52 @@ class IndianIncomePage(QWizardPage):
         self.in_interest.setPrefix("\u20b9 ")
         layout.addRow("Indian Bank Interest (NRE/NRO):", self.in_interest)
 
+        self.in_salary = QDoubleSpinBox()
+        self.in_salary.setRange(0, 10000000)
+        self.in_salary.setPrefix("\u20b9 ")
+        layout.addRow("Indian Salary (before/after moving):", self.in_salary)
+
         self.registerField("in_rent", self.in_rent, "value", self.in_rent.valueChanged)
         self.registerField("in_interest", self.in_interest, "value", self.in_interest.valueChanged)
+        self.registerField("in_salary", self.in_salary, "value", self.in_salary.valueChanged)
+
+        import_button = QPushButton("Import Form 26AS / AIS...")
+        import_button.setToolTip("Fill rent, interest and TDS from saved 26AS, AIS or 16A exports")
+        import_button.clicked.connect(self._import_statements)
+        layout.addRow(import_button)
         self.setLayout(layout)
 
+    def _import_statements(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Form 26AS / AIS / 16A exports", "", "Statements (*.txt *.csv *.json *.jsonl)")
+        if not file_paths:
+            return
+
+        # Optional daily or monthly EUR-per-INR rates; without them every entry uses the flat rate
+        rates_path, _ = QFileDialog.getOpenFileName(
+            self, "Exchange rates (date,rate) - cancel to use the flat rate", "", "Exchange rates (*.csv)")
+
+        tax_year = int(self.field("tax_year") or 2024)
+        try:
+            rates = read_fx_rates_csv(rates_path) if rates_path else None
+            fields = import_statements(file_paths, tax_year, rates)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read the statements: {e}")
+            return
+        if not fields:
+            QMessageBox.information(self, "Import Form 26AS / AIS",
+                                    f"No Indian rent, interest or TDS for {tax_year} was found.")
+            return
+
+        for name, amount in fields.items():
+            self.setField(name, amount)
+        if rates:
+            conversion = (f"Each entry was converted at its date's rate from {rates_path}; "
+                          f"dates not in the file used the flat rate of {INR_TO_EUR_RATE} EUR per INR.")
+        else:
+            conversion = f"All entries were converted at the flat rate of {INR_TO_EUR_RATE} EUR per INR."
+        QMessageBox.information(self, "Import Form 26AS / AIS", conversion)
+
 class DeductionsPage(QWizardPage):
     def __init__(self):
         super().__init__()
@@ -311,28 +405,22 @@ class ResultPage(QWizardPage):
         self.save_button = QPushButton("Save Report to File")
         self.save_button.clicked.connect(self.save_report)
         self.layout.addWidget(self.save_button)
+
+        self.export_button = QPushButton("Export ELSTER XML")
+        self.export_button.clicked.connect(self.export_elster)
+        self.layout.addWidget(self.export_button)
+
+        self.trace_button = QPushButton("Show Calculation Steps")
+        self.trace_button.clicked.connect(self.show_trace)
+        self.layout.addWidget(self.trace_button)
         
+        self.form_data = None
         self.report_data = None
 
     def initializePage(self):
         # 1. Gather all data from wizard fields
-        field_names = [
-            "is_married", "tax_class", "num_kids", "parents_support",
-            # Person A
-            "de_gross_a", "de_tax_paid_a",
-            "de_pension_a", "de_health_a", "de_nursing_a", "de_unemployment_a",
-            "commute_km_a", "office_days_a", "ho_days_a", "internet_a", "bank_fee_a",
-            # Person B
-            "de_gross_b", "de_tax_paid_b",
-            "de_pension_b", "de_health_b", "de_nursing_b", "de_unemployment_b",
-            "commute_km_b", "office_days_b", "ho_days_b", "internet_b", "bank_fee_b",
-            # Shared
-            "in_rent", "in_interest",
-            "kita_costs", "nk_labor", "in_tds_inr",
-        ]
-        
         form_data = {}
-        for name in field_names:
+        for name in FIELD_NAMES:
             value = self.field(name)
             if value is not None:
                 form_data[name] = value
@@ -341,160 +429,36 @@ class ResultPage(QWizardPage):
                 form_data[name] = 0.0 if "bank_fee" not in name else False
 
         # 2. Generate the full report from the logic module
+        self.form_data = form_data
         self.report_data = generate_full_report(form_data)
         
         # 3. Format and display the results
         self.display_report()
 
     def display_report(self):
-        r = self.report_data
-        
-        # Create a warnings block if any warnings were generated
-        warnings_html = ""
-        if r.get("warnings"):
-            warnings_list = "".join([f"<li>{w}</li>" for w in r["warnings"]])
-            warnings_html = f"""
-            <div style="background-color: #fff3cd; border: 1px solid #ffeeba; color: #856404; padding: 15px; margin-bottom: 20px; border-radius: 5px;">
-                <h3 style="margin-top: 0;">Please Note:</h3>
-                <ul>{warnings_list}</ul>
-            </div>
-            """
-
-        refund_or_payment_text = (
-            f"<h2 style='color:green;'>ESTIMATED REFUND: {r['refund_or_payment']:,.2f}€</h2>"
-            if r['refund_or_payment'] > 0
-            else f"<h2 style='color:red;'>ESTIMATED ADDITIONAL PAYMENT: {abs(r['refund_or_payment']):,.2f}€</h2>"
-        )
-        
-        is_married = (self.field("tax_class") or 0) != 0
-
-        # Detailed breakdown table
-        details_html = f"""
-        <table border="1" style="width:100%; border-collapse: collapse; font-size: 10pt;">
-            <tr style="background-color:#e6e6fa;">
-                <th style="padding: 6px; text-align: left;">Item</th>
-                <th style="padding: 6px; text-align: right;">Person A (You)</th>
-                <th style="padding: 6px; text-align: right;">Person B (Spouse)</th>
-                <th style="padding: 6px; text-align: right;">JOINT TOTAL</th>
-            </tr>
-            <tr>
-                <td style="padding: 6px;"><b>Annual Gross Income</b></td>
-                <td style="padding: 6px; text-align: right;">{r['de_gross_a']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;">{r['de_gross_b']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;"><b>{r['total_gross']:,.2f}€</b></td>
-            </tr>
-            <tr style="background-color:#f2f2f2;">
-                <td style="padding: 6px;" colspan="4"><b>(-) Mandatory Social Security (Vorsorgeaufwendungen)</b></td>
-            </tr>
-            <tr>
-                <td style="padding: 6px;">Pension Insurance</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_pension_a']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_pension_b']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;"></td>
-            </tr>
-            <tr>
-                <td style="padding: 6px;">Health Insurance</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_health_a']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_health_b']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;"></td>
-            </tr>
-             <tr>
-                <td style="padding: 6px;">Nursing Care Insurance</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_nursing_a']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_nursing_b']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;"></td>
-            </tr>
-             <tr>
-                <td style="padding: 6px;">Unemployment Insurance</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_unemployment_a']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;">-{r['de_unemployment_b']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;"></td>
-            </tr>
-            <tr style="font-weight:bold;">
-                <td style="padding: 6px;">Total Social Security</td>
-                <td style="padding: 6px; text-align: right;"></td>
-                <td style="padding: 6px; text-align: right;"></td>
-                <td style="padding: 6px; text-align: right;">-{r['total_vorsorge']:,.2f}€</td>
-            </tr>
-            <tr style="background-color:#f2f2f2;">
-                <td style="padding: 6px;" colspan="4"><b>(-) Work Expenses & Deductions (Werbungskosten / Pauschalen)</b></td>
-            </tr>
-            <tr>
-                <td style="padding: 6px;">Income-Related Expenses (Werbungskosten)</td>
-                <td style="padding: 6px; text-align: right;">-{r['wk_a']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;">-{r['wk_b']:,.2f}€</td>
-                <td style="padding: 6px; text-align: right;"></td>
-            </tr>
-             <tr>
-                <td style="padding: 6px;">Other Deductions (Parents, Kita etc.)</td>
-                <td style="padding: 6px; text-align: right;"></td>
-                <td style="padding: 6px; text-align: right;"></td>
-                <td style="padding: 6px; text-align: right;">-{r['other_deductions']:,.2f}€</td>
-            </tr>
-            <tr style="background-color:#e6e6fa; font-weight:bold;">
-                <td style="padding: 6px;">= Taxable Income (Germany)</td>
-                <td style="padding: 6px; text-align: right;"></td>
-                <td style="padding: 6px; text-align: right;"></td>
-                <td style="padding: 6px; text-align: right;">{r['taxable_income_de']:,.2f}€</td>
-            </tr>
-        </table>
-        """
-        
-        summary_html = f"""
-        <h3>Tax Calculation Summary</h3>
-        <p><b>(+) Foreign Income (for rate calculation):</b> {r['foreign_income']:,.2f}€</p>
-        <p><b>(=) Global Income for Rate:</b> {r['global_income_for_rate']:,.2f}€</p>
-        <p><b>(→) Effective Tax Rate (Progressionsvorbehalt):</b> {r['effective_tax_rate']*100:.2f}%</p>
-        <hr>
-        <p><b>Calculated German Tax on Taxable Income:</b> {r['final_tax_liability']:,.2f}€</p>
-        <p><b>(+) Solidarity Surcharge (Soli):</b> {r.get('soli', 0.0):,.2f}€</p>
-        <p style='color:blue;'><b>(-) Credit for Ancillary Labor Costs (§35a):</b> -{r['nebenkosten_credit']:,.2f}€</p>
-        <p style='color:blue;'><b>(-) Credit for Tax Paid in India (TDS):</b> -{r['tds_credit']:,.2f}€</p>
-        <h3>Net German Tax Due: {r['net_german_tax_due']:,.2f}€</h3>
-        <hr>
-        <p><b>Tax Already Paid in Germany (Lohnsteuer):</b> {r['total_tax_paid']:,.2f}€</p>
-        {refund_or_payment_text}
-        """
-
-        html = f"{warnings_html}<h2>Tax Filing Roadmap</h2>{details_html}<br>{summary_html}"
-        self.result_label.setText(html)
+        self.result_label.setText(render_report(self.report_data, "html"))
+
+    def show_trace(self):
+        if not self.form_data:
+            QMessageBox.warning(self, "No Data", "There is no report data to explain yet.")
+            return
+
+        # Recalculate with tracing enabled; the normal calculation stays untraced
+        trace = CalculationTrace()
+        generate_full_report(self.form_data, trace)
+        box = QMessageBox(self)
+        box.setWindowTitle("Calculation Steps")
+        box.setText(f"{len(trace)} calculation steps were recorded. Show details to see each step.")
+        box.setDetailedText(trace.render())
+        box.exec()
 
     def save_report(self):
         if not self.report_data:
             QMessageBox.warning(self, "No Data", "There is no report data to save yet.")
             return
 
-        r = self.report_data
-        refund_or_payment_label = "ESTIMATED REFUND" if r['refund_or_payment'] > 0 else "ESTIMATED ADDITIONAL PAYMENT"
-        
-        report_text = (
-            "INDO-GERMAN TAX REPORT (DUAL INCOME)\n"
-            "=======================================\n\n"
-            f"DISCLAIMER: This is a non-binding estimate. Consult a tax advisor.\n\n"
-            "--- INCOME SUMMARY ---\n"
-            f"Person A - Gross: {r['de_gross_a']:>15,.2f}\u20ac\n"
-            f"Person B - Gross: {r['de_gross_b']:>15,.2f}\u20ac\n"
-            f"JOINT GROSS:      {r['total_gross']:>15,.2f}\u20ac\n\n"
-            "--- DEDUCTIONS & TAXABLE INCOME ---\n"
-            f"(-) Total Social Security: {r['total_vorsorge']:>9,.2f}\u20ac\n"
-            f"(-) Total Work Expenses (WK): {r['total_wk']:>6,.2f}\u20ac\n"
-            f"(-) Other Deductions:      {r['other_deductions']:>9,.2f}\u20ac\n"
-            f"---------------------------------------\n"
-            f"(=) TAXABLE GERMAN INCOME (zvE): {r['taxable_income_de']:>1,.2f}\u20ac\n\n"
-            "--- TAX CALCULATION ---\n"
-            f"(+) Foreign Income (for rate):   {r['foreign_income']:>5,.2f}\u20ac\n"
-            f"(&rarr;) Effective Tax Rate:            {r['effective_tax_rate']*100:>7.2f}%\n"
-            f"---------------------------------------\n"
-            f"(=) Calculated German Tax:       {r['final_tax_liability']:>5,.2f}\u20ac\n"
-            f"(+) Solidarity Surcharge (Soli): {r.get('soli', 0.0):>5,.2f}\u20ac\n"
-            f"(-) Credits (\u00a735a, TDS):         -{r['total_credits']:>5,.2f}\u20ac\n"
-            f"---------------------------------------\n"
-            f"(=) NET GERMAN TAX DUE:          {r['net_german_tax_due']:>5,.2f}\u20ac\n\n"
-            "--- FINAL RESULT ---\n"
-            f"Tax Already Paid (Lohnsteuer):   {r['total_tax_paid']:>5,.2f}\u20ac\n"
-            f"--- {refund_or_payment_label}: {abs(r['refund_or_payment']):>9,.2f}\u20ac ---\n"
-        )
-        
+        report_text = render_report(self.report_data, "text")
+
         file_path = "German_Tax_Report.txt"
         try:
             with open(file_path, "w", encoding="utf-8") as f:
@@ -502,3 +466,15 @@ class ResultPage(QWizardPage):
             QMessageBox.information(self, "Success", f"Report saved successfully to:\n{file_path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save report: {e}")
+
+    def export_elster(self):
+        if not self.report_data:
+            QMessageBox.warning(self, "No Data", "There is no report data to export yet.")
+            return
+
+        file_path = "German_Tax_Return_ELSTER.xml"
+        try:
+            write_elster_xml([("1", self.report_data)], file_path)
+            QMessageBox.information(self, "Success", f"ELSTER XML exported to:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export ELSTER XML: {e}")
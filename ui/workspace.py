@@ -0,0 +1,152 @@
+import threading
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QPushButton, QProgressBar, QFileDialog, QMessageBox, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from logic.batch_runner import recompute_clients
+
+class BatchWorker(QThread):
+    """Runs recompute_clients off the GUI thread and reports progress via signals."""
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal(dict, dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, households, output_dir):
+        super().__init__()
+        self.households = households
+        self.output_dir = output_dir
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            results, failures = recompute_clients(
+                self.households, self.output_dir,
+                progress=self.progress.emit, cancel_event=self.cancel_event,
+            )
+            self.done.emit(results, failures)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+class WorkspaceDialog(QDialog):
+    """
+    Lists all saved client sessions and recomputes any selection of them in the
+    background, writing one report file per client.
+    """
+    def __init__(self, sessions, parent=None):
+        super().__init__(parent)
+        self.sessions = sessions
+        self.worker = None
+        self.setWindowTitle("Client Workspace")
+        self.resize(600, 500)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("<b>Saved clients</b> (select one or more to recompute):"))
+
+        self.client_list = QListWidget()
+        self.client_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.client_list)
+
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel("")
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        self.select_all_button = QPushButton("Select All")
+        self.select_all_button.clicked.connect(self.client_list.selectAll)
+        self.recompute_button = QPushButton("Recompute Selected")
+        self.recompute_button.clicked.connect(self.recompute_selected)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        buttons.addWidget(self.select_all_button)
+        buttons.addWidget(self.recompute_button)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        self.client_list.clear()
+        for client in self.sessions.clients():
+            item = QListWidgetItem(f"{client['name']} ({client['tax_year']})")
+            item.setData(Qt.ItemDataRole.UserRole, client["client_id"])
+            self.client_list.addItem(item)
+
+    def recompute_selected(self):
+        client_ids = [item.data(Qt.ItemDataRole.UserRole) for item in self.client_list.selectedItems()]
+        if not client_ids:
+            QMessageBox.warning(self, "No Selection", "Please select at least one client.")
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "Output Folder for Reports")
+        if not output_dir:
+            return
+
+        # Unset wizard fields are stored as None; leave them to the report defaults
+        households = {}
+        for cid in client_ids:
+            state = self.sessions.load(cid)
+            households[cid] = {k: v for k, v in state.items() if v is not None}
+        self.progress_bar.setRange(0, len(households))
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"Computing {len(households)} reports...")
+
+        self.worker = BatchWorker(households, output_dir)
+        self.worker.progress.connect(self._on_progress)
+        self.worker.done.connect(self._on_done)
+        self.worker.failed.connect(self._on_failed)
+        self.worker.finished.connect(self._on_worker_finished)
+        self.recompute_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.worker.start()
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.status_label.setText("Cancelling...")
+
+    def _on_progress(self, done, total):
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"{done} / {total} clients processed")
+
+    def _on_done(self, results, failures):
+        if not failures:
+            self._finish(f"Finished: {len(results)} reports written.")
+            return
+        self._finish(f"Finished: {len(results)} written, {len(failures)} failed ({', '.join(sorted(failures))}).")
+        details = "\n".join(f"{client_id}: {error}" for client_id, error in sorted(failures.items()))
+        QMessageBox.warning(self, "Some Clients Failed", f"These clients could not be recomputed:\n{details}")
+
+    def _on_failed(self, message):
+        self._finish("Batch run failed.")
+        QMessageBox.critical(self, "Error", f"Batch recompute failed: {message}")
+
+    def _finish(self, text):
+        self.status_label.setText(text)
+        self.cancel_button.setEnabled(False)
+
+    def _on_worker_finished(self):
+        # QThread.finished: run() has returned, so the thread object can go
+        self.worker.wait()
+        self.worker.deleteLater()
+        self.worker = None
+        self.recompute_button.setEnabled(True)
+
+    def _stop_worker(self):
+        """Cancels a running batch and blocks until its thread has exited."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+
+    def reject(self):
+        # Esc and the Close button
+        self._stop_worker()
+        super().reject()
+
+    def closeEvent(self, event):
+        self._stop_worker()
+        super().closeEvent(event)